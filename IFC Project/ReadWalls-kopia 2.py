@@ -2,6 +2,35 @@ import ifcopenshell
 import tkinter as tk
 from tkinter import filedialog
 
+SPACE_PROPERTY_SETS = ["Pset_SpaceCommon", "PSet_Space"]
+
+def build_property_index(ifc_file):
+    """Map element id -> property set name -> property name -> value in one pass over IfcRelDefinesByProperties."""
+    index = {}
+    for rel in ifc_file.by_type("IfcRelDefinesByProperties"):
+        property_set = rel.RelatingPropertyDefinition
+        if not property_set.is_a("IfcPropertySet"):
+            continue
+        values = {}
+        for prop in property_set.HasProperties:
+            if prop.Name not in values:
+                value = getattr(prop, "NominalValue", None)
+                values[prop.Name] = value.wrappedValue if hasattr(value, "wrappedValue") else None
+        for element in rel.RelatedObjects:
+            sets = index.setdefault(element.id(), {})
+            sets[property_set.Name] = {**values, **sets.get(property_set.Name, {})}
+    return index
+
+def find_space_property(properties, element_id, names):
+    """Return the first of names found in an element's space property sets, or None."""
+    sets = properties.get(element_id, {})
+    for set_name in SPACE_PROPERTY_SETS:
+        values = sets.get(set_name, {})
+        for name in names:
+            if name in values:
+                return values[name]
+    return None
+
 # Model
 class IfcModel:
     def __init__(self):
@@ -93,21 +122,12 @@ class IfcModel:
             return None
         spaces = ifc_file.by_type("IfcSpace")
         print(f"Liczba pomieszczeń: {len(spaces)}")
+        properties = build_property_index(ifc_file)
         space_data = []
 
         for space in spaces:
             # Get floor area from properties
-            floor_area = None
-            for rel in getattr(space, "IsDefinedBy", []):
-                if rel.is_a("IfcRelDefinesByProperties"):
-                    property_set = rel.RelatingPropertyDefinition
-                    if property_set.is_a("IfcPropertySet") and property_set.Name in ["Pset_SpaceCommon", "PSet_Space"]:
-                        for prop in property_set.HasProperties:
-                            if prop.Name in ["NetFloorArea", "GrossFloorArea"]:
-                                floor_area = prop.NominalValue.wrappedValue if hasattr(prop.NominalValue, "wrappedValue") else None
-                                break
-                        if floor_area is not None:
-                            break
+            floor_area = find_space_property(properties, space.id(), ["NetFloorArea", "GrossFloorArea"])
 
             # Get walls intersecting the space via IfcRelSpaceBoundary
             wall_area = 0.0
@@ -147,21 +167,12 @@ class IfcModel:
             return None
         spaces = ifc_file.by_type("IfcSpace")
         print(f"Liczba pomieszczeń (dla objętości): {len(spaces)}")
+        properties = build_property_index(ifc_file)
         volume_data = []
 
         for space in spaces:
             # Get net floor area (reuse get_spaces logic)
-            net_area = None
-            for rel in getattr(space, "IsDefinedBy", []):
-                if rel.is_a("IfcRelDefinesByProperties"):
-                    property_set = rel.RelatingPropertyDefinition
-                    if property_set.is_a("IfcPropertySet") and property_set.Name in ["Pset_SpaceCommon", "PSet_Space"]:
-                        for prop in property_set.HasProperties:
-                            if prop.Name in ["NetFloorArea", "GrossFloorArea"]:
-                                net_area = prop.NominalValue.wrappedValue if hasattr(prop.NominalValue, "wrappedValue") else None
-                                break
-                        if net_area is not None:
-                            break
+            net_area = find_space_property(properties, space.id(), ["NetFloorArea", "GrossFloorArea"])
 
             wall_area = 0.0
             for rel in getattr(space, "BoundedBy", []):
@@ -183,17 +194,7 @@ class IfcModel:
                 net_area = 0.0
 
             # Get ceiling height
-            height = None
-            for rel in getattr(space, "IsDefinedBy", []):
-                if rel.is_a("IfcRelDefinesByProperties"):
-                    property_set = rel.RelatingPropertyDefinition
-                    if property_set.is_a("IfcPropertySet") and property_set.Name in ["Pset_SpaceCommon", "PSet_Space"]:
-                        for prop in property_set.HasProperties:
-                            if prop.Name in ["NetCeilingHeight", "Height"]:
-                                height = prop.NominalValue.wrappedValue if hasattr(prop.NominalValue, "wrappedValue") else None
-                                break
-                        if height is not None:
-                            break
+            height = find_space_property(properties, space.id(), ["NetCeilingHeight", "Height"])
 
             # If height not found in properties, try geometry
             if height is None and space.Representation:
@@ -2,6 +2,8 @@ import ifcopenshell
 import tkinter as tk
 from tkinter import filedialog
 
+from properties import PropertyIndex
+
 # Model
 class IfcModel:
     def __init__(self):
@@ -93,20 +95,17 @@ class IfcModel:
             return None
         spaces = ifc_file.by_type("IfcSpace")
         print(f"Number of spaces: {len(spaces)}")
+        properties = PropertyIndex(ifc_file)
         space_data = []
         total_area = 0.0
         for space in spaces:
-            area = "N/A"
-            for rel in space.IsDefinedBy:
-                if rel.is_a("IfcRelDefinesByProperties"):
-                    prop_def = rel.RelatingPropertyDefinition
-                    if prop_def.is_a("IfcElementQuantity"):
-                        for quantity in prop_def.Quantities:
-                            if quantity.is_a("IfcQuantityArea") and quantity.Name == "NetFloorArea":
-                                area = quantity.AreaValue
-                                print(f"Found area for space {space.id()}: {area}")
-                                if isinstance(area, (int, float)):
-                                    total_area += area
+            area = properties.find_quantity(space.id(), "NetFloorArea", "IfcQuantityArea")
+            if area is None:
+                area = "N/A"
+            else:
+                print(f"Found area for space {space.id()}: {area}")
+                if isinstance(area, (int, float)):
+                    total_area += area
             space_info = {
                 "id": space.id(),
                 "global_id": space.GlobalId,
@@ -124,20 +123,17 @@ class IfcModel:
             return None
         spaces = ifc_file.by_type("IfcSpace")
         print(f"Number of spaces: {len(spaces)}")
+        properties = PropertyIndex(ifc_file)
         space_data = []
         total_volume = 0.0
         for space in spaces:
-            volume = "N/A"
-            for rel in space.IsDefinedBy:
-                if rel.is_a("IfcRelDefinesByProperties"):
-                    prop_def = rel.RelatingPropertyDefinition
-                    if prop_def.is_a("IfcElementQuantity"):
-                        for quantity in prop_def.Quantities:
-                            if quantity.is_a("IfcQuantityVolume") and quantity.Name == "NetVolume":
-                                volume = quantity.VolumeValue
-                                print(f"Found volume for space {space.id()}: {volume}")
-                                if isinstance(volume, (int, float)):
-                                    total_volume += volume
+            volume = properties.find_quantity(space.id(), "NetVolume", "IfcQuantityVolume")
+            if volume is None:
+                volume = "N/A"
+            else:
+                print(f"Found volume for space {space.id()}: {volume}")
+                if isinstance(volume, (int, float)):
+                    total_volume += volume
             space_info = {
                 "id": space.id(),
                 "global_id": space.GlobalId,
@@ -153,17 +149,12 @@ class IfcModel:
         ifc_file = self.open_ifc_file()
         if ifc_file is None:
             return 0.0
+        properties = PropertyIndex(ifc_file)
         total_area = 0.0
         for window in ifc_file.by_type("IfcWindow"):
-            for rel in window.IsDefinedBy:
-                if rel.is_a("IfcRelDefinesByProperties"):
-                    prop_def = rel.RelatingPropertyDefinition
-                    if prop_def.is_a("IfcPropertySet"):
-                        for prop in prop_def.HasProperties:
-                            if prop.Name == "Steklena površina" and hasattr(prop, "NominalValue"):
-                                value = prop.NominalValue.wrappedValue
-                                if isinstance(value, (int, float)):
-                                    total_area += value
+            for value in properties.find_property(window.id(), "Steklena površina"):
+                if isinstance(value, (int, float)):
+                    total_area += value
         return total_area
 
 # View
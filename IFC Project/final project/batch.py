@@ -0,0 +1,126 @@
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from logs import get_logger
+from model import IfcModel
+from snapshot import SnapshotStore
+
+logger = get_logger("batch")
+
+# Columns of the combined report; every result has all of them, None where not applicable
+REPORT_FIELDS = (
+    "file", "ok", "seconds", "schema", "walls", "doors", "windows", "spaces",
+    "total_area", "total_volume", "window_area", "error"
+)
+
+def find_ifc_files(paths):
+    """Expand files and directories (searched recursively) into a sorted list of .ifc paths."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, names in os.walk(path):
+                files.extend(os.path.join(folder, name) for name in names if name.lower().endswith(".ifc"))
+        else:
+            files.append(path)
+    return sorted(set(files))
+
+def analyse_file(file_path, use_snapshots=True):
+    """Run every model analysis on one file and return a report row; never raises."""
+    result = dict.fromkeys(REPORT_FIELDS)
+    result["file"] = file_path
+    start = time.perf_counter()
+    try:
+        model = IfcModel(snapshots=SnapshotStore() if use_snapshots else None)
+        model.set_file_path(file_path)
+        data = model.load_data()
+        if data is None:
+            raise ValueError("file could not be opened")
+        result.update(
+            ok=True,
+            schema=data["schema"],
+            walls=len(data["walls"]),
+            doors=len(data["doors"]),
+            windows=len(data["windows"]),
+            spaces=len(data["spaces"]),
+            total_area=data["total_area"],
+            total_volume=data["total_volume"],
+            window_area=data["window_area"]
+        )
+    except Exception as e:
+        result.update(ok=False, error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+def _worker_died(path):
+    result = dict.fromkeys(REPORT_FIELDS)
+    result.update(file=path, ok=False, error="worker process died")
+    return result
+
+def _run_shared(paths, workers, use_snapshots, suspects):
+    """Yield report rows of paths from one process pool, with no more files in flight than workers.
+
+    Files wait here until a worker is free, so when a worker dies and breaks the
+    pool only the files then running are affected: they are moved to suspects,
+    and the ones not yet started are left in paths.
+    """
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        running = {}
+        while paths or running:
+            try:
+                while paths and len(running) < workers:
+                    running[pool.submit(analyse_file, paths[0], use_snapshots)] = paths[0]
+                    paths.popleft()
+            except BrokenProcessPool:
+                pass
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in finished:
+                path = running.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    suspects.append(path)
+            if broken:
+                suspects.extend(running.values())
+                return
+
+def _run_isolated(paths, use_snapshots):
+    """Yield report rows of paths, each analysed in a pool of its own, so a dying worker takes only its own file."""
+    pools = [ProcessPoolExecutor(max_workers=1) for _ in paths]
+    try:
+        futures = {pool.submit(analyse_file, path, use_snapshots): path for pool, path in zip(pools, paths)}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except BrokenProcessPool:
+                yield _worker_died(futures[future])
+    finally:
+        for pool in pools:
+            pool.shutdown()
+
+def iter_batch(paths, workers=None, use_snapshots=True):
+    """Analyse files in a process pool and yield each report row as soon as its file is done.
+
+    Every task gets a fresh worker process, so one model's memory is released
+    before the next file is parsed. A failing file is reported, not raised; if
+    a worker dies outright, the files that were running with it are retried
+    once, each alone, so only the file that kills its worker is reported failed.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = deque(paths)
+    done = 0
+    while pending:
+        suspects = []
+        rows = _run_shared(pending, workers, use_snapshots, suspects)
+        for result in itertools.chain(rows, _run_isolated(suspects, use_snapshots)):
+            done += 1
+            logger.info(
+                "[%d/%d] %s: %s in %s s", done, len(paths), result["file"],
+                "ok" if result["ok"] else result["error"], result["seconds"]
+            )
+            yield result
@@ -0,0 +1,249 @@
+import re
+
+import numpy as np
+
+from coords import CoordinatePool, decode_lists
+from placement import PRODUCT_PLACEMENT, id_lookup, lookup_rows
+from step import Typed
+
+PRODUCT_REPRESENTATION = PRODUCT_PLACEMENT + 1  # Position of Representation among the attributes of an IfcProduct
+PROJECT_UNITS = 8  # Position of UnitsInContext among the attributes of an IfcProject
+BODY_IDENTIFIERS = ("Body", None)  # Representation identifiers whose items make up the solid
+PRODUCTS_PER_CHECK = 1024  # Product bodies walked between cancellation checks
+
+# "#12=IFCFACEOUTERBOUND(#9,.T.)" yields its type name and argument list
+_BOUND = re.compile(rb"#\d+\s*=\s*([A-Za-z0-9_]+)\s*\(([^)]*)\)")
+
+# Items whose first attribute is the list of faces
+FACE_SETS = ("IFCOPENSHELL", "IFCCLOSEDSHELL", "IFCCONNECTEDFACESET")
+
+SI_PREFIXES = {
+    "EXA": 1e18, "PETA": 1e15, "TERA": 1e12, "GIGA": 1e9, "MEGA": 1e6, "KILO": 1e3, "HECTO": 1e2, "DECA": 1e1,
+    "DECI": 1e-1, "CENTI": 1e-2, "MILLI": 1e-3, "MICRO": 1e-6, "NANO": 1e-9, "PICO": 1e-12, "FEMTO": 1e-15, "ATTO": 1e-18
+}
+
+def padded(values):
+    """Append a zero row, so that row -1 (a missing reference) reads as zero."""
+    return np.concatenate((values, np.zeros((1,) + values.shape[1:], dtype=values.dtype)))
+
+def segment_sums(values, counts):
+    """Sum consecutive segments of values with the given lengths; empty segments sum to 0."""
+    sums = np.zeros((len(counts),) + values.shape[1:])
+    filled = counts > 0
+    if filled.any():
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sums[filled] = np.add.reduceat(values, starts[filled], axis=0)
+    return sums
+
+def _metres_per_unit(index, unit_id):
+    """Return metres per unit of an IfcSIUnit or IfcConversionBasedUnit of length, else None."""
+    unit = index.entity(unit_id)
+    if len(unit.args) < 4 or unit.args[1] != "LENGTHUNIT":
+        return None
+    if unit.type == "IFCSIUNIT":
+        return SI_PREFIXES.get(unit.args[2], 1.0)
+    if unit.type in ("IFCCONVERSIONBASEDUNIT", "IFCCONVERSIONBASEDUNITWITHOFFSET"):
+        value, base_id = index.entity(unit.args[3]).args[:2]
+        if isinstance(value, Typed):
+            value = value.value
+        base = _metres_per_unit(index, base_id) if base_id is not None else None
+        return float(value) * (base if base is not None else 1.0)
+    return None
+
+def length_unit_scale(index):
+    """Return metres per length unit of a file, from the project's IfcUnitAssignment; 1.0 if it has none."""
+    assignment_ids = [
+        index.entity(project_id).args[PROJECT_UNITS] for project_id in index.ids("IFCPROJECT")
+    ] + list(index.ids("IFCUNITASSIGNMENT"))
+    for assignment_id in assignment_ids:
+        if assignment_id is None:
+            continue
+        for unit_id in index.entity(assignment_id).args[0] or ():
+            scale = _metres_per_unit(index, unit_id)
+            if scale is not None:
+                return scale
+    return 1.0
+
+class FacetedGeometry:
+    """Areas and enclosed volumes of faceted B-rep geometry (IfcFace / IfcPolyLoop), in batch.
+
+    Built on a StepIndex and a CoordinatePool. The point rows of every
+    polyloop in the file are packed into one flat array and their vector areas
+    computed with the Newell method in a few NumPy operations; faces combine
+    their outer and inner bounds. Per product, face areas are summed into a
+    surface area and the enclosed volume of each shell follows from the
+    divergence theorem, so it assumes the shells are closed. Geometry is in the
+    product's local coordinates, which does not change areas or volumes; they
+    are converted from the file's length unit to square and cubic metres.
+    """
+
+    def __init__(self, index, cancel=None, pool=None):
+        self.index = index
+        self.length_scale = length_unit_scale(index)
+        self.pool = pool if pool is not None else CoordinatePool(index, cancel)
+        loop_ids = index.ids("IFCPOLYLOOP", include_subtypes=False)
+        point_rows, point_counts = self.pool.loop_rows(loop_ids, cancel)
+        loop_vectors, loop_origins = self._loop_vectors(self.pool.coordinates[point_rows], point_counts)
+
+        bound_ids, loop_rows, signs, outer = self._decode_bounds(id_lookup(loop_ids), cancel)
+        # Bounds around something other than a polyloop (edge or vertex loops) add nothing
+        bound_vectors = padded(loop_vectors)[loop_rows] * signs[:, None]
+        bound_origins = padded(loop_origins)[loop_rows]
+
+        face_ids = index.ids("IFCFACE", include_subtypes=False)
+        bound_refs, bound_counts = decode_lists(index, face_ids, cancel)
+        self.face_lookup = id_lookup(face_ids)
+        self.face_vectors, self.face_origins = self._face_vectors(
+            lookup_rows(id_lookup(bound_ids), bound_refs), bound_counts, bound_vectors, bound_origins, outer
+        )
+        self.face_areas = np.linalg.norm(self.face_vectors, axis=1)
+
+    @staticmethod
+    def _loop_vectors(points, counts):
+        """Return the Newell vector area and first point of each loop, given its points packed end to end."""
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        loop_of_point = np.repeat(np.arange(len(counts)), counts)
+        # Measure from each loop's first point, which keeps far-from-origin coordinates precise
+        origins = np.zeros((len(counts), 3))
+        origins[counts > 0] = points[starts[counts > 0]]
+        local = points - origins[loop_of_point]
+        following = np.arange(1, len(points) + 1)
+        following[starts[counts > 0] + counts[counts > 0] - 1] = starts[counts > 0]
+        return segment_sums(np.cross(local, local[following]), counts) / 2.0, origins
+
+    def _decode_bounds(self, loop_lookup, cancel=None):
+        """Decode IfcFaceBound / IfcFaceOuterBound into (ids, loop rows, orientation signs, outer flags)."""
+        bound_ids = np.concatenate([
+            np.asarray(self.index.ids(name, include_subtypes=False), dtype=np.int64)
+            for name in ("IFCFACEBOUND", "IFCFACEOUTERBOUND")
+        ])
+        outer = np.zeros(len(bound_ids), dtype=bool)
+        outer[len(self.index.ids("IFCFACEBOUND", include_subtypes=False)):] = True
+        texts = []
+        for bound_id, match in zip(bound_ids.tolist(), self.index.match(bound_ids.tolist(), _BOUND, cancel)):
+            if match is None:
+                raise ValueError(f"Cannot decode face bound #{bound_id}")
+            texts.append(match[2])
+        if not texts:
+            return bound_ids, np.empty(0, dtype=np.int64), np.empty(0), outer
+        joined = b",".join(texts).replace(b"#", b"").replace(b".T.", b"1").replace(b".F.", b"0")
+        values = np.fromstring(joined.decode("latin-1"), dtype=np.int64, sep=",").reshape(-1, 2)
+        signs = np.where(values[:, 1] == 1, 1.0, -1.0)
+        return bound_ids, lookup_rows(loop_lookup, values[:, 0]), signs, outer
+
+    @staticmethod
+    def _face_vectors(bound_rows, counts, bound_vectors, bound_origins, outer):
+        """Combine the bounds of each face: the outer bound's vector area less its holes."""
+        vectors = padded(bound_vectors)[bound_rows]
+        origins = padded(bound_origins)[bound_rows]
+        is_outer = padded(outer)[bound_rows]
+        face_of_bound = np.repeat(np.arange(len(counts)), counts)
+        # The outer bound of each face, or its first bound when none is marked outer
+        outer_rows = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        marked = np.flatnonzero(is_outer)
+        outer_rows[face_of_bound[marked]] = marked
+        outer_rows = np.minimum(outer_rows, max(len(vectors) - 1, 0))
+        if len(vectors):
+            # Holes subtract from the face whichever way their loops run
+            outer_vectors = vectors[outer_rows][face_of_bound]
+            holes = np.arange(len(vectors)) != outer_rows[face_of_bound]
+            flip = holes & (np.sum(vectors * outer_vectors, axis=1) > 0)
+            vectors[flip] *= -1.0
+        face_vectors = segment_sums(vectors, counts)
+        face_origins = np.zeros((len(counts), 3))
+        face_origins[counts > 0] = origins[outer_rows[counts > 0]]
+        return face_vectors, face_origins
+
+    def _body_shells(self, product_id):
+        """Yield (shell id, sign, scale) of each face set in a product's body representation."""
+        args = self.index.entity(product_id).args
+        if len(args) <= PRODUCT_REPRESENTATION or args[PRODUCT_REPRESENTATION] is None:
+            return
+        representations = self.index.entity(args[PRODUCT_REPRESENTATION]).args[2] or ()
+        items = []
+        for representation_id in representations:
+            representation = self.index.entity(representation_id).args
+            if representation[1] in BODY_IDENTIFIERS:
+                items.extend((item_id, 1.0) for item_id in representation[3] or ())
+        seen = set()
+        while items:
+            item_id, scale = items.pop()
+            if (item_id, scale) in seen:
+                continue
+            seen.add((item_id, scale))
+            item = self.index.entity(item_id)
+            if item.type in FACE_SETS:
+                yield item_id, 1.0, scale
+            elif item.type in ("IFCSHELLBASEDSURFACEMODEL", "IFCFACEBASEDSURFACEMODEL"):
+                for shell_id in item.args[0] or ():
+                    yield shell_id, 1.0, scale
+            elif item.type in ("IFCFACETEDBREP", "IFCFACETEDBREPWITHVOIDS"):
+                yield item.args[0], 1.0, scale
+                if item.type == "IFCFACETEDBREPWITHVOIDS":
+                    for void_id in item.args[1] or ():
+                        yield void_id, -1.0, scale
+            elif item.type == "IFCMAPPEDITEM":
+                source_id, target_id = item.args[:2]
+                mapped = self.index.entity(self.index.entity(source_id).args[1]).args
+                # Mapped geometry is moved rigidly, scaled only by a uniform Scale
+                target = self.index.entity(target_id).args
+                factor = target[3] if len(target) > 3 and isinstance(target[3], (int, float)) else 1.0
+                items.extend((mapped_id, scale * factor) for mapped_id in mapped[3] or ())
+
+    def quantities(self, product_ids, cancel=None):
+        """Return (surface area, volume, footprint) arrays in metres for products, NaN where there is no faceted body.
+
+        The footprint is the horizontal projection of the body, half the sum of
+        the absolute vertical components of its face vectors. cancel is an
+        optional CancelToken checked while the bodies are walked and decoded.
+        """
+        surface_area = np.full(len(product_ids), np.nan)
+        volume = np.full(len(product_ids), np.nan)
+        footprint = np.full(len(product_ids), np.nan)
+        if not len(self.face_areas):
+            return surface_area, volume, footprint
+        shell_ids = []
+        owners = []
+        signs = []
+        scales = []
+        for position, product_id in enumerate(product_ids):
+            if cancel is not None and position % PRODUCTS_PER_CHECK == 0:
+                cancel.check()
+            for shell_id, sign, scale in self._body_shells(product_id):
+                shell_ids.append(shell_id)
+                owners.append(position)
+                signs.append(sign)
+                scales.append(scale)
+        if not shell_ids:
+            return surface_area, volume, footprint
+
+        face_refs, counts = decode_lists(self.index, shell_ids, cancel)
+        face_rows = lookup_rows(self.face_lookup, face_refs)
+        vectors = padded(self.face_vectors)[face_rows]
+        areas = padded(self.face_areas)[face_rows]
+        origins = padded(self.face_origins)[face_rows]
+        # Measure volumes from a point of each shell, for precision far from the origin
+        shell_of_face = np.repeat(np.arange(len(counts)), counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        references = np.zeros((len(counts), 3))
+        references[counts > 0] = origins[starts[counts > 0]]
+        terms = np.sum((origins - references[shell_of_face]) * vectors, axis=1) / 3.0
+
+        owners = np.asarray(owners, dtype=np.int64)
+        # The file's length unit scales like a mapped item's uniform Scale
+        scales = np.asarray(scales) * self.length_scale
+        shell_volumes = np.abs(segment_sums(terms, counts)) * np.asarray(signs) * scales ** 3
+        shell_areas = segment_sums(areas, counts) * scales ** 2
+        shell_footprints = segment_sums(np.abs(vectors[:, 2]), counts) / 2.0 * scales ** 2
+        for values, shell_values in ((surface_area, shell_areas), (volume, shell_volumes), (footprint, shell_footprints)):
+            values[np.unique(owners)] = 0.0
+            np.add.at(values, owners, shell_values)
+        return surface_area, volume, footprint
+
+def add_geometry(table, geometry, cancel=None):
+    """Add 'surface_area' (and 'volume' where there is none) columns to an element table from faceted geometry."""
+    surface_area, volume, _ = geometry.quantities(table["id"].tolist(), cancel)
+    table.add_column("surface_area", surface_area)
+    if "volume" not in table:
+        table.add_column("volume", volume)
+    return table
@@ -0,0 +1,199 @@
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+
+from batch import REPORT_FIELDS, find_ifc_files, iter_batch
+from logs import NORMAL, QUIET, VERBOSE, configure_logging, get_logger
+from model import IfcModel
+from records import DoorRecord, StoreyRecord, WallRecord, WindowRecord
+from snapshot import SnapshotStore
+
+logger = get_logger("cli")
+
+ELEMENT_COMMANDS = ("walls", "doors", "windows")
+
+SPACE_COMMANDS = {"space-areas": ("area", "total_area"), "space-volumes": ("volume", "total_volume")}
+
+RECORD_TYPES = {"walls": WallRecord, "doors": DoorRecord, "windows": WindowRecord, "storeys": StoreyRecord}
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def started(rows):
+    """Run a row generator up to its first row, so a file that cannot be opened fails before any output."""
+    rows = iter(rows)
+    for first in rows:
+        return itertools.chain((first,), rows)
+    return iter(())
+
+def element_rows(model, category):
+    """Yield one plain dict per element, streamed from the model's iter_* method."""
+    for record in getattr(model, f"iter_{category}")():
+        yield record.to_dict()
+
+def space_rows(model, field, total_key, summary):
+    """Yield id, name and one quantity per space while adding it up into summary[total_key]."""
+    summary[total_key] = 0.0
+    for space in model.iter_spaces():
+        value = space[field]
+        if _number(value):
+            summary[total_key] += value
+        yield {"id": space["id"], "global_id": space["global_id"], "name": space["name"], field: value}
+
+def row_fields(command):
+    """Return the columns of a command's rows, so an empty result still gets a CSV header; None for single-value results."""
+    if command in SPACE_COMMANDS:
+        return ["id", "global_id", "name", SPACE_COMMANDS[command][0]]
+    record_type = RECORD_TYPES.get(command)
+    return list(record_type.__slots__) if record_type is not None else None
+
+def run_analysis(model, args):
+    """Return (key, rows, summary) for a command; rows is None for single-value results.
+
+    Raises ValueError if the IFC file cannot be opened.
+    """
+    summary = {}
+    if args.command in ELEMENT_COMMANDS:
+        return args.command, started(element_rows(model, args.command)), summary
+    if args.command == "storeys":
+        storeys = model.get_storeys()
+        if storeys is None:
+            raise ValueError(f"IFC file could not be opened: {args.file}")
+        return "storeys", (storey.to_dict() for storey in storeys), summary
+    if args.command in SPACE_COMMANDS:
+        field, total_key = SPACE_COMMANDS[args.command]
+        return "spaces", started(space_rows(model, field, total_key, summary)), summary
+    summary["window_area"] = model.calculate_total_window_area()
+    if summary["window_area"] is None:
+        raise ValueError(f"IFC file could not be opened: {args.file}")
+    if args.command == "solar-gain":
+        summary.update(
+            g_factor=args.g_factor,
+            ext_temp=args.ext_temp,
+            int_temp=args.int_temp,
+            sun_hours=args.sun_hours,
+            solar_gain=model.calculate_solar_gain(args.g_factor, args.ext_temp, args.int_temp, args.sun_hours)
+        )
+    return None, None, summary
+
+def batch_rows(args, summary):
+    """Yield report rows of a batch run as files finish, counting failures into summary."""
+    files = find_ifc_files(args.paths)
+    start = time.perf_counter()
+    summary.update(files=len(files), failed=0)
+    for result in iter_batch(files, args.jobs, not args.no_cache):
+        if not result["ok"]:
+            summary["failed"] += 1
+        yield result
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+
+def write_json(out, head, key, rows, summary):
+    """Write one JSON object; element rows are written as they arrive, totals after them."""
+    out.write("{" + ", ".join(f"{json.dumps(name)}: {json.dumps(value, ensure_ascii=False)}" for name, value in head.items()))
+    if rows is not None:
+        out.write(f"{', ' if head else ''}{json.dumps(key)}: [")
+        for count, row in enumerate(rows):
+            out.write((",\n  " if count else "\n  ") + json.dumps(row, ensure_ascii=False))
+        out.write("\n]")
+    for name, value in summary.items():
+        out.write(f", {json.dumps(name)}: {json.dumps(value)}")
+    out.write("}\n")
+
+def _csv_value(value):
+    if isinstance(value, tuple):
+        return " ".join(str(v) for v in value)
+    if isinstance(value, dict):
+        return " ".join(f"{k}={v}" for k, v in value.items())
+    return value
+
+def write_csv(out, rows, summary, fields=None):
+    """Write element rows as CSV, or the summary values as a single row for single-value results.
+
+    With fields, an empty row stream still writes the header line.
+    """
+    writer = None
+    for row in rows if rows is not None else [summary]:
+        if writer is None:
+            writer = csv.DictWriter(out, fieldnames=fields or list(row))
+            writer.writeheader()
+        writer.writerow({name: _csv_value(value) for name, value in row.items()})
+    if writer is None and fields:
+        csv.DictWriter(out, fieldnames=fields).writeheader()
+    if rows is not None:
+        # CSV has no place for totals next to the rows, so they go to the log
+        for name, value in summary.items():
+            logger.info("%s: %s", name, value)
+
+def add_file_arguments(parser):
+    parser.add_argument("file", help="IFC file to analyse")
+    parser.add_argument("-f", "--format", choices=("json", "csv"), default="json", help="output format (default: json)")
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Analyse IFC files without the GUI")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every element")
+    parser.add_argument("-q", "--quiet", action="store_true", help="log warnings and errors only")
+    parser.add_argument("--log-file", help="write the log to this file instead of stderr")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor write model snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for command in ELEMENT_COMMANDS:
+        add_file_arguments(commands.add_parser(command, help=f"list {command}"))
+    add_file_arguments(commands.add_parser("storeys", help="element counts and space totals per storey"))
+    add_file_arguments(commands.add_parser("space-areas", help="list space areas and their total"))
+    add_file_arguments(commands.add_parser("space-volumes", help="list space volumes and their total"))
+    add_file_arguments(commands.add_parser("window-area", help="total window glass area"))
+    solar = commands.add_parser("solar-gain", help="daily solar heat gain through the windows")
+    add_file_arguments(solar)
+    solar.add_argument("--g-factor", type=float, required=True, help="solar heat gain coefficient (0 to 1)")
+    solar.add_argument("--ext-temp", type=float, required=True, help="external temperature (°C)")
+    solar.add_argument("--int-temp", type=float, required=True, help="internal temperature (°C)")
+    solar.add_argument("--sun-hours", type=float, required=True, help="daily sun exposure (hours)")
+    batch = commands.add_parser("batch", help="analyse many files in parallel into one report")
+    batch.add_argument("paths", nargs="+", help="IFC files or directories searched for *.ifc")
+    batch.add_argument("-j", "--jobs", type=int, help="worker processes (default: one per CPU)")
+    batch.add_argument("-f", "--format", choices=("json", "csv"), default="json", help="output format (default: json)")
+    batch.add_argument("-o", "--output", help="write to this file instead of stdout")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "solar-gain" and not 0 <= args.g_factor <= 1:
+        parser.error("--g-factor must be between 0 and 1")
+    configure_logging(VERBOSE if args.verbose else QUIET if args.quiet else NORMAL, args.log_file, stream=sys.stderr)
+
+    if args.command == "batch":
+        head = {}
+        summary = {}
+        key, rows, fields = "results", batch_rows(args, summary), REPORT_FIELDS
+    else:
+        model = IfcModel(snapshots=None if args.no_cache else SnapshotStore())
+        model.set_file_path(args.file)
+        header = model.probe_header()
+        if header is None:
+            return 1
+        head = {"file": args.file, "schema": header["schema"]}
+        try:
+            key, rows, summary = run_analysis(model, args)
+        except ValueError as e:
+            logger.error("%s", e)
+            return 1
+        fields = row_fields(args.command)
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            write_json(out, head, key, rows, summary)
+        else:
+            write_csv(out, rows, summary, fields)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if args.command == "batch" and summary["failed"]:
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,118 @@
 import tkinter.simpledialog as simpledialog
 from tkinter import filedialog
 
+from jobs import BackgroundRunner
+from logs import get_logger
+
+logger = get_logger("controller")
+
 # Controller
 class IfcController:
-    def __init__(self, model, view):
+    def __init__(self, model, view, runner=None):
         self.model = model
         self.view = view
+        self.runner = runner
+        self.current_job = None  # CancelToken of the job in flight
+        self.warm_up_job = None  # CancelToken of the speculative warm-up, if one is running
+    
+    def background_runner(self):
+        """Return the runner for background jobs, created on first use."""
+        if self.runner is None:
+            self.runner = BackgroundRunner(self.view.root)
+        return self.runner
+    
+    def run_in_background(self, button_text, work, on_done, on_batch=None):
+        """Run work(cancel, progress) off the Tk main thread while the view shows progress.
+
+        With on_batch, work returns an iterable whose items are delivered in batches.
+        """
+        runner = self.background_runner()
+        
+        def finish(result):
+            self.current_job = None
+            self.view.set_busy(False)
+            on_done(result)
+        
+        def fail(error):
+            self.current_job = None
+            self.view.set_busy(False)
+            logger.error("An error occurred during '%s': %s", button_text, error)
+            self.view.result_labels[button_text]["label"].config(text=f"Error: {str(error)}")
+        
+        self.view.set_busy(True, f"{button_text}...")
+        self.current_job = runner.submit(work, finish, fail, self.view.set_progress, on_batch)
+    
+    def stream_loaded(self, button_text, category, on_batch=None, on_done=None):
+        """Stream one category of the extracted model data into the results table.
+
+        The rows come from the model's iter_loaded(), so they reach the table in
+        batches while the extraction runs, and the model is still extracted
+        once, kept and snapshotted for later clicks.
+        """
+        def rows(cancel, progress):
+            return self.model.iter_loaded(category, cancel, progress)
+        self.stream_to_table(button_text, category, rows, on_batch, on_done)
+    
+    def stream_to_table(self, button_text, category, iterate, on_batch=None, on_done=None):
+        """Stream records from iterate(cancel, progress) into the results table, in batches as the iterable yields them.
+
+        Optional on_batch(records) sees every batch after it is shown, on_done(records) gets all of them.
+        """
+        records = []
+        
+        def add_batch(batch):
+            records.extend(batch)
+            self.view.append_table_rows(batch)
+            if on_batch is not None:
+                on_batch(batch)
+        
+        def finish(count):
+            if on_done is not None:
+                on_done(records)
+        
+        self.view.start_table(category)
+        self.run_in_background(button_text, iterate, finish, add_batch)
+    
+    def on_cancel_click(self):
+        """Handle the Cancel button click by abandoning the job in flight."""
+        if self.current_job is None:
+            return
+        self.current_job.cancel()
+        self.current_job = None
+        self.view.set_busy(False)
+        self.view.status_label.config(text="Cancelled.")
+    
+    def start_warm_up(self):
+        """Precompute all analyses in the background, without blocking the buttons.
+
+        A button clicked meanwhile waits on the model lock for the step in
+        progress and then reuses its result instead of starting over.
+        """
+        self.cancel_warm_up()
+        
+        def finish(steps):
+            self.warm_up_job = None
+            if self.current_job is None:
+                self.view.status_label.config(text="Warm-up finished.")
+        
+        def fail(error):
+            self.warm_up_job = None
+            logger.warning("Warm-up failed: %s", error)
+        
+        self.warm_up_job = self.background_runner().submit(self.model.warm_up, finish, fail)
+    
+    def cancel_warm_up(self):
+        """Stop a running warm-up, e.g. because another file was picked."""
+        if self.warm_up_job is not None:
+            self.warm_up_job.cancel()
+            self.warm_up_job = None
+    
+    def on_warm_up_toggle(self):
+        """Handle the Warm up checkbox: start warming the open file or stop."""
+        if self.view.warm_up_var.get() and self.model.file_path:
+            self.start_warm_up()
+        else:
+            self.cancel_warm_up()
     
     def on_open_button_click(self):
         """Handle the Open BIM IFC model button click."""
@@ -15,14 +122,20 @@ class IfcController:
         )
         
         if file_path:
+            # Jobs on the previous file are abandoned, so they stop taking the model lock
+            self.on_cancel_click()
+            self.cancel_warm_up()
             self.model.set_file_path(file_path)
             self.view.set_file_path(file_path)
+            self.view.display_header(self.model.probe_header())
             self.view.enable_find_walls_button(True)
             self.view.enable_find_doors_button(True)
             self.view.enable_find_windows_button(True)
             self.view.enable_find_space_areas_button(True)
             self.view.enable_find_space_volumes_button(True)
             self.view.enable_calc_solar_gain_button(True)
+            if self.view.warm_up_var.get():
+                self.start_warm_up()
         else:
             self.view.enable_find_walls_button(False)
             self.view.enable_find_doors_button(False)
@@ -32,29 +145,61 @@ class IfcController:
     
     def on_find_walls_click(self):
         """Handle the Find Walls button click."""
-        walls = self.model.get_walls()
-        schema = self.model.get_schema()
-        self.view.display_walls(walls, schema)
+        def work(cancel, progress):
+            return self.model.get_walls(cancel, progress), self.model.get_schema()
+        self.run_in_background("Find Walls", work, lambda result: self.view.display_walls(*result))
     
     def on_find_doors_click(self):
         """Handle the Find Doors button click."""
-        doors = self.model.get_doors()
-        self.view.display_doors(doors)
+        def show_count(door_count):
+            # The count comes from the entity index at once, the table rows then stream in
+            self.view.display_doors(door_count)
+            if door_count:
+                self.stream_loaded("Find Doors", "doors")
+        self.run_in_background(
+            "Find Doors",
+            lambda cancel, progress: self.model.count_elements("IfcDoor", cancel, progress),
+            show_count
+        )
     
     def on_find_windows_click(self):
         """Handle the Find Windows button click."""
-        windows = self.model.get_windows()
-        self.view.display_windows(windows)
+        def show_count(window_count):
+            self.view.display_windows(window_count)
+            if window_count:
+                self.stream_loaded("Find Windows", "windows")
+        self.run_in_background(
+            "Find Windows",
+            lambda cancel, progress: self.model.count_elements("IfcWindow", cancel, progress),
+            show_count
+        )
     
     def on_find_space_areas_click(self):
         """Handle the Find Space Areas button click."""
-        spaces = self.model.get_space_areas()
-        self.view.display_space_areas(spaces)
+        self.stream_space_totals("Find Space Areas", "area", "total_area", "m²", self.view.display_space_areas)
     
     def on_find_space_volumes_click(self):
         """Handle the Find Space Volumes button click."""
-        spaces = self.model.get_space_volumes()
-        self.view.display_space_volumes(spaces)
+        self.stream_space_totals("Find Space Volumes", "volume", "total_volume", "m³", self.view.display_space_volumes)
+    
+    def stream_space_totals(self, button_text, field, total_key, unit, display):
+        """Stream spaces into the table while the label shows a running total of one quantity."""
+        totals = {"count": 0, "total": 0.0}
+        
+        def add_batch(spaces):
+            totals["count"] += len(spaces)
+            totals["total"] += sum(
+                space[field] for space in spaces
+                if isinstance(space[field], (int, float)) and not isinstance(space[field], bool)
+            )
+            self.view.display_running_total(
+                button_text, f"{totals['count']} spaces so far, {totals['total']:.2f} {unit}..."
+            )
+        
+        def show_result(spaces):
+            display({"spaces": spaces, total_key: totals["total"]}, show_table=False)
+        
+        self.stream_loaded(button_text, "spaces", add_batch, show_result)
 
     def on_calc_solar_gain_click(self):
         """Calculate solar heat gain based on window areas and user input."""
@@ -73,6 +218,6 @@ class IfcController:
             self.view.result_labels["Calculate Solar Gain"]["label"].config(text="Invalid input.")
             return
 
-        total_window_area = self.model.calculate_total_window_area()
-        solar_gain = total_window_area * g_factor * (int_temp - ext_temp) * sun_hours
-        self.view.display_solar_gain(solar_gain)
\ No newline at end of file
+        def work(cancel, progress):
+            return self.model.calculate_solar_gain(g_factor, ext_temp, int_temp, sun_hours, cancel, progress)
+        self.run_in_background("Calculate Solar Gain", work, self.view.display_solar_gain)
\ No newline at end of file
@@ -0,0 +1,106 @@
+import re
+
+import numpy as np
+
+from placement import decode_vectors, id_lookup, lookup_rows
+from step_index import LIST_ARGUMENT
+
+# "#39=IFCCARTESIANPOINTLIST3D(((1.,2.,3.),(4.,5.,6.)))" yields "(1.,2.,3.),(4.,5.,6.)"
+_POINT_LIST = re.compile(rb"#\d+\s*=\s*[A-Za-z0-9_]+\s*\(\s*\(((?:[^()]|\([^()]*\))*)\)")
+
+POINT_LISTS = (("IFCCARTESIANPOINTLIST3D", 3), ("IFCCARTESIANPOINTLIST2D", 2))
+
+def decode_lists(index, ids, cancel=None):
+    """Decode entities whose first argument is a list of references into (flat ids, counts per entity).
+
+    The references of all entities are parsed in one NumPy call.
+    """
+    texts = []
+    for entity_id, match in zip(ids, index.match(ids, LIST_ARGUMENT, cancel)):
+        if match is None:
+            raise ValueError(f"Cannot decode the list of entity #{entity_id}")
+        texts.append(match[1])
+    counts = np.fromiter(
+        (text.count(b",") + 1 if text.strip() else 0 for text in texts),
+        dtype=np.int64,
+        count=len(texts)
+    )
+    joined = b",".join(text for text in texts if text.strip()).replace(b"#", b"")
+    if not joined:
+        return np.empty(0, dtype=np.int64), counts
+    return np.fromstring(joined.decode("latin-1"), dtype=np.int64, sep=","), counts
+
+def _decode_point_lists(index, ids, dimension, cancel=None):
+    """Decode IfcCartesianPointList2D/3D entities into (an (n, 3) array of all their points, counts per list)."""
+    texts = []
+    for entity_id, match in zip(ids, index.match(ids, _POINT_LIST, cancel)):
+        if match is None:
+            raise ValueError(f"Cannot decode point list #{entity_id}")
+        texts.append(match[1])
+    counts = np.fromiter((text.count(b"(") for text in texts), dtype=np.int64, count=len(texts))
+    joined = b",".join(text for text in texts if text.strip()).replace(b"(", b"").replace(b")", b"")
+    points = np.zeros((int(counts.sum()), 3))
+    if joined:
+        points[:, :dimension] = np.fromstring(joined.decode("latin-1"), sep=",").reshape(-1, dimension)
+    return points, counts
+
+class CoordinatePool:
+    """Every point coordinate of a file in one contiguous float64 (n, 3) array, decoded once.
+
+    Built on a StepIndex. IfcCartesianPoint entities come first, one row each,
+    found through an id lookup array; the points of each IfcCartesianPointList
+    follow as a contiguous block, so a list is a zero-copy view. Polyloops and
+    other point references become row index arrays into coordinates. 2D points
+    have z = 0. The array is read-only, so consumers can share it.
+    """
+
+    def __init__(self, index, cancel=None):
+        self.index = index
+        point_ids = index.ids("IFCCARTESIANPOINT", include_subtypes=False)
+        self.lookup = id_lookup(point_ids)
+        blocks = [decode_vectors(index, point_ids, cancel)]
+        list_ids = []
+        counts = []
+        for name, dimension in POINT_LISTS:
+            ids = index.ids(name, include_subtypes=False)
+            points, list_counts = _decode_point_lists(index, ids, dimension, cancel)
+            blocks.append(points)
+            list_ids.extend(ids)
+            counts.append(list_counts)
+        counts = np.concatenate(counts)
+        self.list_lookup = id_lookup(list_ids)
+        self.list_starts = len(point_ids) + np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+        self.list_counts = counts
+        # A trailing origin row answers missing references (row -1)
+        blocks.append(np.zeros((1, 3)))
+        self.coordinates = np.concatenate(blocks)
+        self.coordinates.flags.writeable = False
+
+    def __len__(self):
+        return len(self.coordinates) - 1
+
+    @property
+    def nbytes(self):
+        """Memory taken by the coordinates and lookup arrays."""
+        return self.coordinates.nbytes + self.lookup.nbytes + self.list_lookup.nbytes + self.list_starts.nbytes + self.list_counts.nbytes
+
+    def rows(self, point_ids):
+        """Return the rows of IfcCartesianPoint ids in coordinates, -1 for missing or unknown ones."""
+        return lookup_rows(self.lookup, np.asarray(point_ids, dtype=np.int64))
+
+    def points(self, point_ids):
+        """Return an (n, 3) array of the coordinates of IfcCartesianPoint ids; missing ones are the origin."""
+        return self.coordinates[self.rows(point_ids)]
+
+    def point_list(self, list_id):
+        """Return the points of one IfcCartesianPointList as a read-only view into coordinates."""
+        position = self.list_lookup[list_id] if 0 <= list_id < len(self.list_lookup) else -1
+        if position < 0:
+            raise KeyError(list_id)
+        start = self.list_starts[position]
+        return self.coordinates[start:start + self.list_counts[position]]
+
+    def loop_rows(self, loop_ids, cancel=None):
+        """Return (rows, counts): the point rows of IfcPolyLoop entities packed end to end, and the points per loop."""
+        point_refs, counts = decode_lists(self.index, loop_ids, cancel)
+        return self.rows(point_refs), counts
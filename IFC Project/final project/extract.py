@@ -0,0 +1,231 @@
+import logging
+
+import numpy as np
+
+from logs import get_logger
+from properties import PropertyIndex
+from records import DoorRecord, SpaceRecord, WallRecord, WindowRecord, intern_text
+from table import ElementTable
+
+logger = get_logger("extract")
+
+PROGRESS_EVERY = 256  # Report progress once per this many elements
+
+GLASS_AREA_PROPERTY = "Steklena površina"
+
+def _step(cancel, progress, stage, done, total):
+    """Honour cancellation and report progress from inside an extraction loop."""
+    if cancel is not None:
+        cancel.check()
+    if progress is not None and (done % PROGRESS_EVERY == 0 or done == total):
+        progress(stage, done, total)
+
+def _location(product, placements=None):
+    """Return the world origin of a product from a PlacementResolver, else its local offset, or None."""
+    if product.ObjectPlacement:
+        if placements is not None:
+            origin = placements.origin(product.ObjectPlacement.id())
+            if origin is not None:
+                return origin
+        placement = product.ObjectPlacement.RelativePlacement
+        if placement and hasattr(placement, "Location"):
+            return tuple(placement.Location.Coordinates)
+    return None
+
+def _name(product):
+    return intern_text(product.Name) if product.Name else "Unnamed"
+
+def drain(generator):
+    """Run a generator to its end, discarding what it yields, and return its return value."""
+    while True:
+        try:
+            next(generator)
+        except StopIteration as done:
+            return done.value
+
+def batched(iterable, size):
+    """Yield lists of up to size items from any iterable."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def wall_record(wall, placements=None):
+    """Build the WallRecord of one IfcWall, located in world coordinates when placements are given."""
+    return WallRecord(
+        wall.id(),
+        wall.GlobalId,
+        _name(wall),
+        intern_text(wall.is_a()),
+        intern_text(wall.Description),
+        _location(wall, placements)
+    )
+
+def opening_record(product):
+    """Build the DoorRecord or WindowRecord of one IfcDoor or IfcWindow."""
+    record_type = DoorRecord if product.is_a("IfcDoor") else WindowRecord
+    return record_type(
+        product.id(),
+        product.GlobalId,
+        _name(product),
+        product.OverallWidth if hasattr(product, "OverallWidth") else "N/A",
+        product.OverallHeight if hasattr(product, "OverallHeight") else "N/A"
+    )
+
+def _space_quantities(space, properties):
+    return (
+        properties.find_quantity(space.id(), "NetFloorArea", "IfcQuantityArea"),
+        properties.find_quantity(space.id(), "NetVolume", "IfcQuantityVolume")
+    )
+
+def measure_spaces(spaces, properties, geometry=None, cancel=None):
+    """Measure the spaces that lack an area or volume quantity from a FacetedGeometry, in one batch.
+
+    geometry may also be a function returning the FacetedGeometry (or None),
+    called only when some space lacks a quantity, so files whose spaces all
+    have theirs never decode their faceted bodies. Returns
+    {space id: (footprint, enclosed volume)}, NaN where a space has no faceted
+    body; empty without a FacetedGeometry.
+    """
+    if geometry is None:
+        return {}
+    space_ids = [space.id() for space in spaces if None in _space_quantities(space, properties)]
+    if not space_ids:
+        return {}
+    if callable(geometry):
+        geometry = geometry()
+        if geometry is None:
+            return {}
+    _, volume, footprint = geometry.quantities(space_ids, cancel)
+    return dict(zip(space_ids, zip(footprint.tolist(), volume.tolist())))
+
+def space_record(space, properties, measured=None):
+    """Build the SpaceRecord of one IfcSpace, reading its quantities from a PropertyIndex.
+
+    When a quantity is missing, the area falls back to the footprint of the
+    space's body and the volume to its enclosed volume, as measured by
+    measure_spaces().
+    """
+    area, volume = _space_quantities(space, properties)
+    if measured and space.id() in measured:
+        footprint, body_volume = measured[space.id()]
+        if area is None and not np.isnan(footprint):
+            area = footprint
+        if volume is None and not np.isnan(body_volume):
+            volume = body_volume
+    return SpaceRecord(
+        space.id(),
+        space.GlobalId,
+        _name(space),
+        area if area is not None else "N/A",
+        volume if volume is not None else "N/A"
+    )
+
+def iter_records(ifc_file, ifc_type, cancel=None, progress=None, placements=None, geometry=None):
+    """Yield the records of one element type one at a time."""
+    properties = PropertyIndex(ifc_file, cancel, progress) if ifc_type == "IfcSpace" else None
+    elements = ifc_file.by_type(ifc_type)
+    measured = measure_spaces(elements, properties, geometry, cancel) if properties is not None else None
+    for done, element in enumerate(elements, 1):
+        _step(cancel, progress, ifc_type, done, len(elements))
+        if properties is not None:
+            yield space_record(element, properties, measured)
+        elif ifc_type == "IfcWall":
+            yield wall_record(element, placements)
+        else:
+            yield opening_record(element)
+
+def build_tables(walls, doors, windows, spaces):
+    """Build the columnar ElementTable for each element category."""
+    wall_table = ElementTable.from_rows(walls, text=("global_id", "name", "type"))
+    locations = np.array(
+        [(tuple(wall.location or ()) + (np.nan,) * 3)[:3] for wall in walls],
+        dtype=np.float64
+    ).reshape(-1, 3)
+    for axis, name in enumerate(("x", "y", "z")):
+        wall_table.add_column(name, locations[:, axis])
+    return {
+        "walls": wall_table,
+        "doors": ElementTable.from_rows(doors, numeric=("width", "height"), text=("global_id", "name")),
+        "windows": ElementTable.from_rows(windows, numeric=("width", "height"), text=("global_id", "name")),
+        "spaces": ElementTable.from_rows(spaces, numeric=("area", "volume"), text=("global_id", "name"))
+    }
+
+def extract_model(ifc_file, cancel=None, progress=None, placements=None, geometry=None):
+    """Extract all element categories, quantities and property values in one pass; see iter_extract()."""
+    return drain(iter_extract(ifc_file, cancel, progress, placements, geometry))
+
+def iter_extract(ifc_file, cancel=None, progress=None, placements=None, geometry=None):
+    """Extract all element categories, quantities and property values in one pass.
+
+    Yields a (category, record) pair as each wall, door, window or space is
+    extracted, so callers can show rows before the pass ends; the generator
+    returns the data dict of the whole model.
+
+    Property values come from a PropertyIndex built once over the
+    IfcRelDefinesByProperties relationships, so every product is visited once
+    and every property lookup is a dictionary hit. With a PlacementResolver,
+    wall locations are world coordinates instead of local offsets; with a
+    FacetedGeometry (or a function returning one, see measure_spaces()),
+    missing space quantities are computed from the geometry.
+    """
+    walls = []
+    doors = []
+    windows = []
+    spaces = []
+    properties = PropertyIndex(ifc_file, cancel, progress)
+    measured = measure_spaces(ifc_file.by_type("IfcSpace"), properties, geometry, cancel)
+    window_area = 0.0
+
+    verbose = logger.isEnabledFor(logging.DEBUG)  # Checked once, not per element
+    products = ifc_file.by_type("IfcProduct")
+    for done, product in enumerate(products, 1):
+        _step(cancel, progress, "Extracting", done, len(products))
+        if product.is_a("IfcWall"):
+            wall_info = wall_record(product, placements)
+            walls.append(wall_info)
+            yield "walls", wall_info
+        elif product.is_a("IfcDoor") or product.is_a("IfcWindow"):
+            info = opening_record(product)
+            if isinstance(info, DoorRecord):
+                if verbose:
+                    logger.debug("Door: %s", info)
+                doors.append(info)
+                yield "doors", info
+            else:
+                if verbose:
+                    logger.debug("Window: %s", info)
+                windows.append(info)
+                for value in properties.find_property(info.id, GLASS_AREA_PROPERTY):
+                    if isinstance(value, (int, float)):
+                        window_area += value
+                yield "windows", info
+        elif product.is_a("IfcSpace"):
+            space_info = space_record(product, properties, measured)
+            if verbose:
+                logger.debug("Space: %s", space_info)
+            spaces.append(space_info)
+            yield "spaces", space_info
+
+    logger.info(
+        "Number of walls: %d, doors: %d, windows: %d, spaces: %d",
+        len(walls), len(doors), len(windows), len(spaces)
+    )
+    tables = build_tables(walls, doors, windows, spaces)
+    return {
+        "schema": ifc_file.schema,
+        "walls": walls,
+        "doors": doors,
+        "windows": windows,
+        "spaces": spaces,
+        "tables": tables,
+        "total_area": tables["spaces"].total("area"),
+        "total_volume": tables["spaces"].total("volume"),
+        "window_area": window_area,
+        "property_sets": properties.property_sets,
+        "quantities": properties.quantities
+    }
@@ -0,0 +1,106 @@
+import uuid
+
+import numpy as np
+
+# The 64 digits of the IFC base-64 GlobalId encoding, in value order
+ALPHABET = b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_$"
+GUID_LENGTH = 22
+CATEGORIES = ("walls", "doors", "windows", "spaces")
+
+_DIGIT_VALUES = np.full(256, 255, dtype=np.uint8)
+_DIGIT_VALUES[np.frombuffer(ALPHABET, dtype=np.uint8)] = np.arange(64, dtype=np.uint8)
+_DIGITS = np.frombuffer(ALPHABET, dtype=np.uint8)
+
+def guids_to_bytes(guids):
+    """Decode 22-character IFC GlobalIds into an (n, 16) uint8 array of UUID bytes.
+
+    The first two characters carry the first byte, then each group of four
+    characters carries three bytes, all converted at once with NumPy.
+    """
+    guids = list(guids)
+    if any(len(guid) != GUID_LENGTH for guid in guids):
+        raise ValueError(f"IFC GlobalIds have {GUID_LENGTH} characters")
+    text = np.frombuffer("".join(guids).encode("ascii", "replace"), dtype=np.uint8).reshape(-1, GUID_LENGTH)
+    values = _DIGIT_VALUES[text].astype(np.uint32)
+    invalid = (values == 255).any(axis=1) | (values[:, 0] > 3)
+    if invalid.any():
+        raise ValueError(f"Invalid IFC GlobalId: {guids[int(np.argmax(invalid))]}")
+    groups = values[:, 2:].reshape(-1, 5, 4)
+    numbers = (groups[:, :, 0] << 18) | (groups[:, :, 1] << 12) | (groups[:, :, 2] << 6) | groups[:, :, 3]
+    result = np.empty((len(guids), 16), dtype=np.uint8)
+    result[:, 0] = values[:, 0] * 64 + values[:, 1]
+    result[:, 1::3] = numbers >> 16
+    result[:, 2::3] = (numbers >> 8) & 0xFF
+    result[:, 3::3] = numbers & 0xFF
+    return result
+
+def bytes_to_guids(data):
+    """Encode an (n, 16) uint8 array of UUID bytes as 22-character IFC GlobalIds."""
+    data = np.asarray(data, dtype=np.uint8).reshape(-1, 16).astype(np.uint32)
+    numbers = (data[:, 1::3] << 16) | (data[:, 2::3] << 8) | data[:, 3::3]
+    values = np.empty((len(data), GUID_LENGTH), dtype=np.uint32)
+    values[:, 0] = data[:, 0] >> 6
+    values[:, 1] = data[:, 0] & 63
+    groups = values[:, 2:].reshape(-1, 5, 4)
+    for digit, shift in enumerate((18, 12, 6, 0)):
+        groups[:, :, digit] = (numbers >> shift) & 63
+    values[:, 2:] = groups.reshape(-1, 20)
+    text = _DIGITS[values].tobytes().decode("ascii")
+    return [text[i:i + GUID_LENGTH] for i in range(0, len(text), GUID_LENGTH)]
+
+def guids_to_uuids(guids):
+    """Convert IFC GlobalIds to uuid.UUID objects."""
+    return [uuid.UUID(bytes=row.tobytes()) for row in guids_to_bytes(guids)]
+
+def uuids_to_guids(uuids):
+    """Convert UUIDs (uuid.UUID objects or their string forms) to IFC GlobalIds."""
+    raw = b"".join((value if isinstance(value, uuid.UUID) else uuid.UUID(value)).bytes for value in uuids)
+    return bytes_to_guids(np.frombuffer(raw, dtype=np.uint8))
+
+class GuidIndex:
+    """GlobalId -> element record of every extracted element, for joins with external systems.
+
+    Built from the extracted data in one pass, or taken from its 'global_ids'
+    entry when the model stored one there; each lookup is a dictionary hit.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.positions = data.get("global_ids")  # GlobalId -> (category, position in data[category])
+        if self.positions is None:
+            self.positions = {}
+            for category in CATEGORIES:
+                for position, record in enumerate(data[category]):
+                    self.positions[record.global_id] = (category, position)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, global_id):
+        return global_id in self.positions
+
+    def category(self, global_id):
+        """Return 'walls', 'doors', 'windows' or 'spaces' for a GlobalId, or None."""
+        found = self.positions.get(global_id)
+        return found[0] if found else None
+
+    def get(self, global_id):
+        """Return the record with a GlobalId, or None."""
+        found = self.positions.get(global_id)
+        if found is None:
+            return None
+        return self.data[found[0]][found[1]]
+
+    def lookup(self, global_ids):
+        """Return the record (or None) of each GlobalId, in order."""
+        data = self.data
+        positions = self.positions
+        records = []
+        for global_id in global_ids:
+            found = positions.get(global_id)
+            records.append(data[found[0]][found[1]] if found is not None else None)
+        return records
+
+    def lookup_uuids(self, uuids):
+        """Return the record (or None) of each element given by UUID instead of GlobalId."""
+        return self.lookup(uuids_to_guids(uuids))
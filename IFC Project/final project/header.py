@@ -0,0 +1,59 @@
+import time
+
+from step import parse_statement, split_statements
+
+HEADER_READ_SIZE = 64 * 1024
+HEADER_READ_LIMIT = 4 * 1024 * 1024  # Give up if no ENDSEC in the first few megabytes
+
+def read_header_text(file_path):
+    """Read the raw text of the HEADER section without touching the DATA section."""
+    chunks = []
+    size = 0
+    with open(file_path, "rb") as f:
+        while size < HEADER_READ_LIMIT:
+            chunk = f.read(HEADER_READ_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+            text = b"".join(chunks)
+            if b"ENDSEC;" in text:
+                break
+    text = b"".join(chunks).decode("latin-1")
+    start = text.find("HEADER;")
+    end = text.find("ENDSEC;", start)
+    if start < 0 or end < 0:
+        raise ValueError("No HEADER section found, not an IFC (STEP) file?")
+    return text[start + len("HEADER;"):end]
+
+def probe_header(file_path):
+    """Return schema and FILE_NAME metadata read from the HEADER section only."""
+    started = time.perf_counter()
+    header = {
+        "schema": None,
+        "file_name": None,
+        "time_stamp": None,
+        "authors": [],
+        "organizations": [],
+        "preprocessor": None,
+        "application": None,
+        "description": [],
+        "elapsed_ms": None
+    }
+    for statement in split_statements(read_header_text(file_path)):
+        if not statement:
+            continue
+        name, args = parse_statement(statement)
+        if name == "FILE_SCHEMA" and args and args[0]:
+            header["schema"] = args[0][0]
+        elif name == "FILE_NAME" and len(args) >= 6:
+            header["file_name"] = args[0]
+            header["time_stamp"] = args[1]
+            header["authors"] = [a for a in args[2] if a]
+            header["organizations"] = [o for o in args[3] if o]
+            header["preprocessor"] = args[4]
+            header["application"] = args[5]
+        elif name == "FILE_DESCRIPTION" and args:
+            header["description"] = [d for d in args[0] if d]
+    header["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    return header
@@ -0,0 +1,121 @@
+import queue
+import threading
+
+# Kinds of message a worker thread sends back to the Tk thread
+PROGRESS = "progress"
+BATCH = "batch"
+DONE = "done"
+
+class OperationCancelled(Exception):
+    """Raised inside a job once its CancelToken has been cancelled."""
+
+class CancelToken:
+    """Thread-safe flag that long-running model operations check between elements."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Ask the operation to stop at its next check."""
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Raise OperationCancelled if cancel() has been called."""
+        if self._event.is_set():
+            raise OperationCancelled()
+
+class BackgroundRunner:
+    """Run model work on a worker thread and deliver results through the Tk event loop.
+
+    Callbacks always run on the Tk main thread, so they may update widgets.
+    """
+
+    def __init__(self, root, poll_interval_ms=50):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self._results = queue.Queue()
+        self._pending = 0
+
+    @property
+    def busy(self):
+        """True while a submitted job has not delivered its result yet."""
+        return self._pending > 0
+
+    def submit(self, work, on_done, on_error=None, on_progress=None, on_batch=None, batch_size=256):
+        """Run work(cancel, progress) on a worker thread and return its CancelToken.
+
+        on_done(result), on_error(exception) and on_progress(stage, done, total)
+        are called on the Tk thread. Nothing is delivered once the job is cancelled.
+
+        With on_batch, work must return an iterable. It is consumed on the worker
+        thread and its items reach on_batch(items) as they arrive, all batches
+        queued since the previous poll merged into one call, so the GUI refreshes
+        at most once per poll interval. on_done then receives the item count.
+        """
+        cancel = CancelToken()
+
+        def progress(stage, done, total):
+            if on_progress is not None and not cancel.cancelled:
+                self._results.put((PROGRESS, cancel, on_progress, (stage, done, total)))
+
+        def run():
+            try:
+                result = work(cancel, progress)
+                if on_batch is not None:
+                    count = 0
+                    batch = []
+                    for item in result:
+                        batch.append(item)
+                        if len(batch) >= batch_size:
+                            count += len(batch)
+                            self._results.put((BATCH, cancel, on_batch, (batch,)))
+                            batch = []
+                    if batch:
+                        count += len(batch)
+                        self._results.put((BATCH, cancel, on_batch, (batch,)))
+                    result = count
+                self._results.put((DONE, cancel, on_done, (result,)))
+            except OperationCancelled:
+                self._results.put((DONE, cancel, None, ()))
+            except Exception as e:
+                self._results.put((DONE, cancel, on_error, (e,)))
+
+        self._pending += 1
+        threading.Thread(target=run, daemon=True).start()
+        if self._pending == 1:
+            self.root.after(self.poll_interval_ms, self._poll)
+        return cancel
+
+    def _poll(self):
+        batched = None  # (cancel, on_batch, items) merged from consecutive batch messages
+        while True:
+            try:
+                kind, cancel, callback, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == BATCH:
+                if batched is not None and batched[0] is cancel and batched[1] is callback:
+                    batched[2].extend(args[0])
+                else:
+                    if batched is not None:
+                        self._deliver(*batched)
+                    batched = (cancel, callback, list(args[0]))
+                continue
+            if batched is not None:
+                self._deliver(*batched)
+                batched = None
+            if kind == DONE:
+                self._pending -= 1
+            self._deliver(cancel, callback, *args)
+        if batched is not None:
+            self._deliver(*batched)
+        if self._pending > 0:
+            self.root.after(self.poll_interval_ms, self._poll)
+
+    def _deliver(self, cancel, callback, *args):
+        if callback is not None and not cancel.cancelled:
+            callback(*args)
@@ -0,0 +1,65 @@
+import collections
+import logging
+import logging.handlers
+import sys
+
+LOGGER_NAME = "ifc"
+
+# Verbosity levels: quiet shows problems only, normal adds summaries,
+# verbose adds one line per element
+QUIET = -1
+NORMAL = 0
+VERBOSE = 1
+LEVELS = {QUIET: logging.WARNING, NORMAL: logging.INFO, VERBOSE: logging.DEBUG}
+
+def get_logger(name):
+    """Return a logger below the application logger, e.g. get_logger('model')."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+def configure_logging(verbosity=NORMAL, log_file=None, buffer_size=500, stream=None):
+    """Send application logs to a file or stream (stdout by default), buffered buffer_size records at a time.
+
+    Warnings and errors flush the buffer immediately; the rest is written in
+    batches. Returns the buffering handler so callers can flush() it.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(LEVELS.get(verbosity, logging.DEBUG if verbosity > VERBOSE else logging.WARNING))
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.MemoryHandler):
+            handler.close()
+            logger.removeHandler(handler)
+    if log_file:
+        target = logging.FileHandler(log_file, encoding="utf-8")
+        target.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    else:
+        target = logging.StreamHandler(stream if stream is not None else sys.stdout)
+        target.setFormatter(logging.Formatter("%(message)s"))
+    handler = logging.handlers.MemoryHandler(buffer_size, flushLevel=logging.WARNING, target=target)
+    logger.addHandler(handler)
+    return handler
+
+class LogPaneHandler(logging.Handler):
+    """Collect formatted log lines for a GUI pane to drain periodically.
+
+    Thread-safe: worker threads emit, the Tk thread calls drain(). Only the
+    newest max_lines are kept, so a flood of records cannot grow memory.
+    """
+
+    def __init__(self, max_lines=2000):
+        super().__init__()
+        self.lines = collections.deque(maxlen=max_lines)
+        self.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+
+    def emit(self, record):
+        try:
+            self.lines.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    def drain(self):
+        """Return and forget the lines collected since the last drain."""
+        lines = []
+        while self.lines:
+            lines.append(self.lines.popleft())
+        return lines
@@ -1,16 +1,28 @@
+import argparse
 import tkinter as tk
+from logs import NORMAL, QUIET, VERBOSE, configure_logging
 from model import IfcModel
+from snapshot import SnapshotStore
 from view import IfcView
 from controller import IfcController
 
 # Main Application
 def main():
+    parser = argparse.ArgumentParser(description="IFC Wall Reader")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every element")
+    parser.add_argument("-q", "--quiet", action="store_true", help="log warnings and errors only")
+    parser.add_argument("--log-file", help="write the log to this file instead of the console")
+    parser.add_argument("--warm-up", action="store_true", help="precompute all analyses after a file is opened")
+    args = parser.parse_args()
+    configure_logging(VERBOSE if args.verbose else QUIET if args.quiet else NORMAL, args.log_file)
+    
     root = tk.Tk()
-    root.geometry("600x400")
-    model = IfcModel()
+    root.geometry("700x600")
+    model = IfcModel(snapshots=SnapshotStore())
     controller = IfcController(model, None)
     view = IfcView(root, controller)
     controller.view = view
+    view.warm_up_var.set(args.warm_up)
     root.mainloop()
 
 if __name__ == "__main__":
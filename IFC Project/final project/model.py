@@ -1,164 +1,564 @@
-import ifcopenshell
+import threading
+
+from brep import FacetedGeometry, add_geometry
+from coords import CoordinatePool
+from extract import drain, iter_extract, iter_records
+from guid import GuidIndex
+from header import probe_header
+from session import ModelCache, file_signature
+from jobs import OperationCancelled
+from logs import get_logger
+from placement import PlacementResolver
+from spatial import SpatialIndex, add_storeys
+from step_index import StepIndex
+
+logger = get_logger("model")
 
 class IfcModel:
-    def __init__(self):
+    def __init__(self, session=None, snapshots=None):
         self.file_path = None
-        self.ifc_file = None
+        self.session = session if session is not None else ModelCache()  # Parsed files; may be shared between models
+        self.snapshots = snapshots  # Optional SnapshotStore for instant reopen
+        self.data = None
+        self.data_signature = None
+        self.index = None
+        self.index_signature = None
+        self.coordinates = None  # CoordinatePool of self.index
+        self.placements = None  # PlacementResolver of self.index
+        self.spatial = None  # SpatialIndex of self.index
+        self.geometry = None  # FacetedGeometry of self.index
+        self.guids = None  # GuidIndex of self.data, built when the data is loaded
+        self.lock = threading.RLock()  # Serialises loading between background jobs
 
     def set_file_path(self, file_path):
-        """Set the IFC file path."""
+        """Set the IFC file path.
+
+        Does not wait for the model lock, which a background load may hold for
+        a while: stored data and indexes are matched to their file by
+        signature, and a load that finds the path changed publishes nothing.
+        """
         self.file_path = file_path
-        self.ifc_file = None  # Reset ifc_file when path changes
+        self.data = None
 
-    def open_ifc_file(self):
-        """Open the IFC file and return it, or None if it fails."""
-        if not self.file_path:
-            print("No path to the IFC file")
+    @property
+    def ifc_file(self):
+        """The parsed IFC file if it is still in the model cache, otherwise None."""
+        file_path = self.file_path
+        if not file_path:
+            return None
+        return self.session.get(file_path)
+
+    def open_ifc_file(self, file_path=None):
+        """Open the IFC file (or the one at file_path) and return it, or None if it fails."""
+        file_path = file_path or self.file_path
+        if not file_path:
+            logger.warning("No path to the IFC file")
             return None
-        print(f"Attempting to open the file: {self.file_path}")
         try:
-            self.ifc_file = ifcopenshell.open(self.file_path)
-            print("IFC file opened successfully")
-            return self.ifc_file
+            ifc_file = self.session.open(file_path)
+            if self.session.last_hit:
+                logger.info("Reusing parsed IFC file: %s", file_path)
+            else:
+                logger.info("IFC file opened successfully: %s", file_path)
+            return ifc_file
         except FileNotFoundError:
-            print("IFC file not found")
+            logger.warning("IFC file not found: %s", file_path)
             return None
         except Exception as e:
-            print(f"An error occurred while opening the file: {str(e)}")
+            logger.error("An error occurred while opening the file: %s", e)
             return None
 
-    def get_walls(self):
-        """Retrieve walls from the IFC file and return them."""
-        ifc_file = self.open_ifc_file()
+    def cache_info(self):
+        """Return the parse cache hit, miss and eviction counters."""
+        return self.session.cache_info()
+
+    def load_data(self, cancel=None, progress=None):
+        """Return the extracted model data, reading it from a snapshot when one exists.
+
+        cancel is an optional CancelToken checked between elements; progress is
+        an optional callback progress(stage, done, total).
+
+        The model lock is not held while ifcopenshell parses the file, which
+        cannot be interrupted, so a cancelled job still parsing one file does
+        not hold up work on the next.
+        """
+        return drain(self._load(None, cancel, progress))
+
+    def iter_loaded(self, category, cancel=None, progress=None):
+        """Yield the records of 'walls', 'doors', 'windows', 'spaces' or 'storeys' while the model loads.
+
+        Loads like load_data(), keeping the data and its snapshot once the whole
+        model is extracted, but yields each record of the category as soon as
+        the extraction reaches it. Raises ValueError if the IFC file cannot be
+        opened.
+        """
+        file_path = self.file_path
+        data = yield from self._load(category, cancel, progress)
+        if data is None:
+            raise ValueError(f"IFC file could not be opened: {file_path}")
+
+    def _load(self, category, cancel, progress):
+        """Generator behind load_data() and iter_loaded(): yields the records of category, returns the data or None."""
+        file_path = self.file_path
+        key = self._snapshot_key(file_path)
+        with self.lock:
+            data = self._stored_data(file_path, key)
+        if data is not None:
+            if category is not None:
+                yield from data[category]
+            return data
+        if cancel is not None:
+            cancel.check()
+        if progress is not None:
+            progress("Parsing", 0, 0)
+        if self.open_ifc_file(file_path) is None:
+            return None
+        with self.lock:
+            if cancel is not None:
+                cancel.check()
+            if self.file_path != file_path:
+                # Another file was picked during the parse: nothing to publish
+                raise OperationCancelled()
+            return (yield from self._load_data(file_path, key, category, cancel, progress))
+
+    def _snapshot_key(self, file_path):
+        """Return the snapshot key of a file, or None without a snapshot store or a readable file.
+
+        The first key of a file version hashes the whole file, so callers get
+        it before taking the model lock.
+        """
+        if self.snapshots is None or not file_path:
+            return None
+        try:
+            return self.snapshots.key_for(file_path)
+        except OSError:
+            return None
+
+    def _stored_data(self, file_path, key):
+        """Return the extracted data of file_path if it is in memory or in the snapshot under key, else None; needs the lock."""
+        if not file_path:
+            return None
+        try:
+            signature = file_signature(file_path)
+        except OSError:
+            return None
+        if self.data is not None and self.data_signature == signature:
+            return self.data
+        if key is None:
+            return None
+        data = self.snapshots.load(key)
+        if data is not None:
+            logger.info("Loaded snapshot for: %s", file_path)
+            self._publish(data, signature)
+        return data
+
+    def _publish(self, data, signature):
+        """Make data the current extracted data, with its GlobalId index ready for lookups; needs the lock."""
+        self.guids = GuidIndex(data)
+        self.data = data
+        self.data_signature = signature
+
+    def _load_data(self, file_path, key, category, cancel, progress):
+        data = self._stored_data(file_path, key)
+        if data is not None:
+            if category is not None:
+                yield from data[category]
+            return data
+        try:
+            signature = file_signature(file_path)
+        except OSError:
+            logger.warning("IFC file not found: %s", file_path)
+            return None
+        # Normally already parsed by load_data() before it took the lock
+        ifc_file = self.session.get(file_path)
+        if ifc_file is None:
+            ifc_file = self.open_ifc_file(file_path)
         if ifc_file is None:
             return None
-        walls = ifc_file.by_type("IfcWall")
-        print(f"Number of walls: {len(walls)}")
-        return walls
+        placements = self._placement_resolver(file_path, cancel, progress)
+        geometry_failed = False
+        def load_geometry():
+            # Only called when a space lacks a quantity: most files never decode their bodies
+            nonlocal geometry_failed
+            geometry = self._faceted_geometry(file_path, cancel, progress)
+            geometry_failed = geometry is None
+            return geometry
+        extraction = iter_extract(ifc_file, cancel, progress, placements, load_geometry)
+        while True:
+            try:
+                record_category, record = next(extraction)
+            except StopIteration as done:
+                data = done.value
+                break
+            if record_category == category:
+                yield record
+        spatial = self._spatial_index(file_path, cancel, progress)
+        if spatial is not None:
+            add_storeys(data, spatial)
+        else:
+            data["storeys"] = []
+        # Data missing a part that failed to build is kept for this session only,
+        # so the next run tries again instead of reading the gap from a snapshot
+        # Stored with the data, so a snapshot reopens with its GlobalId index built
+        data["global_ids"] = GuidIndex(data).positions
+        complete = placements is not None and not geometry_failed and spatial is not None
+        if key is not None and complete:
+            self.snapshots.save(key, data)
+        if self.file_path != file_path:
+            # Another file was picked during the extraction: nothing to publish
+            raise OperationCancelled()
+        self._publish(data, signature)
+        if category == "storeys":
+            yield from data["storeys"]
+        return data
 
-    def get_schema(self):
-        """Retrieve the schema version from the IFC file."""
-        ifc_file = self.open_ifc_file()
+    def warm_up(self, cancel=None, progress=None):
+        """Precompute what the buttons need, in the order they give results, so clicks hit the cache.
+
+        The entity index answers the door and window counts first; the extracted
+        data then covers walls, spaces and the window area for solar gain.
+        Returns the number of steps that finished.
+        """
+        steps = 0
+        for step in (self.step_index, self.load_data):
+            if cancel is not None:
+                cancel.check()
+            if step(cancel, progress) is None:
+                break
+            steps += 1
+        logger.info("Warm-up finished %d of 2 steps for: %s", steps, self.file_path)
+        return steps
+
+    def release_sources(self):
+        """Drop the parsed file and the indexes built from it, keeping the extracted data.
+
+        For callers holding many models, such as the server's workers: they are
+        rebuilt if the file changes on disk or a query needs them again.
+        """
+        file_path = self.file_path
+        with self.lock:
+            if file_path:
+                self.session.invalidate(file_path)
+            if self.index is not None:
+                self.index.close()
+            self.index = None
+            self.index_signature = None
+            self.coordinates = None
+            self.placements = None
+            self.spatial = None
+            self.geometry = None
+
+    def step_index(self, cancel=None, progress=None):
+        """Return the entity offset index of the file, building it once per file version."""
+        file_path = self.file_path
+        with self.lock:
+            return self._step_index(file_path, cancel, progress)
+
+    def _step_index(self, file_path, cancel, progress):
+        if not file_path:
+            logger.warning("No path to the IFC file")
+            return None
+        try:
+            signature = file_signature(file_path)
+            if self.index is not None and self.index_signature == signature:
+                return self.index
+            if self.index is not None:
+                self.index.close()
+                self.index = None
+            self.index = StepIndex(file_path, cancel, progress)
+            self.index_signature = signature
+            return self.index
+        except FileNotFoundError:
+            logger.warning("IFC file not found: %s", file_path)
+            return None
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            logger.error("An error occurred while indexing the file: %s", e)
+            return None
+
+    def coordinate_pool(self, cancel=None, progress=None):
+        """Return every point coordinate of the file in one array, decoded once per file version."""
+        file_path = self.file_path
+        with self.lock:
+            return self._coordinate_pool(file_path, cancel, progress)
+
+    def _coordinate_pool(self, file_path, cancel, progress):
+        index = self._step_index(file_path, cancel, progress)
+        if index is None:
+            return None
+        if self.coordinates is None or self.coordinates.index is not index:
+            if progress is not None:
+                progress("Decoding coordinates", 0, 0)
+            try:
+                self.coordinates = CoordinatePool(index, cancel)
+            except OperationCancelled:
+                raise
+            except Exception as e:
+                logger.error("An error occurred while decoding coordinates: %s", e)
+                return None
+        return self.coordinates
+
+    def placement_resolver(self, cancel=None, progress=None):
+        """Return the world transforms of all local placements, resolved once per file version."""
+        file_path = self.file_path
+        with self.lock:
+            return self._placement_resolver(file_path, cancel, progress)
+
+    def _placement_resolver(self, file_path, cancel, progress):
+        index = self._step_index(file_path, cancel, progress)
+        if index is None:
+            return None
+        if self.placements is None or self.placements.index is not index:
+            if progress is not None:
+                progress("Resolving placements", 0, 0)
+            try:
+                self.placements = PlacementResolver(index, cancel, self._coordinate_pool(file_path, cancel, progress))
+            except OperationCancelled:
+                raise
+            except Exception as e:
+                logger.error("An error occurred while resolving placements: %s", e)
+                return None
+        return self.placements
+
+    def spatial_index(self, cancel=None, progress=None):
+        """Return the site/building/storey hierarchy of the file, built once per file version."""
+        file_path = self.file_path
+        with self.lock:
+            return self._spatial_index(file_path, cancel, progress)
+
+    def _spatial_index(self, file_path, cancel, progress):
+        index = self._step_index(file_path, cancel, progress)
+        if index is None:
+            return None
+        if self.spatial is None or self.spatial.index is not index:
+            if progress is not None:
+                progress("Indexing spatial structure", 0, 0)
+            try:
+                self.spatial = SpatialIndex(index, cancel)
+            except OperationCancelled:
+                raise
+            except Exception as e:
+                logger.error("An error occurred while indexing the spatial structure: %s", e)
+                return None
+        return self.spatial
+
+    def faceted_geometry(self, cancel=None, progress=None):
+        """Return face areas and per-product body quantities of the faceted geometry, built once per file version."""
+        file_path = self.file_path
+        with self.lock:
+            return self._faceted_geometry(file_path, cancel, progress)
+
+    def _faceted_geometry(self, file_path, cancel, progress):
+        index = self._step_index(file_path, cancel, progress)
+        if index is None:
+            return None
+        if self.geometry is None or self.geometry.index is not index:
+            if progress is not None:
+                progress("Measuring faceted geometry", 0, 0)
+            try:
+                self.geometry = FacetedGeometry(index, cancel, self._coordinate_pool(file_path, cancel, progress))
+            except OperationCancelled:
+                raise
+            except Exception as e:
+                logger.error("An error occurred while measuring faceted geometry: %s", e)
+                return None
+        return self.geometry
+
+    def container_of(self, element_id, cancel=None, progress=None):
+        """Return the id of the spatial structure or object an element belongs to, or None."""
+        spatial = self.spatial_index(cancel, progress)
+        if spatial is None:
+            return None
+        return spatial.container_of(element_id)
+
+    def count_elements(self, ifc_type, cancel=None, progress=None):
+        """Count instances of a type (including standard-case subtypes) from the index."""
+        index = self.step_index(cancel, progress)
+        if index is None:
+            return None
+        return index.count(ifc_type)
+
+    def cached_data(self):
+        """Return the extracted data if it is in memory or in a snapshot, without parsing."""
+        file_path = self.file_path
+        key = self._snapshot_key(file_path)
+        with self.lock:
+            return self._stored_data(file_path, key)
+
+    def _iter_records(self, category, ifc_type, cancel, progress):
+        """Yield the records of one category; raises ValueError if the IFC file cannot be opened."""
+        file_path = self.file_path
+        key = self._snapshot_key(file_path)
+        with self.lock:
+            data = self._stored_data(file_path, key)
+        if data is not None:
+            yield from data[category]
+            return
+        ifc_file = self.open_ifc_file(file_path)
         if ifc_file is None:
+            raise ValueError(f"IFC file could not be opened: {file_path}")
+        with self.lock:
+            if self.file_path != file_path:
+                raise OperationCancelled()
+            placements = self._placement_resolver(file_path, cancel, progress) if ifc_type == "IfcWall" else None
+        def load_geometry():
+            with self.lock:
+                return self._faceted_geometry(file_path, cancel, progress)
+        yield from iter_records(ifc_file, ifc_type, cancel, progress, placements, load_geometry)
+
+    def iter_walls(self, cancel=None, progress=None):
+        """Yield wall records one at a time instead of building the full list."""
+        return self._iter_records("walls", "IfcWall", cancel, progress)
+
+    def iter_doors(self, cancel=None, progress=None):
+        """Yield door records one at a time instead of building the full list."""
+        return self._iter_records("doors", "IfcDoor", cancel, progress)
+
+    def iter_windows(self, cancel=None, progress=None):
+        """Yield window records one at a time instead of building the full list."""
+        return self._iter_records("windows", "IfcWindow", cancel, progress)
+
+    def iter_spaces(self, cancel=None, progress=None):
+        """Yield space records (area and volume) one at a time instead of building the full list."""
+        return self._iter_records("spaces", "IfcSpace", cancel, progress)
+
+    def get_walls(self, cancel=None, progress=None):
+        """Retrieve walls from the IFC file and return them."""
+        data = self.load_data(cancel, progress)
+        if data is None:
+            return None
+        return data["walls"]
+
+    def probe_header(self):
+        """Read schema and file metadata from the HEADER section without a full load."""
+        file_path = self.file_path
+        if not file_path:
+            logger.warning("No path to the IFC file")
+            return None
+        try:
+            return probe_header(file_path)
+        except FileNotFoundError:
+            logger.warning("IFC file not found: %s", file_path)
             return None
-        return ifc_file.schema
+        except Exception as e:
+            logger.error("An error occurred while reading the file header: %s", e)
+            return None
+
+    def get_schema(self):
+        """Retrieve the schema version from the IFC file header."""
+        file_path, data, signature = self.file_path, self.data, self.data_signature
+        if data is not None and file_path:
+            try:
+                if signature == file_signature(file_path):
+                    return data["schema"]
+            except OSError:
+                pass
+        header = self.probe_header()
+        if header is None:
+            return None
+        return header["schema"]
 
-    def get_doors(self):
+    def get_doors(self, cancel=None, progress=None):
         """Retrieve doors from the IFC file and return them."""
-        ifc_file = self.open_ifc_file()
-        if ifc_file is None:
+        data = self.load_data(cancel, progress)
+        if data is None:
             return None
-        doors = ifc_file.by_type("IfcDoor")
-        print(f"Number of doors: {len(doors)}")
-        door_data = []
-        for door in doors:
-            door_info = {
-                "id": door.id(),
-                "global_id": door.GlobalId,
-                "name": door.Name if door.Name else "Unnamed",
-                "width": door.OverallWidth if hasattr(door, "OverallWidth") else "N/A",
-                "height": door.OverallHeight if hasattr(door, "OverallHeight") else "N/A"
-            }
-            print(f"Doors: {door_info}")
-            door_data.append(door_info)
-        return door_data
-
-    def get_windows(self):
+        return data["doors"]
+
+    def get_windows(self, cancel=None, progress=None):
         """Retrieve windows from the IFC file and return them."""
-        ifc_file = self.open_ifc_file()
-        if ifc_file is None:
+        data = self.load_data(cancel, progress)
+        if data is None:
             return None
-        windows = ifc_file.by_type("IfcWindow")
-        print(f"Number of windows: {len(windows)}")
-        window_data = []
-        for window in windows:
-            window_info = {
-                "id": window.id(),
-                "global_id": window.GlobalId,
-                "name": window.Name if window.Name else "Unnamed",
-                "width": window.OverallWidth if hasattr(window, "OverallWidth") else "N/A",
-                "height": window.OverallHeight if hasattr(window, "OverallHeight") else "N/A"
-            }
-            print(f"Window: {window_info}")
-            window_data.append(window_info)
-        return window_data
-    
-    def get_space_areas(self):
+        return data["windows"]
+
+    def get_space_areas(self, cancel=None, progress=None):
         """Retrieve spaces from the IFC file and return their area data."""
-        ifc_file = self.open_ifc_file()
-        if ifc_file is None:
+        data = self.load_data(cancel, progress)
+        if data is None:
             return None
-        spaces = ifc_file.by_type("IfcSpace")
-        print(f"Number of spaces: {len(spaces)}")
-        space_data = []
-        total_area = 0.0
-        for space in spaces:
-            area = "N/A"
-            for rel in space.IsDefinedBy:
-                if rel.is_a("IfcRelDefinesByProperties"):
-                    prop_def = rel.RelatingPropertyDefinition
-                    if prop_def.is_a("IfcElementQuantity"):
-                        for quantity in prop_def.Quantities:
-                            if quantity.is_a("IfcQuantityArea") and quantity.Name == "NetFloorArea":
-                                area = quantity.AreaValue
-                                print(f"Found area for space {space.id()}: {area}")
-                                if isinstance(area, (int, float)):
-                                    total_area += area
-            space_info = {
-                "id": space.id(),
-                "global_id": space.GlobalId,
-                "name": space.Name if space.Name else "Unnamed",
-                "area": area
-            }
-            print(f"Space Area: {space_info}")
-            space_data.append(space_info)
-        return {"spaces": space_data, "total_area": total_area}
-
-    def get_space_volumes(self):
+        return {"spaces": data["spaces"], "total_area": data["total_area"]}
+
+    def get_space_volumes(self, cancel=None, progress=None):
         """Retrieve spaces from the IFC file and return their volume data."""
-        ifc_file = self.open_ifc_file()
-        if ifc_file is None:
+        data = self.load_data(cancel, progress)
+        if data is None:
             return None
-        spaces = ifc_file.by_type("IfcSpace")
-        print(f"Number of spaces: {len(spaces)}")
-        space_data = []
-        total_volume = 0.0
-        for space in spaces:
-            volume = "N/A"
-            for rel in space.IsDefinedBy:
-                if rel.is_a("IfcRelDefinesByProperties"):
-                    prop_def = rel.RelatingPropertyDefinition
-                    if prop_def.is_a("IfcElementQuantity"):
-                        for quantity in prop_def.Quantities:
-                            if quantity.is_a("IfcQuantityVolume") and quantity.Name == "NetVolume":
-                                volume = quantity.VolumeValue
-                                print(f"Found volume for space {space.id()}: {volume}")
-                                if isinstance(volume, (int, float)):
-                                    total_volume += volume
-            space_info = {
-                "id": space.id(),
-                "global_id": space.GlobalId,
-                "name": space.Name if space.Name else "Unnamed",
-                "volume": volume
-            }
-            print(f"Space Volume: {space_info}")
-            space_data.append(space_info)
-        return {"spaces": space_data, "total_volume": total_volume}
-
-    def calculate_total_window_area(self):
-        """Calculate total window glass area based on 'Steklena površina'."""
-        ifc_file = self.open_ifc_file()
-        if ifc_file is None:
-            return 0.0
-        total_area = 0.0
-        for window in ifc_file.by_type("IfcWindow"):
-            for rel in window.IsDefinedBy:
-                if rel.is_a("IfcRelDefinesByProperties"):
-                    prop_def = rel.RelatingPropertyDefinition
-                    if prop_def.is_a("IfcPropertySet"):
-                        for prop in prop_def.HasProperties:
-                            if prop.Name == "Steklena površina" and hasattr(prop, "NominalValue"):
-                                value = prop.NominalValue.wrappedValue
-                                if isinstance(value, (int, float)):
-                                    total_area += value
-        return total_area
+        return {"spaces": data["spaces"], "total_volume": data["total_volume"]}
+
+    def get_storeys(self, cancel=None, progress=None):
+        """Retrieve per-storey element counts and space area/volume totals."""
+        data = self.load_data(cancel, progress)
+        if data is None:
+            return None
+        return data["storeys"]
+
+    def global_id_index(self, cancel=None, progress=None):
+        """Return the GlobalId index of the extracted elements, built with the data when it is loaded."""
+        data = self.load_data(cancel, progress)
+        if data is None:
+            return None
+        guids = self.guids
+        if guids is not None and guids.data is data:
+            return guids
+        # The data was replaced since load_data() returned it
+        return GuidIndex(data)
+
+    def find_by_global_id(self, global_ids, cancel=None, progress=None):
+        """Return the record of each GlobalId in order, None where no element has it."""
+        guids = self.global_id_index(cancel, progress)
+        if guids is None:
+            return None
+        return guids.lookup(global_ids)
+
+    def get_element_table(self, category, cancel=None, progress=None, geometry=False):
+        """Return the columnar ElementTable for 'walls', 'doors', 'windows' or 'spaces'.
+
+        With geometry, the table also gets 'surface_area' (and 'volume' where it
+        has none) columns measured from the faceted bodies, which are decoded on
+        the first such request rather than on every load.
+        """
+        file_path = self.file_path
+        data = self.load_data(cancel, progress)
+        if data is None:
+            return None
+        table = data["tables"][category]
+        if geometry and "surface_area" not in table:
+            with self.lock:
+                if self.file_path != file_path:
+                    raise OperationCancelled()
+                faceted = self._faceted_geometry(file_path, cancel, progress)
+                if faceted is None:
+                    return None
+                if "surface_area" not in table:
+                    add_geometry(table, faceted, cancel)
+        return table
+
+    def get_property_sets(self, cancel=None, progress=None):
+        """Return property set values per element id: {id: {pset name: {property: value}}}."""
+        data = self.load_data(cancel, progress)
+        if data is None:
+            return None
+        return data["property_sets"]
+
+    def get_quantities(self, cancel=None, progress=None):
+        """Return quantity values per element id: {id: {quantity set name: {quantity: value}}}."""
+        data = self.load_data(cancel, progress)
+        if data is None:
+            return None
+        return data["quantities"]
+
+    def calculate_total_window_area(self, cancel=None, progress=None):
+        """Calculate total window glass area based on 'Steklena površina', or None if the file cannot be opened."""
+        data = self.load_data(cancel, progress)
+        if data is None:
+            return None
+        return data["window_area"]
+
+    def calculate_solar_gain(self, g_factor, ext_temp, int_temp, sun_hours, cancel=None, progress=None):
+        """Calculate the daily solar heat gain in Wh through the glass area of all windows."""
+        total_window_area = self.calculate_total_window_area(cancel, progress)
+        if total_window_area is None:
+            return None
+        return total_window_area * g_factor * (int_temp - ext_temp) * sun_hours
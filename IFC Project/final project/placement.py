@@ -0,0 +1,177 @@
+import re
+
+import numpy as np
+
+from step_index import LIST_ARGUMENT
+
+PRODUCT_PLACEMENT = 5  # Position of ObjectPlacement among the attributes of an IfcProduct
+
+# Flat entities decoded straight from the file bytes: "#15=IFCLOCALPLACEMENT(#9,#14)" yields its argument list
+_ARGUMENTS = re.compile(rb"#\d+\s*=\s*([A-Za-z0-9_]+)\s*\(([^)]*)\)")
+
+DEFAULT_VECTORS = ((0.0, 0.0, 0.0), (0.0, 0.0, 1.0), (1.0, 0.0, 0.0))  # Origin, Z axis, X axis
+
+def id_lookup(ids):
+    """Return an array mapping entity id -> position in ids, -1 for ids not in it."""
+    ids = np.asarray(ids, dtype=np.int64)
+    lookup = np.full(int(ids.max(initial=-1)) + 1, -1, dtype=np.int64)
+    lookup[ids] = np.arange(len(ids))
+    return lookup
+
+def lookup_rows(lookup, refs):
+    """Return the positions of referenced ids in a lookup, -1 for missing ($) or unknown references."""
+    rows = np.full(len(refs), -1, dtype=np.int64)
+    known = (refs >= 0) & (refs < len(lookup))
+    rows[known] = lookup[refs[known]]
+    return rows
+
+def decode_references(index, ids, width, cancel=None):
+    """Decode flat entities whose arguments are references or $ into (type names, (n, width) ids).
+
+    Missing arguments become -1. The references of all entities are parsed in
+    one NumPy call rather than one Python object per argument.
+    """
+    types = []
+    texts = []
+    for entity_id, match in zip(ids, index.match(ids, _ARGUMENTS, cancel)):
+        if match is None:
+            raise ValueError(f"Cannot decode entity #{entity_id}")
+        types.append(match[1].upper())
+        text = match[2]
+        if text.count(b",") + 1 != width:
+            text = b",".join((text.split(b",") + [b"$"] * width)[:width])
+        texts.append(text)
+    if not texts:
+        return types, np.empty((0, width), dtype=np.int64)
+    joined = b",".join(texts).replace(b"#", b"").replace(b"$", b"-1").replace(b"*", b"-1")
+    return types, np.fromstring(joined.decode("latin-1"), dtype=np.int64, sep=",").reshape(-1, width)
+
+def decode_vectors(index, ids, cancel=None):
+    """Decode IfcCartesianPoint / IfcDirection entities into an (n, 3) array, 2D ones padded with 0."""
+    texts = []
+    for entity_id, match in zip(ids, index.match(ids, LIST_ARGUMENT, cancel)):
+        if match is None:
+            raise ValueError(f"Cannot decode point or direction #{entity_id}")
+        texts.append(match[1])
+    if not texts:
+        return np.empty((0, 3))
+    joined = b",".join(texts)
+    if joined.count(b",") + 1 != 3 * len(texts):
+        # Some 2D values: pad each one to three coordinates
+        joined = b",".join(b",".join((text.split(b",") + [b"0"] * 3)[:3]) for text in texts)
+    return np.fromstring(joined.decode("latin-1"), sep=",").reshape(-1, 3)
+
+def axis_placement_matrices(locations, axes, ref_directions):
+    """Build (n, 4, 4) transforms from IfcAxis2Placement origins, Z axes and X reference directions."""
+    z = axes / np.linalg.norm(axes, axis=1, keepdims=True)
+    # Project the reference direction onto the plane normal to Z, as IfcAxis2Placement3D.P does
+    x = ref_directions - np.sum(ref_directions * z, axis=1, keepdims=True) * z
+    length = np.linalg.norm(x, axis=1, keepdims=True)
+    degenerate = length[:, 0] < 1e-12
+    if degenerate.any():
+        # Reference direction parallel to Z: fall back to any perpendicular direction
+        fallback = np.where(np.abs(z[degenerate, :1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]])
+        x[degenerate] = fallback - np.sum(fallback * z[degenerate], axis=1, keepdims=True) * z[degenerate]
+        length[degenerate] = np.linalg.norm(x[degenerate], axis=1, keepdims=True)
+    x /= length
+    matrices = np.zeros((len(locations), 4, 4))
+    matrices[:, :3, 0] = x
+    matrices[:, :3, 1] = np.cross(z, x)
+    matrices[:, :3, 2] = z
+    matrices[:, :3, 3] = locations
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+class PlacementResolver:
+    """World transforms of every IfcLocalPlacement in a file, resolved through their parent chains.
+
+    Built on a StepIndex. Every placement and direction is decoded once,
+    straight from the file bytes, and locations are read from a CoordinatePool
+    when one is given; the chains are then composed level by
+    level, so each link costs one row of a batched NumPy matrix product however
+    many products share it. Coordinates are in the file's length unit.
+    """
+
+    def __init__(self, index, cancel=None, pool=None):
+        self.index = index
+        self.pool = pool
+        placement_ids = index.ids("IFCLOCALPLACEMENT", include_subtypes=False)
+        self.lookup = id_lookup(placement_ids)
+        if cancel is not None:
+            cancel.check()
+        _, references = decode_references(index, placement_ids, 2, cancel)
+        # PlacementRelTo may also be an IfcGridPlacement, which is treated as the origin
+        self.parents = lookup_rows(self.lookup, references[:, 0])
+        if cancel is not None:
+            cancel.check()
+        local = self._local_matrices(references[:, 1], cancel)
+        self.matrices = self._compose(local, self.parents)
+        self.origins = self.matrices[:, :3, 3].tolist()
+
+    def _local_matrices(self, relative, cancel=None):
+        """Decode the IfcAxis2Placement of each placement into its local 4x4 transform."""
+        axis_ids = np.unique(relative)
+        types, references = decode_references(self.index, axis_ids, 3, cancel)
+        # IfcAxis2Placement2D has (Location, RefDirection): move RefDirection to the third column
+        planar = np.array([name == b"IFCAXIS2PLACEMENT2D" for name in types], dtype=bool)
+        references[planar, 2] = references[planar, 1]
+        references[planar, 1] = -1
+        # Locations come from the coordinate pool when there is one, leaving only directions to decode
+        first = 0 if self.pool is None else 1
+        vector_ids = np.unique(references[:, first:][references[:, first:] >= 0])
+        vectors = np.vstack([np.array(DEFAULT_VECTORS), decode_vectors(self.index, vector_ids, cancel)])
+        vector_lookup = id_lookup(vector_ids)
+        columns = [] if self.pool is None else [self.pool.points(references[:, 0])]
+        for slot in range(first, 3):
+            rows = lookup_rows(vector_lookup, references[:, slot])
+            columns.append(vectors[np.where(rows >= 0, rows + len(DEFAULT_VECTORS), slot)])
+        matrices = axis_placement_matrices(*columns)
+        return matrices[lookup_rows(id_lookup(axis_ids), relative)]
+
+    @staticmethod
+    def _compose(local, parents):
+        """Multiply each local transform by its parent's world transform, one depth level at a time."""
+        depth = np.zeros(len(parents), dtype=np.int64)
+        current = parents.copy()
+        for _ in range(len(parents) + 1):
+            linked = current >= 0
+            if not linked.any():
+                break
+            depth[linked] += 1
+            current[linked] = parents[current[linked]]
+        else:
+            raise ValueError("Cyclic IfcLocalPlacement chain")
+        world = local.copy()
+        for level in range(1, int(depth.max(initial=0)) + 1):
+            rows = np.flatnonzero(depth == level)
+            world[rows] = world[parents[rows]] @ local[rows]
+        return world
+
+    def row(self, placement_id):
+        """Return the row of a placement in matrices, or -1 if it is not an IfcLocalPlacement."""
+        if placement_id is None or not 0 <= placement_id < len(self.lookup):
+            return -1
+        return int(self.lookup[placement_id])
+
+    def matrix(self, placement_id):
+        """Return the 4x4 world transform of one IfcLocalPlacement."""
+        row = self.row(placement_id)
+        if row < 0:
+            raise KeyError(placement_id)
+        return self.matrices[row]
+
+    def origin(self, placement_id):
+        """Return the world (x, y, z) of a placement's origin, or None if it is not a local placement."""
+        row = self.row(placement_id)
+        return tuple(self.origins[row]) if row >= 0 else None
+
+    def locations(self, product_ids):
+        """Return {product id: (x, y, z)} world origins of products with a local placement."""
+        locations = {}
+        for product_id in product_ids:
+            args = self.index.entity(product_id).args
+            if len(args) > PRODUCT_PLACEMENT:
+                origin = self.origin(args[PRODUCT_PLACEMENT])
+                if origin is not None:
+                    locations[product_id] = origin
+        return locations
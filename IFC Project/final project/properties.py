@@ -0,0 +1,68 @@
+class PropertyIndex:
+    """Element id -> set name -> property/quantity name -> value, built in one pass.
+
+    Iterates the IfcRelDefinesByProperties relationships once instead of
+    walking IsDefinedBy from every element, so a property set shared by many
+    elements is decoded a single time.
+    """
+
+    def __init__(self, ifc_file, cancel=None, progress=None):
+        self.property_sets = {}
+        self.quantities = {}
+        self.quantity_types = {}  # (set name, quantity name) -> IFC quantity class
+        rels = ifc_file.by_type("IfcRelDefinesByProperties")
+        decoded = {}  # property definition id -> (target dict, values), shared between relationships
+        for done, rel in enumerate(rels, 1):
+            if cancel is not None and done % 256 == 0:
+                cancel.check()
+            if progress is not None and (done % 256 == 0 or done == len(rels)):
+                progress("Indexing properties", done, len(rels))
+            definition = rel.RelatingPropertyDefinition
+            if definition.id() not in decoded:
+                decoded[definition.id()] = self._decode(definition)
+            entry = decoded[definition.id()]
+            if entry is None:
+                continue
+            target, name, values = entry
+            for element in rel.RelatedObjects:
+                sets = target.setdefault(element.id(), {})
+                if name in sets:
+                    sets[name] = {**sets[name], **values}
+                else:
+                    sets[name] = values  # Shared, read-only, between all elements of the relationship
+
+    def _decode(self, definition):
+        if definition.is_a("IfcPropertySet"):
+            values = {}
+            for prop in definition.HasProperties:
+                if prop.is_a("IfcPropertySingleValue"):
+                    values[prop.Name] = prop.NominalValue.wrappedValue if prop.NominalValue else None
+            return self.property_sets, definition.Name, values
+        if definition.is_a("IfcElementQuantity"):
+            values = {}
+            for quantity in definition.Quantities:
+                if quantity.is_a("IfcPhysicalSimpleQuantity"):
+                    values[quantity.Name] = quantity[3]  # Length/Area/Volume/... value
+                    self.quantity_types[(definition.Name, quantity.Name)] = quantity.is_a()
+            return self.quantities, definition.Name, values
+        return None
+
+    def psets(self, element_id):
+        """Return {pset name: {property: value}} for an element."""
+        return self.property_sets.get(element_id, {})
+
+    def qtos(self, element_id):
+        """Return {quantity set name: {quantity: value}} for an element."""
+        return self.quantities.get(element_id, {})
+
+    def find_property(self, element_id, name):
+        """Return the values of a property across all of an element's property sets."""
+        return [values[name] for values in self.psets(element_id).values() if name in values]
+
+    def find_quantity(self, element_id, name, ifc_type=None):
+        """Return the last value of a named quantity, optionally of one IFC quantity class."""
+        value = None
+        for set_name, values in self.qtos(element_id).items():
+            if name in values and (ifc_type is None or self.quantity_types.get((set_name, name)) == ifc_type):
+                value = values[name]
+        return value
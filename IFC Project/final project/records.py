@@ -0,0 +1,70 @@
+import sys
+
+def intern_text(value):
+    """Intern repeated strings (names, types) so equal values share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+class Record:
+    """Compact element record: fixed __slots__ instead of a per-element dict.
+
+    Fields can still be read like dict keys (record["name"]) so code written
+    against the old dict rows keeps working.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        for name, value in zip(self.__slots__, args):
+            setattr(self, name, value)
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return self.__slots__
+
+    def to_dict(self):
+        """Return the record as a plain dict, e.g. for JSON output."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+class WallRecord(Record):
+    __slots__ = ("id", "global_id", "name", "type", "description", "location")
+
+class DoorRecord(Record):
+    __slots__ = ("id", "global_id", "name", "width", "height")
+
+class WindowRecord(Record):
+    __slots__ = ("id", "global_id", "name", "width", "height")
+
+class SpaceRecord(Record):
+    __slots__ = ("id", "global_id", "name", "area", "volume")
+
+class StoreyRecord(Record):
+    __slots__ = ("id", "global_id", "name", "elevation", "elements", "area", "volume")
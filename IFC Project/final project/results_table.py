@@ -0,0 +1,197 @@
+import bisect
+import heapq
+import tkinter as tk
+from operator import itemgetter
+from tkinter import ttk
+
+MERGE_RATIO = 32  # Insert a batch row by row while it is this many times smaller than the table
+
+def _sort_key(value):
+    """Order numbers before text and missing values last, without mixed-type comparisons."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value == value:
+        return (0, value, "")
+    if value is None or value == "N/A":
+        return (2, 0, "")
+    return (1, 0, str(value).lower())
+
+def _bisect_descending(keys, key):
+    """bisect_right for keys sorted in descending order: the position after all keys >= key."""
+    low, high = 0, len(keys)
+    while low < high:
+        middle = (low + high) // 2
+        if key > keys[middle]:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+def _format(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    if isinstance(value, tuple):
+        return ", ".join(_format(v) for v in value)
+    return str(value)
+
+class VirtualTable(tk.Frame):
+    """Table that only materialises the rows currently visible.
+
+    The Treeview always holds visible_rows items; scrolling rewrites their
+    values from the backing row list, so 100k+ rows cost no more widgets than
+    ten. Clicking a heading sorts, typing in the filter box filters.
+    """
+
+    def __init__(self, parent, visible_rows=12, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.visible_rows = visible_rows
+        self.columns = []
+        self.rows = []
+        self.order = []  # Indexes into rows after filtering and sorting
+        self.order_keys = []  # Sort key of each entry of order while a column is sorted
+        self.offset = 0
+        self.title = ""
+        self.sort_column = None
+        self.sort_descending = False
+        self.search_text = None  # Lower-cased row text, built on first filter
+
+        filter_frame = tk.Frame(self)
+        filter_frame.pack(fill=tk.X)
+        self.title_label = tk.Label(filter_frame, text="", anchor="w")
+        self.title_label.pack(side=tk.LEFT, padx=5)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *_: self.apply_filter())
+        tk.Entry(filter_frame, textvariable=self.filter_var, width=25).pack(side=tk.RIGHT, padx=5)
+        tk.Label(filter_frame, text="Filter:").pack(side=tk.RIGHT)
+
+        table_frame = tk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(table_frame, show="headings", height=visible_rows, selectmode="browse")
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.items = [self.tree.insert("", tk.END, values=()) for _ in range(visible_rows)]
+
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_by(-1 if event.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-1, "units"))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(1, "units"))
+        self.tree.bind("<Prior>", lambda event: self.scroll_by(-1, "pages"))
+        self.tree.bind("<Next>", lambda event: self.scroll_by(1, "pages"))
+
+    def set_rows(self, title, columns, rows):
+        """Show rows (dicts or records) with columns given as (key, heading) pairs."""
+        self.columns = list(columns)
+        self.rows = rows if isinstance(rows, list) else list(rows)
+        self.search_text = None
+        self.sort_column = None
+        self.sort_descending = False
+        self.title = title
+        self.tree.config(columns=[key for key, _ in self.columns])
+        for key, heading in self.columns:
+            self.tree.heading(key, text=heading, command=lambda key=key: self.sort_by(key))
+            self.tree.column(key, width=110, stretch=True)
+        self.apply_filter()
+
+    def apply_filter(self):
+        """Keep only rows whose text contains the filter string, then re-sort."""
+        needle = self.filter_var.get().strip().lower()
+        if not needle:
+            self.order = list(range(len(self.rows)))
+        else:
+            if self.search_text is None:
+                self.search_text = self._row_texts(self.rows)
+            self.order = [i for i, text in enumerate(self.search_text) if needle in text]
+        if self.sort_column is not None:
+            self._sort()
+        self.offset = 0
+        self.render()
+
+    def append_rows(self, rows):
+        """Add rows at the end while they stream in, keeping filter, sort and scroll position."""
+        start = len(self.rows)
+        self.rows.extend(rows)
+        new = range(start, len(self.rows))
+        needle = self.filter_var.get().strip().lower()
+        if needle or self.search_text is not None:
+            texts = self._row_texts(self.rows[start:])
+            if self.search_text is not None:
+                self.search_text.extend(texts)
+            if needle:
+                new = [i for i, text in zip(new, texts) if needle in text]
+        if self.sort_column is not None:
+            self._insert_sorted(new)
+        else:
+            self.order.extend(new)
+        self.render()
+
+    def _row_texts(self, rows):
+        keys = [key for key, _ in self.columns]
+        return ["\t".join(_format(row[key]) for key in keys).lower() for row in rows]
+
+    def sort_by(self, key):
+        """Sort by a column; clicking the same heading again reverses the order."""
+        if self.sort_column == key:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = key
+            self.sort_descending = False
+        self._sort()
+        self.offset = 0
+        self.render()
+
+    def _sort(self):
+        rows = self.rows
+        key = self.sort_column
+        self.order.sort(key=lambda i: _sort_key(rows[i][key]), reverse=self.sort_descending)
+        self.order_keys = [_sort_key(rows[i][key]) for i in self.order]
+
+    def _insert_sorted(self, new):
+        """Merge new row indexes into the sorted order instead of sorting it all again."""
+        rows = self.rows
+        key = self.sort_column
+        added = sorted(((_sort_key(rows[i][key]), i) for i in new), key=itemgetter(0), reverse=self.sort_descending)
+        if len(added) * MERGE_RATIO < len(self.order):
+            search = _bisect_descending if self.sort_descending else bisect.bisect_right
+            for sort_key, i in added:
+                position = search(self.order_keys, sort_key)
+                self.order_keys.insert(position, sort_key)
+                self.order.insert(position, i)
+        else:
+            merged = list(heapq.merge(
+                zip(self.order_keys, self.order), added, key=itemgetter(0), reverse=self.sort_descending
+            ))
+            self.order_keys = [sort_key for sort_key, _ in merged]
+            self.order = [i for _, i in merged]
+
+    def on_scroll(self, action, amount, unit=None):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')."""
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.order))
+            self.render()
+        elif action == "scroll":
+            self.scroll_by(int(amount), unit)
+
+    def scroll_by(self, amount, unit):
+        step = self.visible_rows if unit == "pages" else 1
+        self.offset += amount * step
+        self.render()
+        return "break"
+
+    def render(self):
+        """Write the visible slice of rows into the fixed set of Treeview items."""
+        total = len(self.order)
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+        keys = [key for key, _ in self.columns]
+        for position, item in enumerate(self.items):
+            index = self.offset + position
+            if index < total:
+                row = self.rows[self.order[index]]
+                self.tree.item(item, values=[_format(row[key]) for key in keys])
+            else:
+                self.tree.item(item, values=())
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        shown = f"{total} of {len(self.rows)} rows" if total != len(self.rows) else f"{total} rows"
+        self.title_label.config(text=f"{self.title} ({shown})")
@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import collections
+import json
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from guid import GUID_LENGTH, uuids_to_guids
+from logs import NORMAL, QUIET, VERBOSE, configure_logging, get_logger
+from model import IfcModel
+from session import DEFAULT_MAX_BYTES, ModelCache
+from shared import publish_tables
+from snapshot import SnapshotStore
+
+logger = get_logger("server")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MODELS_PER_WORKER = 8  # Models whose extracted data each worker keeps in memory
+RECORD_BYTES = 512  # Rough memory of one extracted record and its strings, beyond its table row
+PROPERTY_BYTES = 128  # Rough memory of one property or quantity value
+ELEMENT_TYPES = ("walls", "doors", "windows", "spaces", "storeys")
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+class QueryError(Exception):
+    """A request that cannot be answered; carries the HTTP status to reply with."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+    def __reduce__(self):
+        # Rebuilt from both arguments when sent back from a worker process
+        return QueryError, (self.status, str(self))
+
+# Worker process state: files being parsed, and the extracted data of recently
+# used models, most recent last; both count against the worker's memory budget
+_parsed = None
+_models = collections.OrderedDict()
+_footprints = {}  # file path -> (data signature, estimated bytes of its extracted data)
+_shared = {}  # file path -> (data signature, {category: SharedTable}) published by this worker
+
+def init_worker(max_bytes):
+    """Give a worker process its share of the memory budget."""
+    global _parsed
+    _parsed = ModelCache(max_bytes)
+
+def worker_cache_info():
+    return dict(_parsed.cache_info(), extracted_models=len(_models), extracted_bytes=_extracted_bytes())
+
+def data_footprint(data):
+    """Estimate the memory taken by a model's extracted data, which Python does not report.
+
+    Table columns count at their size; records and property values at a
+    fixed size each.
+    """
+    columns = sum(column.nbytes for table in data["tables"].values() for column in table.columns.values())
+    records = sum(len(data[element_type]) for element_type in ELEMENT_TYPES)
+    values = sum(
+        len(values)
+        for per_element in (data["property_sets"], data["quantities"])
+        for sets in per_element.values()
+        for values in sets.values()
+    )
+    return columns + records * RECORD_BYTES + values * PROPERTY_BYTES
+
+def _extracted_bytes():
+    """Estimated memory of the extracted data and shared tables this worker holds."""
+    data = sum(footprint for _, footprint in _footprints.values())
+    return data + sum(shared.shm.size for _, tables in _shared.values() for shared in tables.values())
+
+def _worker_model(file_path):
+    """Return this worker's IfcModel for a file, keeping the most recently used ones."""
+    model = _models.pop(file_path, None)
+    if model is None:
+        model = IfcModel(session=_parsed, snapshots=SnapshotStore())
+        model.set_file_path(file_path)
+    _models[file_path] = model
+    _fit_budget()
+    return model
+
+def _account(file_path, model):
+    """Once a model's data is loaded, release its parsed file and indexes and count the data instead."""
+    entry = _footprints.get(file_path)
+    if entry is None or entry[0] != model.data_signature:
+        model.release_sources()
+        _footprints[file_path] = (model.data_signature, data_footprint(model.data))
+        _fit_budget()
+
+def _fit_budget():
+    """Drop the least recently used models while there are too many or they and the parsed files exceed the budget.
+
+    The most recently used model is always kept, even when it alone is over budget.
+    """
+    while len(_models) > 1 and (
+        len(_models) > MODELS_PER_WORKER or _extracted_bytes() + _parsed.total_bytes > _parsed.max_bytes
+    ):
+        evicted, model = _models.popitem(last=False)
+        _release_tables(evicted)
+        _footprints.pop(evicted, None)
+        model.release_sources()
+
+def _release_tables(file_path):
+    entry = _shared.pop(file_path, None)
+    if entry is not None:
+        for shared in entry[1].values():
+            shared.unlink()
+
+def _worker_tables(file_path, model):
+    """Publish a model's element tables to shared memory once per version and return their descriptors."""
+    entry = _shared.get(file_path)
+    if entry is None or entry[0] != model.data_signature:
+        _release_tables(file_path)
+        entry = (model.data_signature, publish_tables(model.data["tables"]))
+        _shared[file_path] = entry
+        _fit_budget()
+    return {category: shared.descriptor for category, shared in entry[1].items()}
+
+def _float_param(params, name):
+    try:
+        return float(params[name])
+    except KeyError:
+        raise QueryError(400, f"Missing parameter: {name}")
+    except ValueError:
+        raise QueryError(400, f"Parameter {name} must be a number")
+
+def run_query(file_path, query, params):
+    """Answer one query in a worker process and return a JSON-ready dict."""
+    model = _worker_model(file_path)
+    data = model.load_data()
+    if data is None:
+        raise QueryError(404, f"IFC file could not be opened: {file_path}")
+    _account(file_path, model)
+    result = {"file": file_path, "schema": data["schema"]}
+    if query == "elements":
+        element_type = params.get("type", "walls")
+        if element_type not in ELEMENT_TYPES:
+            raise QueryError(400, f"type must be one of: {', '.join(ELEMENT_TYPES)}")
+        result[element_type] = [record.to_dict() for record in data[element_type]]
+    elif query == "quantities":
+        result.update(
+            spaces=len(data["spaces"]),
+            total_area=data["total_area"],
+            total_volume=data["total_volume"],
+            window_area=data["window_area"]
+        )
+    elif query == "find":
+        # Comma-separated IFC GlobalIds, or UUIDs in any form uuid.UUID accepts
+        keys = [key.strip() for key in params.get("ids", "").split(",") if key.strip()]
+        try:
+            global_ids = [key if len(key) == GUID_LENGTH else uuids_to_guids([key])[0] for key in keys]
+        except ValueError:
+            raise QueryError(400, "ids must be IFC GlobalIds or UUIDs")
+        guids = model.global_id_index()
+        result["elements"] = [
+            dict(record.to_dict(), category=guids.category(global_id)) if record is not None else None
+            for global_id, record in zip(global_ids, guids.lookup(global_ids))
+        ]
+    elif query == "tables":
+        # Numeric columns for local readers to map with shared.attach_tables()
+        result["tables"] = _worker_tables(file_path, model)
+    elif query == "solar-gain":
+        g_factor = _float_param(params, "g_factor")
+        if not 0 <= g_factor <= 1:
+            raise QueryError(400, "g_factor must be between 0 and 1")
+        ext_temp = _float_param(params, "ext_temp")
+        int_temp = _float_param(params, "int_temp")
+        sun_hours = _float_param(params, "sun_hours")
+        result.update(
+            window_area=data["window_area"],
+            solar_gain=model.calculate_solar_gain(g_factor, ext_temp, int_temp, sun_hours)
+        )
+    else:
+        raise QueryError(404, f"Unknown query: {query}")
+    return result
+
+class ModelServer:
+    """HTTP/JSON front end on asyncio; the analyses run in worker processes.
+
+    Each worker is its own single-process pool and a file always goes to the
+    same worker (chosen by a hash of its path), so repeated queries on a model
+    find its data already extracted there. Different files are answered concurrently.
+    """
+
+    def __init__(self, workers=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.workers = workers or os.cpu_count() or 1
+        context = multiprocessing.get_context("spawn")
+        self.pools = [
+            ProcessPoolExecutor(
+                max_workers=1, mp_context=context, initializer=init_worker, initargs=(max_bytes // self.workers,)
+            )
+            for _ in range(self.workers)
+        ]
+
+    def pool_for(self, file_path):
+        return self.pools[zlib.crc32(file_path.encode("utf-8")) % len(self.pools)]
+
+    async def answer(self, method, target):
+        """Return (status, body dict) for a request line."""
+        if method != "GET":
+            return 405, {"error": "Only GET is supported"}
+        url = urlsplit(target)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        query = url.path.strip("/")
+        loop = asyncio.get_running_loop()
+        if query == "health":
+            return 200, {"ok": True, "workers": self.workers}
+        if query == "stats":
+            caches = await asyncio.gather(*(loop.run_in_executor(pool, worker_cache_info) for pool in self.pools))
+            return 200, {"workers": caches}
+        if "file" not in params:
+            return 400, {"error": "Missing parameter: file"}
+        file_path = os.path.abspath(params.pop("file"))
+        try:
+            return 200, await loop.run_in_executor(self.pool_for(file_path), run_query, file_path, query, params)
+        except QueryError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            logger.error("Query %s failed: %s", target, e)
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def handle(self, reader, writer):
+        """Serve one HTTP/1.1 request per connection."""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()).strip():
+                pass  # Headers are not needed
+            if len(request_line) < 2:
+                status, body = 400, {"error": "Malformed request"}
+            else:
+                status, body = await self.answer(request_line[0], request_line[1])
+                logger.info("%s %s %d", request_line[0], request_line[1], status)
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle, host, port)
+        for sock in server.sockets:
+            logger.info("Serving on http://%s:%d", *sock.getsockname()[:2])
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        for pool in self.pools:
+            pool.shutdown(cancel_futures=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON API for IFC model analyses")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument(
+        "--memory-mb", type=int, default=DEFAULT_MAX_BYTES // 1024 ** 2,
+        help="memory budget for parsed files and extracted models, shared by all workers (default: %(default)s)"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every element")
+    parser.add_argument("-q", "--quiet", action="store_true", help="log warnings and errors only")
+    parser.add_argument("--log-file", help="write the log to this file instead of the console")
+    args = parser.parse_args()
+    configure_logging(VERBOSE if args.verbose else QUIET if args.quiet else NORMAL, args.log_file, buffer_size=1)
+
+    server = ModelServer(args.workers, args.memory_mb * 1024 ** 2)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()
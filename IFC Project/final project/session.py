@@ -0,0 +1,105 @@
+import collections
+import os
+import threading
+
+import ifcopenshell
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+FOOTPRINT_FACTOR = 10  # A parsed model takes roughly this many times its file size in memory
+
+def file_signature(file_path):
+    """Return the (path, mtime, size) triple used to detect changes on disk."""
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+class ModelCache:
+    """Keep several parsed IFC files in memory within a byte budget, least recently used evicted first.
+
+    ifcopenshell does not report how much memory a model takes, so each one is
+    estimated as its file size times footprint_factor. The most recently opened
+    model is always kept, even when it alone is over budget.
+
+    Safe to use from several threads: a file is parsed once while others wait
+    for it, and files at different paths are parsed concurrently.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, footprint_factor=FOOTPRINT_FACTOR):
+        self.max_bytes = max_bytes
+        self.footprint_factor = footprint_factor
+        self.entries = collections.OrderedDict()  # path -> (signature, ifc_file, footprint), oldest first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.last_hit = False
+        self.lock = threading.RLock()  # Guards entries and counters, never held during a parse
+        self.path_locks = {}  # path -> Lock held while that file is being parsed
+
+    def estimate(self, signature):
+        """Return the estimated in-memory size of a model from its file signature."""
+        return signature[2] * self.footprint_factor
+
+    def get(self, file_path):
+        """Return the parsed file if it is cached and unchanged on disk, without parsing or counting."""
+        try:
+            signature = file_signature(file_path)
+        except OSError:
+            return None
+        with self.lock:
+            entry = self.entries.get(signature[0])
+        if entry is None or entry[0] != signature:
+            return None
+        return entry[1]
+
+    def open(self, file_path):
+        """Return the parsed IFC file, parsing it only when it is not cached or changed on disk."""
+        signature = file_signature(file_path)
+        path = signature[0]
+        with self.lock:
+            path_lock = self.path_locks.setdefault(path, threading.Lock())
+        with path_lock:
+            with self.lock:
+                entry = self.entries.get(path)
+                if entry is not None and entry[0] == signature:
+                    self.entries.move_to_end(path)
+                    self.hits += 1
+                    self.last_hit = True
+                    return entry[1]
+                self.misses += 1
+                self.last_hit = False
+                self.invalidate(path)
+            ifc_file = ifcopenshell.open(file_path)
+            footprint = self.estimate(signature)
+            with self.lock:
+                self.entries[path] = (signature, ifc_file, footprint)
+                self.total_bytes += footprint
+                while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                    _, (_, _, evicted) = self.entries.popitem(last=False)
+                    self.total_bytes -= evicted
+                    self.evictions += 1
+            return ifc_file
+
+    def invalidate(self, file_path=None):
+        """Drop one parsed model, or all of them, so the next open parses again."""
+        with self.lock:
+            if file_path is None:
+                self.entries.clear()
+                self.total_bytes = 0
+                return
+            entry = self.entries.pop(os.path.abspath(file_path), None)
+            if entry is not None:
+                self.total_bytes -= entry[2]
+
+    def cache_info(self):
+        """Return hit, miss and eviction counters plus the estimated memory in use."""
+        with self.lock:
+            return {
+                "file_path": next(reversed(self.entries), None),
+                "models": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "last_hit": self.last_hit
+            }
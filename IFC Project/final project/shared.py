@@ -0,0 +1,101 @@
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from table import ElementTable
+
+ALIGNMENT = 64  # Byte alignment of each column inside the block
+
+# Held while a block is created or attached: before Python 3.13 attaching has to
+# switch off the resource tracker registration, which creating needs
+_tracker_lock = threading.Lock()
+
+def _open_block(name):
+    """Map an existing block without registering it with this process's resource tracker.
+
+    A registered block is unlinked when the process exits, but the publisher
+    owns it; and unregistering after the fact would also drop the publisher's
+    registration when both share a tracker, as a parent and its children do.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+class SharedTable:
+    """Numeric columns of an ElementTable in one shared memory block.
+
+    The publishing process owns the block and unlinks it when done. Other
+    processes attach with the JSON-ready descriptor and get an ElementTable
+    whose columns are read-only views of the same memory, with no copying or
+    pickling. Text columns stay behind, as they cannot be shared this way.
+    """
+
+    def __init__(self, shm, descriptor, owner):
+        self.shm = shm
+        self.descriptor = descriptor
+        self.owner = owner
+        columns = {}
+        for name, dtype, offset in descriptor["columns"]:
+            column = np.ndarray(descriptor["length"], dtype=dtype, buffer=shm.buf, offset=offset)
+            if not owner:
+                column.flags.writeable = False
+            columns[name] = column
+        self.table = ElementTable(columns)
+
+    @classmethod
+    def publish(cls, table):
+        """Copy the numeric columns of table into a new shared memory block."""
+        layout = []
+        size = 0
+        for name, column in table.columns.items():
+            if column.dtype == object:
+                continue
+            size = -(-size // ALIGNMENT) * ALIGNMENT
+            layout.append((name, column.dtype.str, size))
+            size += column.nbytes
+        with _tracker_lock:
+            shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shared = cls(shm, {"name": shm.name, "length": len(table), "columns": layout}, owner=True)
+        for name, _, _ in layout:
+            shared.table[name][:] = table[name]
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor):
+        """Map a block published by another process, given its descriptor."""
+        return cls(_open_block(descriptor["name"]), descriptor, owner=False)
+
+    def close(self):
+        """Unmap the block; columns taken from the table must no longer be in use."""
+        self.table = None
+        self.shm.close()
+
+    def unlink(self):
+        """Unmap and free the block (publisher only); attached readers keep their mapping."""
+        self.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.owner:
+            self.unlink()
+        else:
+            self.close()
+
+def publish_tables(tables):
+    """Publish a {category: ElementTable} dict; returns {category: SharedTable}."""
+    return {category: SharedTable.publish(table) for category, table in tables.items()}
+
+def attach_tables(descriptors):
+    """Attach to the blocks of a {category: descriptor} dict; returns {category: SharedTable}."""
+    return {category: SharedTable.attach(descriptor) for category, descriptor in descriptors.items()}
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import pickle
+
+from logs import get_logger
+from session import file_signature
+
+logger = get_logger("snapshot")
+
+# Bump whenever the layout of the extracted model data changes
+SNAPSHOT_VERSION = 11
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ifc-reader")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+def content_hash(file_path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of the file contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class SnapshotStore:
+    """On-disk cache of extracted model data keyed by the IFC file's content hash."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, version=SNAPSHOT_VERSION):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version = version
+        self._hashes = {}  # file signature -> content hash, avoids rehashing unchanged files
+
+    def key_for(self, file_path):
+        """Return the snapshot key for a file, hashing it only when it changed on disk."""
+        signature = file_signature(file_path)
+        key = self._hashes.get(signature)
+        if key is None:
+            key = content_hash(file_path)
+            self._hashes[signature] = key
+        return key
+
+    def path_for(self, key):
+        """Return the snapshot file path for a key."""
+        return os.path.join(self.cache_dir, f"{key}.snapshot")
+
+    def load(self, key):
+        """Return the stored data for a key, or None if missing, stale or unreadable."""
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Discarding unreadable snapshot %s: %s", path, e)
+            self._remove(path)
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != self.version:
+            logger.info("Discarding snapshot with outdated version: %s", path)
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for eviction
+        except OSError:
+            pass  # A read-only cache still serves its snapshots
+        return payload["data"]
+
+    def save(self, key, data):
+        """Store data for a key and evict old snapshots beyond the size limit."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"version": self.version, "data": data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)  # Atomic, readers never see a partial snapshot
+        except Exception as e:
+            logger.warning("Could not write snapshot %s: %s", path, e)
+            self._remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used snapshots until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".snapshot"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Delete every snapshot in the cache directory."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".snapshot"):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,126 @@
+import functools
+from collections import Counter
+
+import ifcopenshell.ifcopenshell_wrapper
+import numpy as np
+
+from header import probe_header
+from records import StoreyRecord, intern_text
+
+STOREY_TYPE = "IFCBUILDINGSTOREY"
+STOREY_ELEVATION = 9  # Position of Elevation among the attributes of an IfcBuildingStorey
+
+@functools.lru_cache(maxsize=None)
+def schema_type_names(schema_name):
+    """Return {upper-case STEP name: schema spelling} of a schema's entity types, e.g. IFCWALLSTANDARDCASE -> IfcWallStandardCase.
+
+    Empty for a schema ifcopenshell does not know.
+    """
+    try:
+        schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(schema_name)
+    except RuntimeError:
+        return {}
+    return {declaration.name().upper(): declaration.name() for declaration in schema.declarations()}
+
+class SpatialIndex:
+    """Site -> building -> storey -> space/element hierarchy of a file, built once.
+
+    Decomposition (IfcRelAggregates) and containment
+    (IfcRelContainedInSpatialStructure) relationships are read from a
+    StepIndex into parent and child maps, and every element below a storey is
+    mapped to that storey up front, so container and storey lookups are
+    dictionary hits. Element types are counted under the names is_a() gives,
+    e.g. IfcWallStandardCase, looked up in the schema of the file header;
+    types the schema does not know keep their upper-case STEP spelling.
+    """
+
+    def __init__(self, index, cancel=None, schema=None):
+        self.index = index
+        if schema is None:
+            schema = probe_header(index.file_path)["schema"]
+        type_names = schema_type_names(schema) if schema else {}
+        self.parent = {}  # id -> aggregating object or spatial container
+        self.children = {}  # id -> [ids of its parts and contained elements]
+        for rel_type, whole, parts in (
+            ("IFCRELAGGREGATES", 4, 5),
+            ("IFCRELCONTAINEDINSPATIALSTRUCTURE", 5, 4)
+        ):
+            for relationship in index.entities(rel_type, include_subtypes=False):
+                if cancel is not None:
+                    cancel.check()
+                args = relationship.args
+                container = int(args[whole])
+                related = [int(ref) for ref in args[parts] or ()]
+                self.children.setdefault(container, []).extend(related)
+                for element_id in related:
+                    self.parent[element_id] = container
+
+        self.storeys = {}  # storey id -> (global id, name, elevation)
+        self.storey_of = {}  # element id -> storey id, for everything below a storey
+        self.storey_counts = {}  # storey id -> Counter of element type names, e.g. {"IfcWall": 3}
+        for storey_id in index.ids(STOREY_TYPE, include_subtypes=False):
+            args = index.entity(storey_id).args
+            elevation = args[STOREY_ELEVATION] if len(args) > STOREY_ELEVATION else None
+            self.storeys[storey_id] = (
+                args[0],
+                intern_text(args[2]) if args[2] else "Unnamed",
+                float(elevation) if isinstance(elevation, (int, float)) else None
+            )
+            counts = Counter()
+            stack = list(self.children.get(storey_id, ()))
+            while stack:
+                element_id = stack.pop()
+                if element_id in self.storey_of:
+                    continue
+                self.storey_of[element_id] = storey_id
+                type_name = index.type_of(element_id)
+                counts[type_names.get(type_name, type_name)] += 1
+                stack.extend(self.children.get(element_id, ()))
+            self.storey_counts[storey_id] = counts
+
+    def container_of(self, element_id):
+        """Return the id of the object or spatial structure an element belongs to, or None."""
+        return self.parent.get(element_id)
+
+    def storey(self, element_id):
+        """Return the id of the storey an element is on, or None."""
+        return self.storey_of.get(element_id)
+
+    def path(self, element_id):
+        """Return the ids from the project down to an element, e.g. [project, site, building, storey, element]."""
+        path = [element_id]
+        seen = {element_id}
+        while path[-1] in self.parent and self.parent[path[-1]] not in seen:
+            path.append(self.parent[path[-1]])
+            seen.add(path[-1])
+        return path[::-1]
+
+    def storey_column(self, ids):
+        """Return the storey id of each element id as an int64 array, -1 where there is none."""
+        storey_of = self.storey_of
+        return np.fromiter((storey_of.get(element_id, -1) for element_id in ids), dtype=np.int64, count=len(ids))
+
+def add_storeys(data, spatial):
+    """Add a 'storey' column to every element table and the per-storey summary to extracted data.
+
+    Area and volume totals per storey come from a group-by over the spaces
+    table, so storey reports need no further scan of the model.
+    """
+    tables = data["tables"]
+    for table in tables.values():
+        table.add_column("storey", spatial.storey_column(table["id"].tolist()))
+    areas = tables["spaces"].group_by("storey", "area")
+    volumes = tables["spaces"].group_by("storey", "volume")
+    data["storeys"] = [
+        StoreyRecord(
+            storey_id,
+            global_id,
+            name,
+            elevation,
+            dict(spatial.storey_counts[storey_id]),
+            areas.get(storey_id, 0.0),
+            volumes.get(storey_id, 0.0)
+        )
+        for storey_id, (global_id, name, elevation) in spatial.storeys.items()
+    ]
+    return data
@@ -0,0 +1,151 @@
+import re
+from collections import namedtuple
+
+# Values produced when decoding STEP (ISO 10303-21) parameter lists
+class Ref(int):
+    """Reference to another entity instance, e.g. #42."""
+
+    def __repr__(self):
+        return f"#{int(self)}"
+
+class Enum(str):
+    """Enumeration value, e.g. .ELEMENT. is Enum('ELEMENT')."""
+
+    def __repr__(self):
+        return f".{str(self)}."
+
+Typed = namedtuple("Typed", ["type", "value"])  # e.g. IFCLABEL('Wall') is Typed('IFCLABEL', 'Wall')
+
+DERIVED = "*"  # Attribute derived by the schema, not stored in the file
+
+_NUMBER = re.compile(r"[+-]?(\d+\.?\d*([eE][+-]?\d+)?|\.\d+([eE][+-]?\d+)?)")
+_KEYWORD = re.compile(r"!?[A-Za-z_][A-Za-z0-9_]*")
+_HEX_RUN = {"X2": 4, "X4": 8}
+
+def decode_string(raw):
+    """Decode the escape sequences of a STEP string body (without the quotes)."""
+    if "\\" not in raw and "''" not in raw:
+        return raw
+    raw = raw.replace("''", "'")
+    out = []
+    i = 0
+    while i < len(raw):
+        if raw.startswith("\\\\", i):
+            out.append("\\")
+            i += 2
+        elif raw[i:i + 4] in ("\\X2\\", "\\X4\\"):
+            width = _HEX_RUN[raw[i + 1:i + 3]]
+            end = raw.find("\\X0\\", i + 4)
+            if end < 0:
+                end = len(raw)
+            digits = raw[i + 4:end]
+            for j in range(0, len(digits) - width + 1, width):
+                out.append(chr(int(digits[j:j + width], 16)))
+            i = end + 4
+        elif raw.startswith("\\X\\", i):
+            out.append(chr(int(raw[i + 3:i + 5], 16)))
+            i += 5
+        elif raw.startswith("\\S\\", i):
+            out.append(chr(ord(raw[i + 3]) + 128))
+            i += 4
+        elif raw.startswith("\\P", i) and raw[i + 3:i + 4] == "\\":
+            i += 4  # Code page switch, irrelevant once decoded to str
+        else:
+            out.append(raw[i])
+            i += 1
+    return "".join(out)
+
+def split_statements(text):
+    """Split STEP text into statements on ';' outside of strings."""
+    statements = []
+    start = 0
+    in_string = False
+    for i, char in enumerate(text):
+        if char == "'":
+            in_string = not in_string  # An escaped '' toggles twice
+        elif char == ";" and not in_string:
+            statements.append(text[start:i].strip())
+            start = i + 1
+    tail = text[start:].strip()
+    if tail:
+        statements.append(tail)
+    return statements
+
+def parse_arguments(text, pos=0):
+    """Parse a parenthesised STEP parameter list starting at text[pos] == '('.
+
+    Returns (values, position after the closing parenthesis).
+    """
+    values = []
+    pos = _skip_space(text, pos + 1)
+    if text[pos] == ")":
+        return values, pos + 1
+    while True:
+        value, pos = _parse_value(text, pos)
+        values.append(value)
+        pos = _skip_space(text, pos)
+        if text[pos] == ",":
+            pos = _skip_space(text, pos + 1)
+        elif text[pos] == ")":
+            return values, pos + 1
+        else:
+            raise ValueError(f"Unexpected {text[pos]!r} at position {pos}")
+
+def parse_statement(statement):
+    """Parse 'NAME(args)' into (NAME, args)."""
+    match = _KEYWORD.match(statement)
+    if match is None:
+        raise ValueError(f"Not a STEP statement: {statement[:40]!r}")
+    pos = _skip_space(statement, match.end())
+    args, _ = parse_arguments(statement, pos)
+    return match.group().upper(), args
+
+def _skip_space(text, pos):
+    while pos < len(text) and text[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+def _parse_value(text, pos):
+    char = text[pos]
+    if char == "'":
+        end = pos + 1
+        while True:
+            end = text.index("'", end)
+            if text.startswith("''", end):
+                end += 2
+                continue
+            break
+        return decode_string(text[pos + 1:end]), end + 1
+    if char == "#":
+        match = _NUMBER.match(text, pos + 1)
+        return Ref(int(match.group())), match.end()
+    if char == "$":
+        return None, pos + 1
+    if char == "*":
+        return DERIVED, pos + 1
+    if char == "(":
+        return parse_arguments(text, pos)
+    if char == "." and not text[pos + 1:pos + 2].isdigit():
+        end = text.index(".", pos + 1)
+        name = text[pos + 1:end]
+        if name == "T":
+            return True, end + 1
+        if name == "F":
+            return False, end + 1
+        if name == "U":
+            return None, end + 1
+        return Enum(name), end + 1
+    if char == '"':
+        end = text.index('"', pos + 1)
+        return text[pos + 1:end], end + 1
+    match = _NUMBER.match(text, pos)
+    if match:
+        number = match.group()
+        if "." in number or "e" in number or "E" in number:
+            return float(number), match.end()
+        return int(number), match.end()
+    match = _KEYWORD.match(text, pos)
+    if match:
+        args, end = parse_arguments(text, _skip_space(text, match.end()))
+        return Typed(match.group().upper(), args[0] if len(args) == 1 else args), end
+    raise ValueError(f"Unexpected {char!r} at position {pos}")
@@ -0,0 +1,186 @@
+import mmap
+import re
+from array import array
+from collections import namedtuple
+
+from step import parse_statement
+
+# Matches the start of an entity instance, e.g. "#42= IFCWALL(" at the start of a line
+_ENTITY = re.compile(rb"^[ \t]*#(\d+)[ \t]*=[ \t]*([A-Za-z0-9_]+)", re.M)
+_TYPE_NAME = re.compile(rb"#\d+[ \t]*=[ \t]*([A-Za-z0-9_]+)")  # Anchored at a known entity offset
+# The first argument of a flat entity when it is a list: "#12=IFCCARTESIANPOINT((1.,2.,3.))"
+# yields "1.,2.,3.", "#60=IFCPOLYLOOP((#50,#53,#52))" yields "#50,#53,#52"
+LIST_ARGUMENT = re.compile(rb"#\d+\s*=\s*[A-Za-z0-9_]+\s*\(\s*\(([^)]*)\)")
+
+# Subtypes that by_type() would include for the element types the GUI counts
+SUBTYPES = {
+    "IFCWALL": ("IFCWALL", "IFCWALLSTANDARDCASE", "IFCWALLELEMENTEDCASE"),
+    "IFCDOOR": ("IFCDOOR", "IFCDOORSTANDARDCASE"),
+    "IFCWINDOW": ("IFCWINDOW", "IFCWINDOWSTANDARDCASE"),
+    "IFCSLAB": ("IFCSLAB", "IFCSLABSTANDARDCASE", "IFCSLABELEMENTEDCASE"),
+    "IFCBEAM": ("IFCBEAM", "IFCBEAMSTANDARDCASE"),
+    "IFCCOLUMN": ("IFCCOLUMN", "IFCCOLUMNSTANDARDCASE"),
+    "IFCMEMBER": ("IFCMEMBER", "IFCMEMBERSTANDARDCASE"),
+    "IFCPLATE": ("IFCPLATE", "IFCPLATESTANDARDCASE"),
+    "IFCOPENINGELEMENT": ("IFCOPENINGELEMENT", "IFCOPENINGSTANDARDCASE")
+}
+
+PROGRESS_EVERY = 65536  # Entities between cancellation checks while indexing or matching
+
+StepEntity = namedtuple("StepEntity", ["id", "type", "args"])
+
+class StepIndex:
+    """Memory-mapped index of a STEP file: entity id -> byte offset and type -> ids.
+
+    Attribute payloads are not decoded while indexing; entity() decodes a
+    single instance on demand.
+    """
+
+    def __init__(self, file_path, cancel=None, progress=None):
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Cannot index an empty file")
+        self._offsets = None
+        self._sparse_offsets = None
+        self._types = {}
+        try:
+            self._build(cancel, progress)
+        except BaseException:
+            self.close()
+            raise
+
+    def _build(self, cancel, progress):
+        start = self._map.find(b"DATA;")
+        if start < 0:
+            raise ValueError("No DATA section found, not an IFC (STEP) file?")
+        ids = array("q")
+        offsets = array("q")
+        types = {}
+        size = len(self._map)
+        for match in _ENTITY.finditer(self._map, start):
+            if len(ids) % PROGRESS_EVERY == 0:
+                if cancel is not None:
+                    cancel.check()
+                if progress is not None:
+                    progress("Indexing", match.start(), size)
+            entity_id = int(match.group(1))
+            ids.append(entity_id)
+            offsets.append(match.start(1) - 1)
+            type_ids = types.get(match.group(2))
+            if type_ids is None:
+                type_ids = types[match.group(2)] = array("q")
+            type_ids.append(entity_id)
+        self._types = {name.decode("ascii").upper(): type_ids for name, type_ids in types.items()}
+        max_id = max(ids) if ids else 0
+        if max_id <= 4 * len(ids) + 1024:
+            # Dense ids (the usual case): a flat array indexed by id, 8 bytes per slot
+            self._offsets = array("q", [-1]) * (max_id + 1)
+            for entity_id, offset in zip(ids, offsets):
+                self._offsets[entity_id] = offset
+        else:
+            self._sparse_offsets = dict(zip(ids, offsets))
+        self.entity_count = len(ids)
+
+    def close(self):
+        """Release the memory map and the file handle."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.entity_count
+
+    def __contains__(self, entity_id):
+        return self.offset(entity_id) >= 0
+
+    def offset(self, entity_id):
+        """Return the byte offset of an entity, or -1 if it does not exist."""
+        if self._sparse_offsets is not None:
+            return self._sparse_offsets.get(entity_id, -1)
+        if 0 <= entity_id < len(self._offsets):
+            return self._offsets[entity_id]
+        return -1
+
+    def type_of(self, entity_id):
+        """Return the upper-case type name of an entity without decoding its attributes, or None."""
+        start = self.offset(entity_id)
+        if start < 0:
+            return None
+        match = _TYPE_NAME.match(self._map, start)
+        return match.group(1).decode("ascii").upper() if match else None
+
+    def type_names(self):
+        """Return the entity type names present in the file."""
+        return list(self._types)
+
+    def type_counts(self):
+        """Return {type name: instance count} without decoding anything."""
+        return {name: len(type_ids) for name, type_ids in self._types.items()}
+
+    def ids(self, ifc_type, include_subtypes=True):
+        """Return the ids of all instances of a type, e.g. ids('IfcWall')."""
+        name = ifc_type.upper()
+        names = SUBTYPES.get(name, (name,)) if include_subtypes else (name,)
+        if len(names) == 1:
+            return self._types.get(name, array("q"))
+        result = array("q")
+        for subtype in names:
+            result.extend(self._types.get(subtype, ()))
+        return result
+
+    def count(self, ifc_type, include_subtypes=True):
+        """Return the number of instances of a type without decoding any of them."""
+        name = ifc_type.upper()
+        names = SUBTYPES.get(name, (name,)) if include_subtypes else (name,)
+        return sum(len(self._types.get(subtype, ())) for subtype in names)
+
+    def raw(self, entity_id):
+        """Return the undecoded text of one entity instance, e.g. b"#42= IFCWALL(...)"."""
+        start = self.offset(entity_id)
+        if start < 0:
+            raise KeyError(entity_id)
+        end = self._map.find(b";", start)
+        # A ';' inside a string leaves an odd number of quotes before it, keep going
+        while end >= 0 and self._map[start:end].count(b"'") % 2:
+            end = self._map.find(b";", end + 1)
+        if end < 0:
+            end = len(self._map)
+        return self._map[start:end]
+
+    def match(self, ids, pattern, cancel=None):
+        """Match a compiled bytes regex at the start of each entity, e.g. to bulk-decode a simple type.
+
+        Much faster than entity() for flat types such as points and placements.
+        Returns one match object (or None) per id. cancel is checked once per
+        chunk of PROGRESS_EVERY ids.
+        """
+        data = self._map
+        offsets = self._sparse_offsets if self._sparse_offsets is not None else self._offsets
+        match = pattern.match
+        if cancel is None:
+            return [match(data, offsets[entity_id]) for entity_id in ids]
+        matches = []
+        for start in range(0, len(ids), PROGRESS_EVERY):
+            cancel.check()
+            matches.extend(match(data, offsets[entity_id]) for entity_id in ids[start:start + PROGRESS_EVERY])
+        return matches
+
+    def entity(self, entity_id):
+        """Decode a single entity instance into StepEntity(id, type, args)."""
+        text = self.raw(entity_id).decode("latin-1")
+        type_name, args = parse_statement(text[text.index("=") + 1:].lstrip())
+        return StepEntity(entity_id, type_name, args)
+
+    def entities(self, ifc_type, include_subtypes=True):
+        """Decode the instances of one type lazily, one at a time."""
+        for entity_id in self.ids(ifc_type, include_subtypes):
+            yield self.entity(entity_id)
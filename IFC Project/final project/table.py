@@ -0,0 +1,130 @@
+import numpy as np
+
+def _number(value):
+    """Return value as a float, or NaN for "N/A", None and other non-numbers."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return np.nan
+
+class ElementTable:
+    """Columnar table of extracted elements.
+
+    Numeric columns are float64 arrays with NaN for missing values, ids are
+    int64 and text columns are object arrays, so totals, filters and group-bys
+    run as vectorized NumPy operations instead of Python loops.
+    """
+
+    def __init__(self, columns):
+        self.columns = dict(columns)
+        lengths = {len(column) for column in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        self.length = lengths.pop() if lengths else 0
+        self._codes = {}  # Cached factorisation of text columns for group-bys
+
+    @classmethod
+    def from_rows(cls, rows, numeric=(), integer=("id",), text=()):
+        """Build a table from a list of row dicts (or records indexable by column name)."""
+        count = len(rows)
+        columns = {}
+        for name in integer:
+            columns[name] = np.fromiter((row[name] for row in rows), dtype=np.int64, count=count)
+        for name in numeric:
+            columns[name] = np.fromiter((_number(row[name]) for row in rows), dtype=np.float64, count=count)
+        for name in text:
+            column = np.empty(count, dtype=object)
+            column[:] = [row[name] for row in rows]
+            columns[name] = column
+        return cls(columns)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def add_column(self, name, values):
+        """Add or replace a column; it must have one value per row."""
+        if len(values) != self.length:
+            raise ValueError(f"Column {name} has {len(values)} values, expected {self.length}")
+        self.columns[name] = values
+        self._codes.pop(name, None)
+
+    def codes(self, name):
+        """Return (keys, codes) so that keys[codes] equals the column, computed once per column."""
+        if name not in self._codes:
+            column = self.columns[name]
+            if column.dtype == object:
+                # Hashing beats np.unique's object sort by an order of magnitude
+                positions = {}
+                codes = np.fromiter(
+                    (positions.setdefault(value, len(positions)) for value in column),
+                    dtype=np.int64,
+                    count=len(column)
+                )
+                keys = np.empty(len(positions), dtype=object)
+                keys[:] = list(positions)
+            else:
+                keys, codes = np.unique(column, return_inverse=True)
+            self._codes[name] = (keys, codes)
+        return self._codes[name]
+
+    def missing(self, name):
+        """Return a boolean mask of rows where a numeric column has no value."""
+        return np.isnan(self.columns[name])
+
+    def count(self, name):
+        """Return the number of rows with a value in a numeric column."""
+        return int(np.count_nonzero(~self.missing(name)))
+
+    def total(self, name):
+        """Return the sum of a numeric column, ignoring missing values."""
+        return float(np.nansum(self.columns[name]))
+
+    def mean(self, name):
+        """Return the mean of a numeric column, ignoring missing values (NaN if none)."""
+        values = self.columns[name]
+        if not self.count(name):
+            return np.nan
+        return float(np.nanmean(values))
+
+    def filter(self, mask):
+        """Return a new table with only the rows where mask is True."""
+        return ElementTable({name: column[mask] for name, column in self.columns.items()})
+
+    def between(self, name, low=-np.inf, high=np.inf):
+        """Return the rows whose numeric column lies in [low, high]; missing values never match."""
+        column = self.columns[name]
+        with np.errstate(invalid="ignore"):
+            return self.filter((column >= low) & (column <= high))
+
+    def group_by(self, key, value, agg="sum"):
+        """Aggregate a numeric column per distinct key: agg is 'sum', 'count' or 'mean'.
+
+        Returns {key: aggregate}. Missing values are ignored.
+        """
+        keys, inverse = self.codes(key)
+        values = self.columns[value]
+        present = ~np.isnan(values)
+        sums = np.bincount(inverse, weights=np.where(present, values, 0.0), minlength=len(keys))
+        counts = np.bincount(inverse, weights=present, minlength=len(keys))
+        if agg == "sum":
+            result = sums
+        elif agg == "count":
+            result = counts.astype(np.int64)
+        elif agg == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result = sums / counts
+        else:
+            raise ValueError(f"Unknown aggregate: {agg}")
+        return dict(zip(keys.tolist(), result.tolist()))
+
+    def rows(self):
+        """Yield the rows as dicts, with None for missing numeric values."""
+        names = list(self.columns)
+        lists = [self.columns[name].tolist() for name in names]
+        for values in zip(*lists):
+            yield {name: (None if isinstance(v, float) and v != v else v) for name, v in zip(names, values)}
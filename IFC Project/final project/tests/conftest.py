@@ -0,0 +1,134 @@
+import os
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+TEST_MODEL = os.path.join(os.path.dirname(PROJECT_DIR), "Test model 1.ifc")
+
+# Length unit entity and metres per unit of each unit the synthetic file can be written in
+LENGTH_UNITS = {
+    "metre": ("#3=IFCSIUNIT(*,.LENGTHUNIT.,$,.METRE.);", 1.0),
+    "millimetre": ("#3=IFCSIUNIT(*,.LENGTHUNIT.,.MILLI.,.METRE.);", 0.001),
+    "foot": (
+        "#3=IFCCONVERSIONBASEDUNIT(#6,.LENGTHUNIT.,'FOOT',#7);\n"
+        "#6=IFCDIMENSIONALEXPONENTS(1,0,0,0,0,0,0);\n"
+        "#7=IFCMEASUREWITHUNIT(IFCRATIOMEASURE(0.3048),#8);\n"
+        "#8=IFCSIUNIT(*,.LENGTHUNIT.,$,.METRE.);",
+        0.3048
+    )
+}
+
+# A 2 x 3 x 4 m box: corner points and the corner indexes of its six outward faces
+BOX = (2.0, 3.0, 4.0)
+BOX_CORNERS = [(x, y, z) for z in (0.0, BOX[2]) for y, x in ((0.0, 0.0), (0.0, BOX[0]), (BOX[1], BOX[0]), (BOX[1], 0.0))]
+BOX_FACES = [(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)]
+
+def synthetic_ifc(unit="metre"):
+    """Return the text of a small IFC4 file with a nested placement, walls, a door, a window and a box-shaped space.
+
+    Lengths are written in the given unit, so the space measures 2 x 3 x 4 m
+    whatever the unit. The space has no quantity sets, so its area and volume
+    can only come from its faceted body. A site and building hold two
+    storeys: the walls, the door and the space are on the ground floor, the
+    window on the first. The window has a glass area property, the door and
+    window share a property set and the wall has two quantity sets.
+    """
+    unit_entities, metres = LENGTH_UNITS[unit]
+    def length(value):
+        return f"{value / metres!r}"
+    lines = [
+        "ISO-10303-21;",
+        "HEADER;",
+        "FILE_DESCRIPTION(('ViewDefinition [DesignTransferView]'),'2;1');",
+        "FILE_NAME('synthetic.ifc','2024-01-01T00:00:00',(''),(''),'','','');",
+        "FILE_SCHEMA(('IFC4'));",
+        "ENDSEC;",
+        "DATA;",
+        "#1=IFCPROJECT('0YvctVUKr0kugbFTf53O9L',$,'Project',$,$,$,$,(#20),#2);",
+        "#2=IFCUNITASSIGNMENT((#3,#4,#5));",
+        unit_entities,
+        "#4=IFCSIUNIT(*,.AREAUNIT.,$,.SQUARE_METRE.);",
+        "#5=IFCSIUNIT(*,.VOLUMEUNIT.,$,.CUBIC_METRE.);",
+        "#10=IFCCARTESIANPOINT((0.,0.,0.));",
+        "#11=IFCDIRECTION((0.,0.,1.));",
+        "#12=IFCDIRECTION((1.,0.,0.));",
+        "#13=IFCAXIS2PLACEMENT3D(#10,#11,#12);",
+        "#20=IFCGEOMETRICREPRESENTATIONCONTEXT($,'Model',3,1.E-05,#13,$);",
+        # A parent placement turned 90 degrees about Z and a child offset within it
+        f"#30=IFCCARTESIANPOINT(({length(10.0)},{length(20.0)},0.));",
+        "#31=IFCDIRECTION((0.,1.,0.));",
+        "#32=IFCAXIS2PLACEMENT3D(#30,#11,#31);",
+        "#33=IFCLOCALPLACEMENT($,#32);",
+        f"#34=IFCCARTESIANPOINT(({length(1.0)},0.,{length(0.5)}));",
+        "#35=IFCAXIS2PLACEMENT3D(#34,$,$);",
+        "#36=IFCLOCALPLACEMENT(#33,#35);",
+        f"#37=IFCCARTESIANPOINT(({length(2.0)},{length(1.0)}));",
+        "#38=IFCAXIS2PLACEMENT2D(#37,$);",
+        "#39=IFCLOCALPLACEMENT(#36,#38);",
+        "#40=IFCWALL('2O2Fr$t4X7Zf8NOew3FLOH',$,'Wall',$,$,#36,$,$,$);",
+        "#41=IFCDOOR('1hOSvn6df7F8_7GcBWlRGQ',$,'Door',$,$,#39,$,$,2.1,0.9,$,$,$);",
+        "#42=IFCWINDOW('3Ax8lDJRTCmxyh9MyGyWBw',$,'Window',$,$,#39,$,$,1.5,1.2,$,$,$);",
+        "#43=IFCCARTESIANPOINTLIST3D(((0.,0.,0.),(1.,2.,3.),(4.,5.,6.)),$);",
+        "#44=IFCCARTESIANPOINTLIST2D(((7.,8.),(9.,10.)),$);",
+        "#45=IFCWALLSTANDARDCASE('2m1vzLlp14Q873BhjVat8L',$,'Standard wall',$,$,#36,$,$,$);"
+    ]
+    for number, corner in enumerate(BOX_CORNERS):
+        lines.append(f"#{50 + number}=IFCCARTESIANPOINT(({','.join(length(value) for value in corner)}));")
+    face_ids = []
+    for number, corners in enumerate(BOX_FACES):
+        loop_id = 60 + 3 * number
+        lines.append(f"#{loop_id}=IFCPOLYLOOP(({','.join(f'#{50 + corner}' for corner in corners)}));")
+        lines.append(f"#{loop_id + 1}=IFCFACEOUTERBOUND(#{loop_id},.T.);")
+        lines.append(f"#{loop_id + 2}=IFCFACE((#{loop_id + 1}));")
+        face_ids.append(f"#{loop_id + 2}")
+    lines += [
+        f"#90=IFCCLOSEDSHELL(({','.join(face_ids)}));",
+        "#91=IFCFACETEDBREP(#90);",
+        "#92=IFCSHAPEREPRESENTATION(#20,'Body','Brep',(#91));",
+        "#93=IFCPRODUCTDEFINITIONSHAPE($,$,(#92));",
+        "#94=IFCSPACE('0BTBFw6f90Nfh9rP1dlXri',$,'Room',$,$,#33,#93,$,.ELEMENT.,.INTERNAL.,$);",
+        "#100=IFCSITE('2P6UDuTIjEwhwr1c7$M73s',$,'Site',$,$,$,$,$,.ELEMENT.,$,$,$,$,$);",
+        "#101=IFCBUILDING('1ql0MgJK177e15WMi0bsu8',$,'Building',$,$,$,$,$,.ELEMENT.,$,$,$);",
+        "#102=IFCBUILDINGSTOREY('0$BAlWO1L28A82yH_0QmaZ',$,'Ground floor',$,$,$,$,$,.ELEMENT.,0.);",
+        f"#103=IFCBUILDINGSTOREY('2C67LN2SXCd8e7rAH$zrpu',$,'First floor',$,$,$,$,$,.ELEMENT.,{length(3.0)});",
+        "#104=IFCRELAGGREGATES('2Sarf_$bLENPWAj9dWLGLq',$,$,$,#1,(#100));",
+        "#105=IFCRELAGGREGATES('3oyeXhPh149eyyarDTu6M9',$,$,$,#100,(#101));",
+        "#106=IFCRELAGGREGATES('2fHC$8EGv8bQslZkwcPenj',$,$,$,#101,(#102,#103));",
+        "#107=IFCRELAGGREGATES('1G2LJVJJL0JQgftXG2Da0p',$,$,$,#102,(#94));",
+        "#108=IFCRELCONTAINEDINSPATIALSTRUCTURE('1jL4fnzRH5bhnyES5r_s5Z',$,$,$,(#40,#45,#41),#102);",
+        "#109=IFCRELCONTAINEDINSPATIALSTRUCTURE('2O2Fr$t4X7Zf8NOew3FLOI',$,$,$,(#42),#103);",
+        "#110=IFCPROPERTYSINGLEVALUE('Steklena povr\\X2\\0161\\X0\\ina',$,IFCAREAMEASURE(1.8),$);",
+        "#111=IFCPROPERTYSET('3RiTKNzyP4n9N05YTIAnwf',$,'Okno',$,(#110));",
+        "#112=IFCRELDEFINESBYPROPERTIES('0ijUxYZ4HCahyAlb1rB9Zk',$,$,$,(#42),#111);",
+        "#113=IFCPROPERTYSINGLEVALUE('IsExternal',$,IFCBOOLEAN(.T.),$);",
+        "#114=IFCPROPERTYSET('1C_lg$wSjCovNVSdIA5iBa',$,'Pset_Common',$,(#113));",
+        "#115=IFCRELDEFINESBYPROPERTIES('1lo$0ZxGDEzefq9vSsVc8l',$,$,$,(#41,#42),#114);",
+        "#116=IFCQUANTITYAREA('NetSideArea',$,$,10.,$);",
+        "#117=IFCQUANTITYVOLUME('NetVolume',$,$,2.,$);",
+        "#118=IFCELEMENTQUANTITY('06RfXo8tnC2hhpzfjPNNrm',$,'Qto_WallBaseQuantities',$,$,(#116,#117));",
+        "#119=IFCRELDEFINESBYPROPERTIES('0F8ARUZhTEtBm6dtcZG4Mr',$,$,$,(#40),#118);",
+        "#120=IFCQUANTITYCOUNT('NetVolume',$,$,5.,$);",
+        "#121=IFCELEMENTQUANTITY('2Hn8Cq0Mr1Bf5Z7nWlq2xL',$,'Qto_Custom',$,$,(#120));",
+        "#122=IFCRELDEFINESBYPROPERTIES('3k9Vt1Lq85YxC0yS2hDf7a',$,$,$,(#40),#121);",
+        "ENDSEC;",
+        "END-ISO-10303-21;"
+    ]
+    return "\n".join(lines) + "\n"
+
+@pytest.fixture
+def test_model():
+    if not os.path.exists(TEST_MODEL):
+        pytest.skip("Test model 1.ifc is not available")
+    return TEST_MODEL
+
+@pytest.fixture
+def synthetic_file(tmp_path):
+    """Write the synthetic IFC file in a length unit and return its path."""
+    def write(unit="metre", name="synthetic.ifc"):
+        path = tmp_path / name
+        path.write_text(synthetic_ifc(unit), encoding="ascii")
+        return str(path)
+    return write
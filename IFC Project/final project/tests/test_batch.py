@@ -0,0 +1,42 @@
+import os
+import shutil
+
+import batch
+
+CRASHING_NAME = "crash.ifc"
+# The real analyse_file, bound at import. The shared pool spawns its workers, which import
+# this module afresh; the one-file retry pools start theirs the platform's default way, which
+# may fork and inherit the patched batch.analyse_file, so the stand-in must not look it up there
+analyse_file = batch.analyse_file
+
+def analyse_or_die(file_path, use_snapshots=True):
+    """Stand-in for analyse_file whose worker process dies outright on one file."""
+    if os.path.basename(file_path) == CRASHING_NAME:
+        os._exit(1)
+    return analyse_file(file_path, use_snapshots)
+
+def test_find_ifc_files(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name in ("a.ifc", "sub/b.IFC", "sub/notes.txt"):
+        (tmp_path / name).write_text("")
+    assert batch.find_ifc_files([str(tmp_path)]) == [str(tmp_path / "a.ifc"), str(tmp_path / "sub" / "b.IFC")]
+
+def test_failing_file_is_reported(tmp_path, synthetic_file):
+    broken = tmp_path / "broken.ifc"
+    broken.write_text("not an IFC file")
+    results = {os.path.basename(row["file"]): row for row in batch.iter_batch([synthetic_file(), str(broken)], 2, False)}
+    assert results["synthetic.ifc"]["ok"] and results["synthetic.ifc"]["spaces"] == 1
+    assert results["synthetic.ifc"]["total_volume"] == 24.0
+    assert not results["broken.ifc"]["ok"] and results["broken.ifc"]["error"]
+
+def test_only_the_crashing_file_fails(tmp_path, synthetic_file, monkeypatch):
+    source = synthetic_file()
+    # The crashing file goes first, so the pool breaks while the others are still queued
+    paths = [str(tmp_path / CRASHING_NAME)] + [str(tmp_path / f"copy{number}.ifc") for number in range(12)]
+    for path in paths:
+        shutil.copy(source, path)
+    monkeypatch.setattr(batch, "analyse_file", analyse_or_die)
+    results = list(batch.iter_batch(paths, 2, False))
+    assert sorted(row["file"] for row in results) == sorted(paths)
+    assert [os.path.basename(row["file"]) for row in results if not row["ok"]] == [CRASHING_NAME]
+    assert all(row["error"] is None for row in results if row["ok"])
@@ -0,0 +1,98 @@
+import ifcopenshell
+import ifcopenshell.geom
+import ifcopenshell.util.shape
+import ifcopenshell.util.unit
+import numpy as np
+import pytest
+
+from brep import FacetedGeometry, length_unit_scale
+from conftest import LENGTH_UNITS
+from model import IfcModel
+from step_index import StepIndex
+
+@pytest.fixture
+def geometry_of():
+    indexes = []
+    def build(path):
+        index = StepIndex(path)
+        indexes.append(index)
+        return FacetedGeometry(index)
+    yield build
+    for index in indexes:
+        index.close()
+
+def _loop_vector(loop):
+    points = np.array([point.Coordinates for point in loop.Polygon], dtype=float)
+    return np.cross(points, np.roll(points, -1, axis=0)).sum(axis=0) / 2.0
+
+def _face_area(face):
+    """Area of an IfcFace read through ifcopenshell: its outer bound less its holes."""
+    bounds = sorted(face.Bounds, key=lambda bound: not bound.is_a("IfcFaceOuterBound"))
+    outer = _loop_vector(bounds[0].Bound)
+    holes = sum(abs(np.dot(_loop_vector(bound.Bound), outer)) / np.linalg.norm(outer) for bound in bounds[1:])
+    return np.linalg.norm(outer) - holes
+
+def test_face_areas_match_ifcopenshell(test_model, geometry_of):
+    ifc_file = ifcopenshell.open(test_model)
+    geometry = geometry_of(test_model)
+    faces = ifc_file.by_type("IfcFace")
+    assert any(len(face.Bounds) > 1 for face in faces)
+    rows = [geometry.face_lookup[face.id()] for face in faces]
+    assert np.allclose(geometry.face_areas[rows], [_face_area(face) for face in faces])
+
+def test_product_quantities_match_ifcopenshell(test_model, geometry_of):
+    ifc_file = ifcopenshell.open(test_model)
+    geometry = geometry_of(test_model)
+    settings = ifcopenshell.geom.settings()
+    products = [product for product in ifc_file.by_type("IfcProduct") if product.Representation]
+    surface_area, volume, _ = geometry.quantities([product.id() for product in products])
+    measured = [product.is_a() for product, area in zip(products, surface_area) if not np.isnan(area)]
+    assert measured.count("IfcWall") == 6 and measured.count("IfcWindow") == 5
+    for product, area, product_volume in zip(products, surface_area, volume):
+        if np.isnan(area):
+            continue
+        shape = ifcopenshell.geom.create_shape(settings, product)
+        assert area == pytest.approx(ifcopenshell.util.shape.get_area(shape.geometry), rel=1e-6)
+        # Enclosed volumes assume closed shells
+        if not any(item.is_a("IfcOpenShell") for item in ifc_file.traverse(product.Representation)):
+            assert product_volume == pytest.approx(ifcopenshell.util.shape.get_volume(shape.geometry), rel=1e-4)
+
+@pytest.mark.parametrize("unit", sorted(LENGTH_UNITS))
+def test_quantities_in_metres(synthetic_file, geometry_of, unit):
+    path = synthetic_file(unit)
+    geometry = geometry_of(path)
+    assert geometry.length_scale == pytest.approx(ifcopenshell.util.unit.calculate_unit_scale(ifcopenshell.open(path)))
+    surface_area, volume, footprint = geometry.quantities([94, 40])
+    assert surface_area[0] == pytest.approx(52.0)
+    assert volume[0] == pytest.approx(24.0)
+    assert footprint[0] == pytest.approx(6.0)
+    assert np.isnan(surface_area[1]) and np.isnan(volume[1]) and np.isnan(footprint[1])
+
+@pytest.mark.parametrize("unit", sorted(LENGTH_UNITS))
+def test_space_fallback_in_metres(synthetic_file, unit):
+    model = IfcModel(snapshots=None)
+    model.set_file_path(synthetic_file(unit))
+    data = model.load_data()
+    space = data["spaces"][0]
+    assert space.area == pytest.approx(6.0)
+    assert space.volume == pytest.approx(24.0)
+    assert data["total_area"] == pytest.approx(6.0)
+    assert "surface_area" not in data["tables"]["spaces"]
+    assert model.get_element_table("spaces", geometry=True)["surface_area"][0] == pytest.approx(52.0)
+    assert [record.volume for record in model.iter_spaces()] == [pytest.approx(24.0)]
+
+def test_geometry_is_decoded_only_when_needed(test_model):
+    model = IfcModel(snapshots=None)
+    model.set_file_path(test_model)
+    data = model.load_data()
+    assert not data["spaces"] and model.geometry is None
+    walls = model.get_element_table("walls", geometry=True)
+    assert model.geometry is not None
+    assert np.count_nonzero(~np.isnan(walls["surface_area"])) == 6
+
+def test_test_model_unit(test_model):
+    index = StepIndex(test_model)
+    try:
+        assert length_unit_scale(index) == ifcopenshell.util.unit.calculate_unit_scale(ifcopenshell.open(test_model))
+    finally:
+        index.close()
@@ -0,0 +1,80 @@
+import csv
+import json
+
+import pytest
+
+import cli
+
+EMPTY_IFC = """ISO-10303-21;
+HEADER;
+FILE_DESCRIPTION(('ViewDefinition [DesignTransferView]'),'2;1');
+FILE_NAME('empty.ifc','2024-01-01T00:00:00',(''),(''),'','','');
+FILE_SCHEMA(('IFC4'));
+ENDSEC;
+DATA;
+#1=IFCPROJECT('0YvctVUKr0kugbFTf53O9L',$,'Project',$,$,$,$,$,$);
+ENDSEC;
+END-ISO-10303-21;
+"""
+
+@pytest.fixture
+def run(tmp_path):
+    """Run the CLI without snapshots and return (exit code, output text)."""
+    output = tmp_path / "out.txt"
+    def run_cli(*argv):
+        command, *rest = argv
+        code = cli.main(["-q", "--no-cache", command, *rest, "-o", str(output)])
+        return code, output.read_text(encoding="utf-8") if output.exists() else ""
+    return run_cli
+
+def test_elements_as_json(run, synthetic_file):
+    code, text = run("walls", synthetic_file())
+    result = json.loads(text)
+    assert code == 0 and result["schema"] == "IFC4"
+    assert [wall["type"] for wall in result["walls"]] == ["IfcWall", "IfcWallStandardCase"]
+
+def test_space_volumes_as_csv(run, synthetic_file):
+    code, text = run("space-volumes", synthetic_file(), "-f", "csv")
+    rows = list(csv.DictReader(text.splitlines()))
+    assert code == 0
+    assert rows == [{"id": "94", "global_id": "0BTBFw6f90Nfh9rP1dlXri", "name": "Room", "volume": "24.0"}]
+
+def test_solar_gain_as_json(run, synthetic_file):
+    code, text = run("solar-gain", synthetic_file(), "--g-factor", "0.5", "--ext-temp", "0", "--int-temp", "20", "--sun-hours", "5")
+    result = json.loads(text)
+    assert code == 0 and result["solar_gain"] == result["window_area"] * 0.5 * 20 * 5
+
+@pytest.mark.parametrize("command, header", [
+    ("doors", "id,global_id,name,width,height"),
+    ("space-areas", "id,global_id,name,area"),
+    ("storeys", "id,global_id,name,elevation,elements,area,volume")
+])
+def test_empty_csv_has_a_header(run, tmp_path, command, header):
+    path = tmp_path / "empty.ifc"
+    path.write_text(EMPTY_IFC)
+    code, text = run(command, str(path), "-f", "csv")
+    assert code == 0 and text.splitlines() == [header]
+
+def test_empty_json_has_an_empty_list(run, tmp_path):
+    path = tmp_path / "empty.ifc"
+    path.write_text(EMPTY_IFC)
+    code, text = run("windows", str(path))
+    assert code == 0 and json.loads(text)["windows"] == []
+
+def test_unreadable_files_exit_with_1(run, tmp_path):
+    assert run("walls", str(tmp_path / "missing.ifc")) == (1, "")
+    broken = tmp_path / "broken.ifc"
+    broken.write_text(EMPTY_IFC.replace("IFC4", "IFC9X9"))
+    assert run("walls", str(broken)) == (1, "")
+
+def test_failed_batch_exits_with_2(run, tmp_path, synthetic_file):
+    broken = tmp_path / "broken.ifc"
+    broken.write_text("not an IFC file")
+    code, text = run("batch", synthetic_file(), str(broken), "-j", "1")
+    result = json.loads(text)
+    assert code == 2 and result["files"] == 2 and result["failed"] == 1
+
+def test_g_factor_is_validated(run, synthetic_file):
+    with pytest.raises(SystemExit) as exit_info:
+        run("solar-gain", synthetic_file(), "--g-factor", "2", "--ext-temp", "0", "--int-temp", "20", "--sun-hours", "5")
+    assert exit_info.value.code == 2
@@ -0,0 +1,56 @@
+import ifcopenshell
+import numpy as np
+import pytest
+
+from coords import CoordinatePool, decode_lists
+from step_index import StepIndex
+
+@pytest.fixture
+def pool_of():
+    indexes = []
+    def build(path):
+        index = StepIndex(path)
+        indexes.append(index)
+        return CoordinatePool(index)
+    yield build
+    for index in indexes:
+        index.close()
+
+def test_points_match_ifcopenshell(test_model, pool_of):
+    ifc_file = ifcopenshell.open(test_model)
+    pool = pool_of(test_model)
+    points = ifc_file.by_type("IfcCartesianPoint")
+    expected = np.array([(tuple(point.Coordinates) + (0.0,))[:3] for point in points])
+    assert np.allclose(pool.points([point.id() for point in points]), expected)
+    for point_list in ifc_file.by_type("IfcCartesianPointList3D"):
+        assert np.allclose(pool.point_list(point_list.id()), np.array(point_list.CoordList))
+
+def test_loop_rows_match_ifcopenshell(test_model, pool_of):
+    ifc_file = ifcopenshell.open(test_model)
+    pool = pool_of(test_model)
+    loops = ifc_file.by_type("IfcPolyLoop")
+    rows, counts = pool.loop_rows([loop.id() for loop in loops])
+    assert counts.tolist() == [len(loop.Polygon) for loop in loops]
+    expected = np.array([point.Coordinates for loop in loops for point in loop.Polygon])
+    assert np.allclose(pool.coordinates[rows], expected)
+
+def test_point_lists_and_missing_points(synthetic_file, pool_of):
+    pool = pool_of(synthetic_file())
+    assert pool.point_list(43).tolist() == [[0.0, 0.0, 0.0], [1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    assert pool.point_list(44).tolist() == [[7.0, 8.0, 0.0], [9.0, 10.0, 0.0]]
+    with pytest.raises(KeyError):
+        pool.point_list(40)
+    assert pool.rows([30, 99999, 40])[1:].tolist() == [-1, -1]
+    assert pool.points([99999]).tolist() == [[0.0, 0.0, 0.0]]
+    assert not pool.coordinates.flags.writeable
+    assert len(pool) == 12 + 5
+
+def test_decode_lists(synthetic_file):
+    index = StepIndex(synthetic_file())
+    try:
+        refs, counts = decode_lists(index, [60, 90, 2])
+        assert counts.tolist() == [4, 6, 3]
+        assert refs[:4].tolist() == [50, 53, 52, 51]
+        assert refs[-3:].tolist() == [3, 4, 5]
+    finally:
+        index.close()
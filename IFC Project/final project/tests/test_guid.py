@@ -0,0 +1,56 @@
+import uuid
+
+import ifcopenshell
+import ifcopenshell.guid
+import numpy as np
+import pytest
+
+from guid import GuidIndex, bytes_to_guids, guids_to_bytes, guids_to_uuids, uuids_to_guids
+from model import IfcModel
+from snapshot import SnapshotStore
+
+def test_round_trip_against_ifcopenshell():
+    guids = [ifcopenshell.guid.new() for _ in range(200)] + ["0" * 22, "3" + "$" * 21]
+    uuids = guids_to_uuids(guids)
+    assert [str(value) for value in uuids] == [str(uuid.UUID(ifcopenshell.guid.expand(guid))) for guid in guids]
+    assert uuids_to_guids(uuids) == guids
+    assert uuids_to_guids([str(value) for value in uuids]) == guids
+    assert bytes_to_guids(guids_to_bytes(guids)) == guids
+
+def test_compress_matches_ifcopenshell():
+    values = [uuid.uuid4() for _ in range(100)]
+    assert uuids_to_guids(values) == [ifcopenshell.guid.compress(value.hex) for value in values]
+
+def test_file_guids(test_model):
+    guids = [element.GlobalId for element in ifcopenshell.open(test_model).by_type("IfcRoot")]
+    data = guids_to_bytes(guids)
+    assert data.shape == (len(guids), 16) and data.dtype == np.uint8
+    assert bytes_to_guids(data) == guids
+
+@pytest.mark.parametrize("guid", ["short", "4" + "0" * 21, "0" * 21 + "!"])
+def test_invalid_guids(guid):
+    with pytest.raises(ValueError):
+        guids_to_bytes([guid])
+
+def test_guid_index(synthetic_file):
+    model = IfcModel(snapshots=None)
+    model.set_file_path(synthetic_file())
+    index = GuidIndex(model.load_data())
+    assert len(index) == 5
+    assert index.category("0BTBFw6f90Nfh9rP1dlXri") == "spaces"
+    assert index.get("2O2Fr$t4X7Zf8NOew3FLOH").name == "Wall"
+    assert [record and record.name for record in index.lookup(["1hOSvn6df7F8_7GcBWlRGQ", "0" * 22])] == ["Door", None]
+    assert index.lookup_uuids(guids_to_uuids(["3Ax8lDJRTCmxyh9MyGyWBw"]))[0].name == "Window"
+
+def test_index_is_built_with_the_data(tmp_path, synthetic_file):
+    store = SnapshotStore(str(tmp_path / "cache"))
+    model = IfcModel(snapshots=store)
+    model.set_file_path(synthetic_file())
+    data = model.load_data()
+    assert model.guids is not None and model.guids.data is data
+    assert model.global_id_index() is model.guids
+    reopened = IfcModel(snapshots=store)
+    reopened.set_file_path(synthetic_file())
+    assert reopened.cached_data() is not None
+    assert reopened.guids.positions == model.guids.positions
+    assert reopened.find_by_global_id(["1hOSvn6df7F8_7GcBWlRGQ"])[0].name == data["doors"][0].name
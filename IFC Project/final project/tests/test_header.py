@@ -0,0 +1,60 @@
+import ifcopenshell
+import pytest
+
+from header import probe_header, read_header_text
+from step import DERIVED, Enum, Ref, Typed, decode_string, parse_statement, split_statements
+
+def test_parse_statement_values():
+    name, args = parse_statement(
+        "IFCWALL('2O2Fr$t4X7Zf8NOew3FLOH',#5,'It''s',$,*,.T.,.F.,.ELEMENT.,(1,2.5,-3.E-2),IFCLABEL('x'))"
+    )
+    assert name == "IFCWALL"
+    assert args == [
+        "2O2Fr$t4X7Zf8NOew3FLOH", Ref(5), "It's", None, DERIVED, True, False, Enum("ELEMENT"),
+        [1, 2.5, -0.03], Typed("IFCLABEL", "x")
+    ]
+    assert isinstance(args[1], Ref) and isinstance(args[7], Enum)
+
+def test_decode_string_escapes():
+    assert decode_string("\\X2\\010D\\X0\\a") == "ča"
+    assert decode_string("\\X\\E9") == "é"
+    assert decode_string("\\S\\i") == "é"
+    assert decode_string("a\\\\b") == "a\\b"
+    assert decode_string("\\PA\\plain") == "plain"
+
+def test_split_statements_ignores_semicolons_in_strings():
+    assert split_statements("A('x;y');B(1); ") == ["A('x;y')", "B(1)"]
+
+def test_parse_statement_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_statement("(1,2)")
+
+def test_probe_header(synthetic_file):
+    header = probe_header(synthetic_file())
+    assert header["schema"] == "IFC4"
+    assert header["file_name"] == "synthetic.ifc"
+    assert header["time_stamp"] == "2024-01-01T00:00:00"
+    assert header["authors"] == [] and header["organizations"] == []
+    assert header["description"] == ["ViewDefinition [DesignTransferView]"]
+    assert header["elapsed_ms"] >= 0
+
+def test_probe_header_matches_ifcopenshell(test_model):
+    header = probe_header(test_model)
+    ifc_file = ifcopenshell.open(test_model)
+    assert header["schema"] == ifc_file.schema
+    assert header["application"] == ifc_file.header.file_name.originating_system
+    assert header["preprocessor"] == ifc_file.header.file_name.preprocessor_version
+
+def test_probe_header_reads_only_the_header(tmp_path, synthetic_file):
+    # A DATA section that could not be parsed does not matter
+    path = tmp_path / "broken_data.ifc"
+    text = open(synthetic_file(), encoding="ascii").read()
+    path.write_text(text[:text.index("DATA;")] + "DATA;\n#1=IFCWALL((((;\n", encoding="ascii")
+    assert probe_header(str(path))["schema"] == "IFC4"
+    assert "FILE_SCHEMA" in read_header_text(str(path))
+
+def test_probe_header_rejects_non_step_file(tmp_path):
+    path = tmp_path / "notes.ifc"
+    path.write_text("just some text", encoding="ascii")
+    with pytest.raises(ValueError):
+        probe_header(str(path))
@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pytest
+
+from jobs import BackgroundRunner, CancelToken, OperationCancelled
+from model import IfcModel
+from placement import PlacementResolver
+from step_index import LIST_ARGUMENT, StepIndex
+
+class FakeRoot:
+    """Stands in for the Tk root: after() callbacks run when the test pumps them, on the test thread."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay_ms, callback):
+        self.scheduled.append(callback)
+
+    def pump(self, runner, timeout=10):
+        deadline = time.monotonic() + timeout
+        while runner.busy and time.monotonic() < deadline:
+            time.sleep(0.01)
+            scheduled, self.scheduled = self.scheduled, []
+            for callback in scheduled:
+                callback()
+        assert not runner.busy
+
+@pytest.fixture
+def runner():
+    return BackgroundRunner(FakeRoot(), poll_interval_ms=1)
+
+def test_results_arrive_on_the_polling_thread(runner):
+    calls = []
+    def work(cancel, progress):
+        progress("Working", 1, 2)
+        return threading.get_ident()
+    runner.submit(work, lambda result: calls.append(("done", result)), on_progress=lambda *args: calls.append(args))
+    runner.root.pump(runner)
+    assert calls[0] == ("Working", 1, 2)
+    assert calls[1][0] == "done" and calls[1][1] != threading.get_ident()
+
+def test_errors_go_to_on_error(runner):
+    errors = []
+    def work(cancel, progress):
+        raise ValueError("broken")
+    runner.submit(work, lambda result: pytest.fail("on_done called"), errors.append)
+    runner.root.pump(runner)
+    assert [str(error) for error in errors] == ["broken"]
+
+def test_cancelled_job_delivers_nothing(runner):
+    started = threading.Event()
+    def work(cancel, progress):
+        started.set()
+        while True:
+            cancel.check()
+            time.sleep(0.01)
+    delivered = []
+    cancel = runner.submit(work, delivered.append, delivered.append)
+    assert started.wait(10)
+    cancel.cancel()
+    runner.root.pump(runner)
+    assert delivered == []
+
+def test_batches_are_merged_per_poll(runner):
+    finished = threading.Event()
+    def items(cancel, progress):
+        yield from range(1000)
+        finished.set()
+    batches = []
+    counts = []
+    runner.submit(items, counts.append, on_batch=batches.append, batch_size=10)
+    assert finished.wait(10)
+    # All hundred batches were queued before the first poll, which delivers them in one call
+    runner.root.pump(runner)
+    assert len(batches) == 1 and batches[0] == list(range(1000))
+    assert counts == [1000]
+
+def test_cancel_token():
+    cancel = CancelToken()
+    cancel.check()
+    assert not cancel.cancelled
+    cancel.cancel()
+    assert cancel.cancelled
+    with pytest.raises(OperationCancelled):
+        cancel.check()
+
+def test_decoding_stops_when_cancelled(synthetic_file):
+    cancel = CancelToken()
+    cancel.cancel()
+    index = StepIndex(synthetic_file())
+    try:
+        with pytest.raises(OperationCancelled):
+            index.match(index.ids("IFCCARTESIANPOINT"), LIST_ARGUMENT, cancel)
+        with pytest.raises(OperationCancelled):
+            PlacementResolver(index, cancel)
+    finally:
+        index.close()
+
+def test_set_file_path_does_not_wait_for_a_load(synthetic_file):
+    model = IfcModel(snapshots=None)
+    holding = threading.Event()
+    release = threading.Event()
+    def hold_lock():
+        with model.lock:
+            holding.set()
+            release.wait(10)
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    try:
+        assert holding.wait(10)
+        model.set_file_path(synthetic_file())
+        assert model.file_path == synthetic_file()
+    finally:
+        release.set()
+        holder.join()
+
+def test_load_of_a_replaced_path_publishes_nothing(synthetic_file):
+    first = synthetic_file(name="first.ifc")
+    second = synthetic_file(name="second.ifc")
+    model = IfcModel(snapshots=None)
+    model.set_file_path(first)
+    def switch(stage, done, total):
+        if stage == "Resolving placements":
+            model.set_file_path(second)
+    with pytest.raises(OperationCancelled):
+        model.load_data(progress=switch)
+    assert model.data is None
+    assert model.load_data()["spaces"][0].volume == pytest.approx(24.0)
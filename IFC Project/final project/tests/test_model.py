@@ -0,0 +1,36 @@
+import pytest
+
+from model import IfcModel
+from snapshot import SnapshotStore
+
+def test_records_stream_before_the_model_is_kept(tmp_path, synthetic_file):
+    store = SnapshotStore(str(tmp_path / "cache"))
+    model = IfcModel(snapshots=store)
+    model.set_file_path(synthetic_file())
+    records = model.iter_loaded("doors")
+    first = next(records)
+    assert first.global_id == "1hOSvn6df7F8_7GcBWlRGQ"
+    assert model.data is None
+    assert list(records) == []
+    assert model.data["doors"] == [first]
+    assert store.load(store.key_for(synthetic_file()))["doors"] == [first]
+    # Later requests read the kept data
+    assert list(model.iter_loaded("doors")) == [first]
+    assert [space.volume for space in model.iter_loaded("spaces")] == [pytest.approx(24.0)]
+
+def test_load_data_matches_the_stream(synthetic_file):
+    streamed = IfcModel(snapshots=None)
+    streamed.set_file_path(synthetic_file())
+    walls = list(streamed.iter_loaded("walls"))
+    loaded = IfcModel(snapshots=None)
+    loaded.set_file_path(synthetic_file())
+    assert loaded.load_data()["walls"] == walls
+
+def test_unopenable_file_raises(tmp_path):
+    broken = tmp_path / "broken.ifc"
+    broken.write_text("not an IFC file")
+    model = IfcModel(snapshots=None)
+    model.set_file_path(str(broken))
+    with pytest.raises(ValueError):
+        list(model.iter_loaded("walls"))
+    assert model.load_data() is None
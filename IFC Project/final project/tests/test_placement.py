@@ -0,0 +1,43 @@
+import ifcopenshell
+import ifcopenshell.util.placement
+import numpy as np
+import pytest
+
+from coords import CoordinatePool
+from placement import PlacementResolver
+from step_index import StepIndex
+
+def _check_against_ifcopenshell(path, index, pool=False):
+    ifc_file = ifcopenshell.open(path)
+    resolver = PlacementResolver(index, pool=CoordinatePool(index) if pool else None)
+    placements = ifc_file.by_type("IfcLocalPlacement")
+    assert placements
+    for placement in placements:
+        expected = ifcopenshell.util.placement.get_local_placement(placement)
+        assert np.allclose(resolver.matrix(placement.id()), expected)
+        assert np.allclose(resolver.origin(placement.id()), expected[:3, 3])
+    return resolver
+
+@pytest.mark.parametrize("pool", [False, True])
+def test_test_model(test_model, pool):
+    index = StepIndex(test_model)
+    try:
+        _check_against_ifcopenshell(test_model, index, pool)
+    finally:
+        index.close()
+
+@pytest.mark.parametrize("pool", [False, True])
+def test_nested_and_planar_placements(synthetic_file, pool):
+    path = synthetic_file()
+    index = StepIndex(path)
+    try:
+        resolver = _check_against_ifcopenshell(path, index, pool)
+        # 10, 20 turned a quarter about Z, then 1, 0, 0.5 inside it, then a 2D offset of 2, 1
+        assert np.allclose(resolver.origin(36), (10.0, 21.0, 0.5))
+        assert np.allclose(resolver.origin(39), (9.0, 23.0, 0.5))
+        assert resolver.origin(13) is None
+        with pytest.raises(KeyError):
+            resolver.matrix(13)
+        assert resolver.locations([40, 41]) == {40: resolver.origin(36), 41: resolver.origin(39)}
+    finally:
+        index.close()
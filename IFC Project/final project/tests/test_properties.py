@@ -0,0 +1,48 @@
+import ifcopenshell
+import ifcopenshell.util.element
+import pytest
+
+from model import IfcModel
+from properties import PropertyIndex
+
+WALL = 40
+DOOR = 41
+WINDOW = 42
+
+@pytest.fixture
+def ifc_file(synthetic_file):
+    return ifcopenshell.open(synthetic_file())
+
+def _without_ids(sets):
+    return {name: {key: value for key, value in values.items() if key != "id"} for name, values in sets.items()}
+
+def test_sets_match_ifcopenshell(test_model, ifc_file):
+    for model_file in (ifcopenshell.open(test_model), ifc_file):
+        properties = PropertyIndex(model_file)
+        for element in model_file.by_type("IfcProduct"):
+            assert properties.psets(element.id()) == _without_ids(ifcopenshell.util.element.get_psets(element, psets_only=True))
+            assert properties.qtos(element.id()) == _without_ids(ifcopenshell.util.element.get_psets(element, qtos_only=True))
+
+def test_shared_sets_are_decoded_once(ifc_file):
+    properties = PropertyIndex(ifc_file)
+    assert properties.psets(DOOR)["Pset_Common"] is properties.psets(WINDOW)["Pset_Common"]
+    assert properties.psets(WINDOW)["Pset_Common"] == {"IsExternal": True}
+    assert properties.psets(WALL) == {}
+
+def test_find_property_and_quantity(ifc_file):
+    properties = PropertyIndex(ifc_file)
+    assert properties.find_property(WINDOW, "Steklena površina") == [pytest.approx(1.8)]
+    assert properties.find_property(DOOR, "Steklena površina") == []
+    assert properties.find_quantity(WALL, "NetSideArea") == 10.0
+    # The same quantity name in two sets: the last one wins unless the class is given
+    assert properties.find_quantity(WALL, "NetVolume") == 5.0
+    assert properties.find_quantity(WALL, "NetVolume", "IfcQuantityVolume") == 2.0
+    assert properties.find_quantity(WALL, "NetVolume", "IfcQuantityArea") is None
+    assert properties.find_quantity(DOOR, "NetVolume") is None
+
+def test_window_area_comes_from_the_index(synthetic_file):
+    model = IfcModel(snapshots=None)
+    model.set_file_path(synthetic_file())
+    assert model.calculate_total_window_area() == pytest.approx(1.8)
+    assert model.get_property_sets()[WINDOW]["Okno"] == {"Steklena površina": pytest.approx(1.8)}
+    assert model.get_quantities()[WALL]["Qto_WallBaseQuantities"] == {"NetSideArea": 10.0, "NetVolume": 2.0}
@@ -0,0 +1,43 @@
+import pickle
+
+import pytest
+
+from records import DoorRecord, SpaceRecord, StoreyRecord, WallRecord, WindowRecord, intern_text
+
+def test_dict_style_access():
+    wall = WallRecord(40, "2O2Fr$t4X7Zf8NOew3FLOH", "Wall", "IfcWall", None, (1.0, 2.0, 0.0))
+    assert wall["name"] == wall.name == "Wall"
+    assert "location" in wall and "area" not in wall
+    assert wall.get("area", "N/A") == "N/A"
+    assert list(wall.keys()) == ["id", "global_id", "name", "type", "description", "location"]
+    with pytest.raises(KeyError):
+        wall["area"]
+    with pytest.raises(KeyError):
+        wall[0]
+
+def test_no_per_record_dict():
+    door = DoorRecord(41, "1hOSvn6df7F8_7GcBWlRGQ", "Door", 0.9, 2.1)
+    assert not hasattr(door, "__dict__")
+    with pytest.raises(AttributeError):
+        door.colour = "red"
+
+def test_keywords_and_to_dict():
+    space = SpaceRecord(94, "0BTBFw6f90Nfh9rP1dlXri", "Room", volume=24.0, area=6.0)
+    assert space.to_dict() == {"id": 94, "global_id": "0BTBFw6f90Nfh9rP1dlXri", "name": "Room", "area": 6.0, "volume": 24.0}
+    assert repr(space) == "SpaceRecord(id=94, global_id='0BTBFw6f90Nfh9rP1dlXri', name='Room', area=6.0, volume=24.0)"
+
+def test_equality_depends_on_type():
+    door = DoorRecord(41, "1hOSvn6df7F8_7GcBWlRGQ", "Door", 0.9, 2.1)
+    assert door == DoorRecord(41, "1hOSvn6df7F8_7GcBWlRGQ", "Door", 0.9, 2.1)
+    assert door != DoorRecord(41, "1hOSvn6df7F8_7GcBWlRGQ", "Door", 1.0, 2.1)
+    assert door != WindowRecord(41, "1hOSvn6df7F8_7GcBWlRGQ", "Door", 0.9, 2.1)
+
+def test_pickle_round_trip():
+    storey = StoreyRecord(102, "0$BAlWO1L28A82yH_0QmaZ", "Ground floor", 0.0, {"IfcWall": 2}, 6.0, 24.0)
+    copy = pickle.loads(pickle.dumps(storey, protocol=pickle.HIGHEST_PROTOCOL))
+    assert copy == storey and type(copy) is StoreyRecord
+
+def test_intern_text():
+    name = "".join(["Unn", "amed"])
+    assert intern_text(name) is intern_text("Unnamed")
+    assert intern_text(None) is None and intern_text(3) == 3
@@ -0,0 +1,95 @@
+import asyncio
+import collections
+import json
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+import server
+from snapshot import SnapshotStore
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    """Run worker queries in this process, with fresh worker state and snapshots under tmp_path."""
+    monkeypatch.setattr(server, "_models", collections.OrderedDict())
+    monkeypatch.setattr(server, "_footprints", {})
+    monkeypatch.setattr(server, "_shared", {})
+    monkeypatch.setattr(server, "SnapshotStore", lambda: SnapshotStore(str(tmp_path / "cache")))
+    def start(max_bytes):
+        server.init_worker(max_bytes)
+    yield start
+    for file_path in list(server._shared):
+        server._release_tables(file_path)
+
+@pytest.fixture
+def base_url(tmp_path, monkeypatch):
+    """Serve on an ephemeral localhost port from a background event loop."""
+    monkeypatch.setenv("HOME", str(tmp_path))  # Worker snapshots go under tmp_path
+    model_server = server.ModelServer(workers=1)
+    loop = asyncio.new_event_loop()
+    listening = loop.run_until_complete(asyncio.start_server(model_server.handle, "127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{listening.sockets[0].getsockname()[1]}"
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    listening.close()
+    loop.run_until_complete(listening.wait_closed())
+    loop.close()
+    model_server.close()
+
+def _get(base_url, path, **params):
+    url = f"{base_url}/{path}"
+    if params:
+        url += "?" + urllib.parse.urlencode(params)
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def test_parsed_file_is_released_after_extraction(worker, synthetic_file):
+    worker(10 ** 9)
+    result = server.run_query(synthetic_file(), "quantities", {})
+    assert result["total_volume"] == pytest.approx(24.0)
+    info = server.worker_cache_info()
+    assert info["models"] == 0 and info["bytes"] == 0
+    assert info["extracted_models"] == 1 and info["extracted_bytes"] > 0
+    assert server._models[synthetic_file()].index is None
+
+def test_extracted_models_count_against_the_budget(worker, synthetic_file):
+    first = synthetic_file(name="first.ifc")
+    second = synthetic_file(name="second.ifc")
+    worker(1)
+    server.run_query(first, "quantities", {})
+    server.run_query(second, "tables", {})
+    # Each model alone is over budget: only the most recent is kept
+    assert list(server._models) == [second]
+    assert list(server._footprints) == [second]
+    assert server.run_query(first, "quantities", {})["spaces"] == 1
+    assert list(server._models) == [first] and not server._shared
+
+def test_endpoints(base_url, synthetic_file):
+    path = synthetic_file()
+    assert _get(base_url, "health") == (200, {"ok": True, "workers": 1})
+    status, body = _get(base_url, "quantities", file=path)
+    assert status == 200 and body["spaces"] == 1 and body["total_volume"] == pytest.approx(24.0)
+    status, body = _get(base_url, "elements", file=path, type="doors")
+    assert status == 200 and [door["global_id"] for door in body["doors"]] == ["1hOSvn6df7F8_7GcBWlRGQ"]
+    status, body = _get(base_url, "find", file=path, ids="3Ax8lDJRTCmxyh9MyGyWBw,0000000000000000000000")
+    assert status == 200 and body["elements"][0]["category"] == "windows" and body["elements"][1] is None
+    status, body = _get(base_url, "solar-gain", file=path, g_factor=0.5, ext_temp=0, int_temp=20, sun_hours=5)
+    assert status == 200 and body["solar_gain"] == pytest.approx(body["window_area"] * 0.5 * 20 * 5)
+    status, body = _get(base_url, "stats")
+    assert status == 200 and body["workers"][0]["extracted_models"] == 1
+
+def test_errors(base_url, synthetic_file, tmp_path):
+    path = synthetic_file()
+    assert _get(base_url, "quantities")[0] == 400
+    assert _get(base_url, "elements", file=path, type="slabs")[0] == 400
+    assert _get(base_url, "solar-gain", file=path, g_factor=2, ext_temp=0, int_temp=20, sun_hours=5)[0] == 400
+    assert _get(base_url, "volumes", file=path)[0] == 404
+    assert _get(base_url, "quantities", file=str(tmp_path / "missing.ifc"))[0] == 404
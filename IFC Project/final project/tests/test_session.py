@@ -0,0 +1,78 @@
+import os
+
+from model import IfcModel
+from session import ModelCache, file_signature
+
+def _touch(path, seconds=10):
+    """Move a file's modification time forward, as an edit on disk would."""
+    signature = file_signature(path)
+    os.utime(path, ns=(signature[1], signature[1] + seconds * 10 ** 9))
+
+def test_hits_and_misses(synthetic_file):
+    cache = ModelCache()
+    path = synthetic_file()
+    assert cache.get(path) is None
+    ifc_file = cache.open(path)
+    assert not cache.last_hit
+    assert cache.open(path) is ifc_file and cache.last_hit
+    assert cache.get(path) is ifc_file
+    info = cache.cache_info()
+    assert (info["hits"], info["misses"], info["models"]) == (1, 1, 1)
+    assert info["file_path"] == os.path.abspath(path)
+
+def test_changed_file_is_parsed_again(synthetic_file):
+    cache = ModelCache()
+    path = synthetic_file()
+    ifc_file = cache.open(path)
+    _touch(path)
+    assert cache.get(path) is None
+    assert cache.open(path) is not ifc_file
+    assert cache.cache_info()["misses"] == 2 and cache.cache_info()["models"] == 1
+
+def test_invalidate(synthetic_file):
+    cache = ModelCache()
+    path = synthetic_file()
+    cache.open(path)
+    cache.invalidate(path)
+    assert cache.get(path) is None and cache.total_bytes == 0
+    cache.open(path)
+    cache.invalidate()
+    assert cache.cache_info()["models"] == 0
+
+def test_models_share_a_session(synthetic_file):
+    session = ModelCache()
+    path = synthetic_file()
+    first = IfcModel(session=session, snapshots=None)
+    second = IfcModel(session=session, snapshots=None)
+    for model in (first, second):
+        model.set_file_path(path)
+        assert model.load_data() is not None
+    assert first.ifc_file is second.ifc_file
+    assert first.cache_info()["misses"] == 1
+    data = first.data
+    _touch(path)
+    # The changed file is parsed and extracted again rather than served from memory
+    assert first.load_data() is not data
+    assert first.cache_info()["misses"] == 2
+
+def test_least_recently_used_are_evicted_over_budget(synthetic_file):
+    paths = [synthetic_file(name=f"model{number}.ifc") for number in range(3)]
+    size = os.path.getsize(paths[0])
+    cache = ModelCache(max_bytes=2 * size, footprint_factor=1)
+    cache.open(paths[0])
+    cache.open(paths[1])
+    cache.open(paths[0])  # Now the most recently used
+    cache.open(paths[2])
+    assert [cache.get(path) is not None for path in paths] == [True, False, True]
+    info = cache.cache_info()
+    assert info["evictions"] == 1 and info["bytes"] == 2 * size and info["models"] == 2
+
+def test_model_over_budget_is_still_kept(synthetic_file):
+    cache = ModelCache(max_bytes=1)
+    first = synthetic_file(name="first.ifc")
+    second = synthetic_file(name="second.ifc")
+    cache.open(first)
+    assert cache.get(first) is not None
+    cache.open(second)
+    assert cache.get(first) is None and cache.get(second) is not None
+    assert cache.cache_info()["models"] == 1
@@ -0,0 +1,63 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from model import IfcModel
+from shared import SharedTable, attach_tables, publish_tables
+from table import ElementTable
+
+def _read_in_another_process(descriptors):
+    """Attach to published tables, as a reader process would, and return what it sees."""
+    tables = attach_tables(descriptors)
+    try:
+        result = {}
+        for category, shared in tables.items():
+            table = shared.table
+            result[category] = {name: table[name].tolist() for name in table.columns}
+            result[category]["writeable"] = any(column.flags.writeable for column in table.columns.values())
+        return result
+    finally:
+        for shared in tables.values():
+            shared.close()
+
+@pytest.fixture
+def table():
+    rows = [{"id": 1, "name": "A", "area": 2.5}, {"id": 2, "name": "B", "area": None}]
+    return ElementTable.from_rows(rows, numeric=("area",), text=("name",))
+
+def test_numeric_columns_are_shared(table):
+    with SharedTable.publish(table) as published:
+        assert set(published.table.columns) == {"id", "area"}
+        for offset in (offset for _, _, offset in published.descriptor["columns"]):
+            assert offset % 64 == 0
+        with SharedTable.attach(published.descriptor) as attached:
+            assert attached.table["id"].tolist() == [1, 2]
+            assert attached.table["area"][0] == 2.5 and np.isnan(attached.table["area"][1])
+            with pytest.raises(ValueError):
+                attached.table["area"][0] = 1.0
+            # Both map the same memory
+            published.table["area"][0] = 7.0
+            assert attached.table["area"][0] == 7.0
+
+def test_empty_table():
+    with SharedTable.publish(ElementTable.from_rows([], numeric=("area",))) as published:
+        with SharedTable.attach(published.descriptor) as attached:
+            assert len(attached.table) == 0
+
+def test_another_process_reads_the_model_tables(synthetic_file):
+    model = IfcModel(snapshots=None)
+    model.set_file_path(synthetic_file())
+    published = publish_tables(model.load_data()["tables"])
+    try:
+        descriptors = {category: shared.descriptor for category, shared in published.items()}
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            seen = pool.submit(_read_in_another_process, descriptors).result(timeout=120)
+    finally:
+        for shared in published.values():
+            shared.unlink()
+    assert seen["spaces"]["volume"] == [pytest.approx(24.0)]
+    assert seen["doors"]["width"] == [pytest.approx(0.9)]
+    assert seen["walls"]["id"] == [40, 45]
+    assert not any(category["writeable"] for category in seen.values())
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from model import IfcModel
+from snapshot import SnapshotStore, content_hash
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path / "cache"), version=1)
+
+def test_round_trip(store, synthetic_file):
+    key = store.key_for(synthetic_file())
+    assert key == content_hash(synthetic_file())
+    assert store.load(key) is None
+    store.save(key, {"walls": [1, 2]})
+    assert store.load(key) == {"walls": [1, 2]}
+
+def test_outdated_version_is_discarded(store):
+    store.save("old", {"walls": []})
+    newer = SnapshotStore(store.cache_dir, version=2)
+    assert newer.load("old") is None
+    assert not os.path.exists(store.path_for("old"))
+
+def test_unreadable_snapshot_is_discarded(store):
+    os.makedirs(store.cache_dir)
+    with open(store.path_for("broken"), "wb") as f:
+        f.write(b"not a pickle")
+    assert store.load("broken") is None
+    assert not os.path.exists(store.path_for("broken"))
+
+def test_least_recently_used_are_evicted(store):
+    payload = b"x" * 1000
+    for age, key in enumerate(("used", "old", "new")):
+        store.save(key, payload)
+        os.utime(store.path_for(key), (age, age))
+    store.load("used")
+    store.max_bytes = 2 * os.path.getsize(store.path_for("new"))
+    store.evict()
+    assert [key for key in ("used", "old", "new") if os.path.exists(store.path_for(key))] == ["used", "new"]
+
+def test_read_only_cache_still_loads(store, monkeypatch):
+    store.save("key", [1])
+    def refuse(path, times=None):
+        raise PermissionError(path)
+    monkeypatch.setattr(os, "utime", refuse)
+    assert store.load("key") == [1]
+
+def test_model_hashes_outside_the_lock(store, synthetic_file):
+    model = IfcModel(snapshots=store)
+    key_for = store.key_for
+    held = []
+    def watched_key_for(file_path):
+        held.append(model.lock._is_owned())
+        return key_for(file_path)
+    store.key_for = watched_key_for
+    model.set_file_path(synthetic_file())
+    assert model.load_data()["spaces"][0].volume == pytest.approx(24.0)
+    assert held and not any(held)
+    reopened = IfcModel(snapshots=store)
+    reopened.set_file_path(synthetic_file())
+    assert reopened.cached_data()["spaces"][0].volume == pytest.approx(24.0)
@@ -0,0 +1,66 @@
+from collections import Counter
+
+import ifcopenshell
+import pytest
+
+from model import IfcModel
+from spatial import SpatialIndex
+from step_index import StepIndex
+
+GROUND_FLOOR = 102
+FIRST_FLOOR = 103
+
+@pytest.fixture
+def spatial_of():
+    indexes = []
+    def build(path, schema=None):
+        index = StepIndex(path)
+        indexes.append(index)
+        return SpatialIndex(index, schema=schema)
+    yield build
+    for index in indexes:
+        index.close()
+
+def _below(element):
+    """Yield everything an ifcopenshell storey or element contains or is decomposed into."""
+    for relationship in getattr(element, "ContainsElements", ()):
+        for child in relationship.RelatedElements:
+            yield child
+            yield from _below(child)
+    for relationship in element.IsDecomposedBy:
+        for child in relationship.RelatedObjects:
+            yield child
+            yield from _below(child)
+
+def test_storeys_match_ifcopenshell(synthetic_file, spatial_of):
+    path = synthetic_file()
+    spatial = spatial_of(path)
+    ifc_file = ifcopenshell.open(path)
+    storeys = ifc_file.by_type("IfcBuildingStorey")
+    assert sorted(spatial.storeys) == sorted(storey.id() for storey in storeys)
+    for storey in storeys:
+        below = list(_below(storey))
+        assert spatial.storey_counts[storey.id()] == Counter(element.is_a() for element in below)
+        assert all(spatial.storey(element.id()) == storey.id() for element in below)
+    assert spatial.storeys[FIRST_FLOOR] == ("2C67LN2SXCd8e7rAH$zrpu", "First floor", 3.0)
+
+def test_hierarchy(synthetic_file, spatial_of):
+    spatial = spatial_of(synthetic_file())
+    assert spatial.container_of(45) == GROUND_FLOOR
+    assert spatial.path(94) == [1, 100, 101, GROUND_FLOOR, 94]
+    assert spatial.storey(100) is None and spatial.container_of(1) is None
+    assert spatial.storey_column([40, 42, 100]).tolist() == [GROUND_FLOOR, FIRST_FLOOR, -1]
+
+def test_unknown_schema_keeps_step_names(synthetic_file, spatial_of):
+    spatial = spatial_of(synthetic_file(), schema="IFC9X9")
+    assert spatial.storey_counts[FIRST_FLOOR] == {"IFCWINDOW": 1}
+
+def test_storey_summary(synthetic_file):
+    model = IfcModel(snapshots=None)
+    model.set_file_path(synthetic_file())
+    ground, first = sorted(model.get_storeys(), key=lambda storey: storey.elevation)
+    assert ground.elements == {"IfcWall": 1, "IfcWallStandardCase": 1, "IfcDoor": 1, "IfcSpace": 1}
+    assert ground.area == pytest.approx(6.0) and ground.volume == pytest.approx(24.0)
+    assert first.elements == {"IfcWindow": 1} and first.area == 0.0
+    assert model.get_element_table("walls")["storey"].tolist() == [GROUND_FLOOR, GROUND_FLOOR]
+    assert [storey.name for storey in model.iter_loaded("storeys")] == ["Ground floor", "First floor"]
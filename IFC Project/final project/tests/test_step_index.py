@@ -0,0 +1,45 @@
+import ifcopenshell
+import pytest
+
+from step_index import StepIndex
+
+def test_index_matches_ifcopenshell(test_model):
+    ifc_file = ifcopenshell.open(test_model)
+    index = StepIndex(test_model)
+    try:
+        for ifc_type in ("IfcWall", "IfcDoor", "IfcWindow", "IfcSlab", "IfcCartesianPoint", "IfcPolyLoop"):
+            expected = sorted(element.id() for element in ifc_file.by_type(ifc_type, include_subtypes=False))
+            assert sorted(index.ids(ifc_type, include_subtypes=False)) == expected
+            assert index.count(ifc_type, include_subtypes=False) == len(expected)
+        counts = index.type_counts()
+        assert sum(counts.values()) == len(list(ifc_file))
+        for wall in ifc_file.by_type("IfcWall"):
+            entity = index.entity(wall.id())
+            assert entity.type == "IFCWALL"
+            assert index.type_of(wall.id()) == "IFCWALL"
+            assert entity.args[0] == wall.GlobalId
+            assert entity.args[2] == wall.Name
+            assert entity.args[5] == wall.ObjectPlacement.id()
+    finally:
+        index.close()
+
+def test_index_missing_entity(synthetic_file):
+    index = StepIndex(synthetic_file())
+    try:
+        assert index.offset(99999) == -1
+        assert index.type_of(99999) is None
+        with pytest.raises(KeyError):
+            index.raw(99999)
+        assert index.raw(40).startswith(b"#40=IFCWALL(")
+        assert [entity.id for entity in index.entities("IfcSpace")] == [94]
+    finally:
+        index.close()
+
+def test_index_rejects_non_step_file(tmp_path):
+    path = tmp_path / "empty.ifc"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        StepIndex(str(path))
+    path.write_bytes(b"not a STEP file")
+    with pytest.raises(ValueError):
+        StepIndex(str(path))
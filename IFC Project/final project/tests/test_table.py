@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from table import ElementTable
+
+ROWS = [
+    {"id": 1, "name": "A", "storey": "Ground", "area": 10.0},
+    {"id": 2, "name": "B", "storey": "Ground", "area": "N/A"},
+    {"id": 3, "name": "C", "storey": "First", "area": 4},
+    {"id": 4, "name": "D", "storey": "First", "area": None},
+    {"id": 5, "name": "E", "storey": "Roof", "area": 6.5}
+]
+
+@pytest.fixture
+def table():
+    return ElementTable.from_rows(ROWS, numeric=("area",), text=("name", "storey"))
+
+def test_columns(table):
+    assert len(table) == 5
+    assert table["id"].dtype == np.int64
+    assert table["area"].dtype == np.float64
+    assert table.missing("area").tolist() == [False, True, False, True, False]
+    assert "storey" in table and "volume" not in table
+
+def test_aggregates(table):
+    assert table.count("area") == 3
+    assert table.total("area") == pytest.approx(20.5)
+    assert table.mean("area") == pytest.approx(20.5 / 3)
+    assert np.isnan(table.filter(table.missing("area")).mean("area"))
+
+def test_between_and_filter(table):
+    assert table.between("area", 5.0)["id"].tolist() == [1, 5]
+    assert table.between("area", high=6.5)["id"].tolist() == [3, 5]
+    assert len(table.filter(np.zeros(5, dtype=bool))) == 0
+
+def test_group_by(table):
+    assert table.group_by("storey", "area") == {"Ground": 10.0, "First": 4.0, "Roof": 6.5}
+    assert table.group_by("storey", "area", "count") == {"Ground": 1, "First": 1, "Roof": 1}
+    assert table.group_by("storey", "id", "mean") == {"Ground": 1.5, "First": 3.5, "Roof": 5.0}
+    with pytest.raises(ValueError):
+        table.group_by("storey", "area", "median")
+
+def test_codes_follow_replaced_columns(table):
+    keys, codes = table.codes("storey")
+    assert keys[codes].tolist() == [row["storey"] for row in ROWS]
+    column = np.empty(5, dtype=object)
+    column[:] = ["X"] * 5
+    table.add_column("storey", column)
+    assert table.group_by("storey", "area") == {"X": 20.5}
+    with pytest.raises(ValueError):
+        table.add_column("extra", np.zeros(4))
+
+def test_rows(table):
+    rows = list(table.rows())
+    assert rows[0] == {"id": 1, "area": 10.0, "name": "A", "storey": "Ground"}
+    assert rows[1]["area"] is None
@@ -1,4 +1,24 @@
+import logging
 import tkinter as tk
+from tkinter import ttk
+
+from extract import batched
+from logs import LOGGER_NAME, LogPaneHandler, get_logger
+from results_table import VirtualTable
+
+OUTPUT_BATCH_SIZE = 200  # Elements formatted per log record
+LOG_PANE_REFRESH_MS = 250
+LOG_PANE_MAX_LINES = 1000
+
+report = get_logger("report")
+
+# (record key, column heading) pairs of the results table for each category
+TABLE_COLUMNS = {
+    "walls": [("id", "ID"), ("global_id", "Global ID"), ("name", "Name"), ("type", "Type"), ("location", "Location")],
+    "doors": [("id", "ID"), ("global_id", "Global ID"), ("name", "Name"), ("width", "Width"), ("height", "Height")],
+    "windows": [("id", "ID"), ("global_id", "Global ID"), ("name", "Name"), ("width", "Width"), ("height", "Height")],
+    "spaces": [("id", "ID"), ("global_id", "Global ID"), ("name", "Name"), ("area", "Area (m²)"), ("volume", "Volume (m³)")]
+}
 
 class IfcView:
     def __init__(self, root, controller):
@@ -27,6 +47,42 @@ class IfcView:
         self.file_path_entry = tk.Entry(self.top_frame, width=50)
         self.file_path_entry.pack(side=tk.LEFT, padx=5)
         
+        # Opt-in precomputation of all analyses right after a file is opened
+        self.warm_up_var = tk.BooleanVar(value=False)
+        self.warm_up_check = tk.Checkbutton(
+            self.top_frame,
+            text="Warm up",
+            variable=self.warm_up_var,
+            command=self.controller.on_warm_up_toggle
+        )
+        self.warm_up_check.pack(side=tk.LEFT, padx=5)
+        
+        # File header information, shown before the model is loaded
+        self.header_label = tk.Label(
+            self.main_frame,
+            text="",
+            font=("Arial", 10),
+            anchor="w",
+            justify=tk.LEFT
+        )
+        self.header_label.pack(fill=tk.X, pady=(5, 0))
+        
+        # Progress indicator for work running in the background
+        self.status_frame = tk.Frame(self.main_frame)
+        self.status_frame.pack(fill=tk.X, pady=(5, 0))
+        self.progress_bar = ttk.Progressbar(self.status_frame, mode="indeterminate", length=200)
+        self.progress_bar.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = tk.Button(
+            self.status_frame,
+            text="Cancel",
+            command=self.controller.on_cancel_click,
+            state="disabled"
+        )
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        self.status_label = tk.Label(self.status_frame, text="", anchor="w")
+        self.status_label.pack(side=tk.LEFT, padx=5)
+        self.saved_button_states = None
+        
         # Frame for buttons and results
         self.buttons_frame = tk.Frame(self.main_frame)
         self.buttons_frame.pack(fill=tk.BOTH, pady=10)
@@ -77,11 +133,76 @@ class IfcView:
                 "label": result_label
             }
     
+        # Results table, only the visible rows are turned into widgets
+        self.results_table = VirtualTable(self.main_frame)
+        self.results_table.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        
+        # Log pane, filled in batches from the application log
+        self.log_text = tk.Text(self.main_frame, height=6, state="disabled", font=("Courier", 9))
+        self.log_text.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.log_handler = LogPaneHandler()
+        logging.getLogger(LOGGER_NAME).addHandler(self.log_handler)
+        self.root.after(LOG_PANE_REFRESH_MS, self.refresh_log_pane)
+    
+    def refresh_log_pane(self):
+        """Append the log lines collected since the last refresh in one insert."""
+        lines = self.log_handler.drain()
+        if lines:
+            self.log_text.config(state="normal")
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            line_count = int(self.log_text.index("end-1c").split(".")[0])
+            if line_count > LOG_PANE_MAX_LINES:
+                self.log_text.delete("1.0", f"{line_count - LOG_PANE_MAX_LINES}.0")
+            self.log_text.see(tk.END)
+            self.log_text.config(state="disabled")
+        self.root.after(LOG_PANE_REFRESH_MS, self.refresh_log_pane)
+    
     def set_file_path(self, file_path):
         """Update the file path in the text field."""
         self.file_path_entry.delete(0, tk.END)
         self.file_path_entry.insert(0, file_path)
     
+    def set_busy(self, busy, message=""):
+        """Disable all buttons and animate the progress bar while a job is in flight."""
+        buttons = [self.open_button] + [entry["button"] for entry in self.result_labels.values()]
+        if busy:
+            if self.saved_button_states is None:
+                self.saved_button_states = [button.cget("state") for button in buttons]
+            for button in buttons:
+                button.config(state="disabled")
+            self.cancel_button.config(state="normal")
+            self.progress_bar.config(mode="indeterminate")
+            self.progress_bar.start(15)
+            self.status_label.config(text=message)
+        else:
+            if self.saved_button_states is not None:
+                for button, state in zip(buttons, self.saved_button_states):
+                    button.config(state=state)
+                self.saved_button_states = None
+            self.cancel_button.config(state="disabled")
+            self.progress_bar.stop()
+            self.progress_bar.config(value=0)
+            self.status_label.config(text="")
+    
+    def set_progress(self, stage, done, total):
+        """Show how far the job in flight has got; total 0 means unknown."""
+        if total:
+            self.progress_bar.stop()
+            self.progress_bar.config(mode="determinate", maximum=total, value=done)
+            self.status_label.config(text=f"{stage}: {done} / {total}")
+        else:
+            self.status_label.config(text=f"{stage}...")
+    
+    def display_header(self, header):
+        """Show schema, file name, authoring application and timestamp from the file header."""
+        if header is None:
+            self.header_label.config(text="Could not read the IFC file header.")
+            return
+        self.header_label.config(text=(
+            f"Schema: {header['schema']}   File: {header['file_name']}\n"
+            f"Application: {header['application']}   Created: {header['time_stamp']}"
+        ))
+    
     def enable_find_walls_button(self, enable=True):
         """Enable or disable the Find Walls button."""
         state = "normal" if enable else "disabled"
@@ -112,104 +233,133 @@ class IfcView:
         state = "normal" if enable else "disabled"
         self.result_labels["Calculate Solar Gain"]["button"].config(state=state)
     
+    def show_table(self, category, rows):
+        """Show the element records of one category in the results table."""
+        if rows is None:
+            return
+        self.results_table.set_rows(category.capitalize(), TABLE_COLUMNS[category], rows)
+    
+    def start_table(self, category):
+        """Empty the results table so rows of one category can be streamed into it."""
+        self.results_table.set_rows(category.capitalize(), TABLE_COLUMNS[category], [])
+    
+    def append_table_rows(self, rows):
+        """Add a batch of streamed rows to the results table."""
+        self.results_table.append_rows(rows)
+    
+    def display_running_total(self, button_text, text):
+        """Show a partial result in a button's label while extraction is still running."""
+        self.result_labels[button_text]["label"].config(text=text)
+    
+    def print_batched(self, elements, format_element):
+        """Log element details a batch at a time and return how many elements there were.
+
+        Details are only formatted in verbose mode; otherwise elements are just counted.
+        """
+        if not report.isEnabledFor(logging.DEBUG):
+            return sum(1 for _ in elements)
+        count = 0
+        for batch in batched(elements, OUTPUT_BATCH_SIZE):
+            count += len(batch)
+            report.debug("\n".join(format_element(element) for element in batch))
+        return count
+    
+    def format_wall(self, wall):
+        """Format one wall record for the console."""
+        lines = [
+            f"Wall ID: {wall['id']}",
+            f"Global ID: {wall['global_id']}",
+            f"Name: {wall['name']}",
+            f"Type: {wall['type']}"
+        ]
+        if wall["description"]:
+            lines.append(f"Description: {wall['description']}")
+        if wall["location"]:
+            coords = wall["location"]
+            lines.append(f"Location: X={coords[0]}, Y={coords[1]}, Z={coords[2]}")
+        lines.append("-" * 50)
+        return "\n".join(lines)
+    
     def display_walls(self, walls, schema):
-        """Prepare and display wall data in the console and update the result label."""
+        """Stream wall data to the console in batches and update the result label."""
         label = self.result_labels["Find Walls"]["label"]
         if walls is None or schema is None:
-            print("No file selected or file could not be opened.")
+            report.warning("No file selected or file could not be opened.")
             label.config(text="No file selected or file could not be opened.")
             return
         
-        output = [f"Successfully opened IFC file: {self.file_path_entry.get()}",
-                  f"IFC Schema Version: {schema}\n"]
+        report.info("Successfully opened IFC file: %s", self.file_path_entry.get())
+        report.info("IFC Schema Version: %s", schema)
         
-        if not walls:
-            output.append("No walls found in the IFC file.")
-            print("\n".join(output))
+        wall_count = self.print_batched(walls, self.format_wall)
+        if not wall_count:
+            report.info("No walls found in the IFC file.")
             label.config(text="No walls found in the IFC file.")
             return
         
-        wall_count = len(walls)
-        output.append(f"Total number of walls found: {wall_count}\n")
-        
-        for wall in walls:
-            output.append(f"Wall ID: {wall.id()}")
-            output.append(f"Global ID: {wall.GlobalId}")
-            output.append(f"Name: {wall.Name if wall.Name else 'Unnamed'}")
-            output.append(f"Type: {wall.is_a()}")
-            
-            if hasattr(wall, "Description") and wall.Description:
-                output.append(f"Description: {wall.Description}")
-            
-            if wall.ObjectPlacement:
-                placement = wall.ObjectPlacement.RelativePlacement
-                if placement and hasattr(placement, "Location"):
-                    coords = placement.Location.Coordinates
-                    output.append(f"Location: X={coords[0]}, Y={coords[1]}, Z={coords[2]}")
-            
-            output.append("-" * 50)
-        
-        output.append(f"\nTotal number of walls: {wall_count}")
-        print("\n".join(output))
-        label.config(text=f"Total number of walls: {len(walls)}")
+        report.info("Total number of walls: %d", wall_count)
+        if isinstance(walls, list):
+            self.show_table("walls", walls)
+        label.config(text=f"Total number of walls: {wall_count}")
     
-    def display_doors(self, doors):
+    def display_doors(self, door_count):
         """Display number of doors in the corresponding result label."""
         label = self.result_labels["Find Doors"]["label"]
-        if doors is None:
+        if door_count is None:
             label.config(text="No file selected or file could not be opened.")
             return
-        label.config(text=f"Total number of doors: {len(doors)}")
+        label.config(text=f"Total number of doors: {door_count}")
     
-    def display_windows(self, windows):
+    def display_windows(self, window_count):
         """Display number of windows in the corresponding result label."""
         label = self.result_labels["Find Windows"]["label"]
-        if windows is None:
+        if window_count is None:
             label.config(text="No file selected or file could not be opened.")
             return
-        label.config(text=f"Total number of windows: {len(windows)}")
+        label.config(text=f"Total number of windows: {window_count}")
 
-    def display_space_areas(self, data):
+    def display_space_areas(self, data, show_table=True):
         """Display number of spaces with areas in the corresponding result label and console."""
         label = self.result_labels["Find Space Areas"]["label"]
         if data is None or "spaces" not in data:
             label.config(text="No file selected or file could not be opened.")
             return
-        spaces = data["spaces"]
         total_area = data["total_area"]
-        output = [f"Total number of spaces with areas: {len(spaces)}\n"]
-        for space in spaces:
-            output.append(f"Space ID: {space['id']}")
-            output.append(f"Global ID: {space['global_id']}")
-            output.append(f"Name: {space['name']}")
-            output.append(f"Area: {space['area']} m²")
-            output.append("-" * 50)
-        output.append(f"\nTotal number of spaces with areas: {len(spaces)}")
-        output.append(f"Total area of spaces: {total_area:.2f} m²")
-        print("\n".join(output))
+        if show_table and isinstance(data["spaces"], list):
+            self.show_table("spaces", data["spaces"])
+        space_count = self.print_batched(data["spaces"], lambda space: (
+            f"Space ID: {space['id']}\n"
+            f"Global ID: {space['global_id']}\n"
+            f"Name: {space['name']}\n"
+            f"Area: {space['area']} m²\n" + "-" * 50
+        ))
+        report.info("Total number of spaces with areas: %d", space_count)
+        report.info("Total area of spaces: %.2f m²", total_area)
         label.config(text=f"Total area of spaces: {total_area:.2f} m²")
     
-    def display_space_volumes(self, data):
+    def display_space_volumes(self, data, show_table=True):
         """Display number of spaces with volumes in the corresponding result label and console."""
         label = self.result_labels["Find Space Volumes"]["label"]
         if data is None or "spaces" not in data:
             label.config(text="No file selected or file could not be opened.")
             return
-        spaces = data["spaces"]
         total_volume = data["total_volume"]
-        output = [f"Total number of spaces with volumes: {len(spaces)}\n"]
-        for space in spaces:
-            output.append(f"Space ID: {space['id']}")
-            output.append(f"Global ID: {space['global_id']}")
-            output.append(f"Name: {space['name']}")
-            output.append(f"Volume: {space['volume']} m³")
-            output.append("-" * 50)
-        output.append(f"\nTotal number of spaces with volumes: {len(spaces)}")
-        output.append(f"Total volume of spaces: {total_volume:.2f} m³")
-        print("\n".join(output))
+        if show_table and isinstance(data["spaces"], list):
+            self.show_table("spaces", data["spaces"])
+        space_count = self.print_batched(data["spaces"], lambda space: (
+            f"Space ID: {space['id']}\n"
+            f"Global ID: {space['global_id']}\n"
+            f"Name: {space['name']}\n"
+            f"Volume: {space['volume']} m³\n" + "-" * 50
+        ))
+        report.info("Total number of spaces with volumes: %d", space_count)
+        report.info("Total volume of spaces: %.2f m³", total_volume)
         label.config(text=f"Total volume of spaces: {total_volume:.2f} m³")
 
     def display_solar_gain(self, solar_gain):
         """Display solar gain in the corresponding result label."""
         label = self.result_labels["Calculate Solar Gain"]["label"]
+        if solar_gain is None:
+            label.config(text="No file selected or file could not be opened.")
+            return
         label.config(text=f"Daily solar heat gain: {solar_gain:.2f} Wh")